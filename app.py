@@ -3,16 +3,34 @@ This module is the entry point of the FastAPI application.
 """
 
 import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from config.init_settings import init_settings, InitSettings
+from core.executor import pools
+from routes.jobs import job_manager
 from routes.routes import load_routes
 
 logger: logging.Logger = logging.getLogger(__name__)
 
 
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    """
+    Start the job workers and shut down the execution pools when the
+    application stops
+
+    :return: The lifespan context of the application
+    """
+    await job_manager.start()
+    yield
+    await job_manager.stop()
+    pools.shutdown()
+
+
 def create_app(settings: InitSettings) -> FastAPI:
     """
     Create the FastAPI application
@@ -23,6 +41,7 @@ def create_app(settings: InitSettings) -> FastAPI:
         title=settings.APP_NAME,
         description=settings.DESCRIPTION,
         version=settings.VERSION,
+        lifespan=lifespan,
     )
     # Allow CORS for the application
     init_app.add_middleware(
@@ -30,7 +30,7 @@ class BasePathSettings(BaseSettings):
         """
         if info.field_name is None:
             raise ValueError("info.config cannot be None")
-        if info.field_name == "FILENAME" or info.field_name == "PARQUET_FILENAME":
+        if info.field_name in ("FILENAME", "DELTA_FILENAME", "PARQUET_FILENAME"):
             if not v.endswith(".xlsx") and not v.endswith(".parquet"):
                 raise ValueError(
                     f"{info.field_name} must be a string ending with '.xlsx' "
@@ -40,7 +40,7 @@ class BasePathSettings(BaseSettings):
             if not raw_path_str:
                 raise ValueError("Missing RAW_PATH")
             raw_path: DirectoryPath = Path(raw_path_str)
-            if info.field_name == "FILENAME":
+            if info.field_name in ("FILENAME", "DELTA_FILENAME"):
                 return (raw_path / v).resolve()
             elif info.field_name == "PARQUET_FILENAME":
                 parquet_dir: str = "parquet"
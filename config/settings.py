@@ -3,10 +3,15 @@ A module for settings in the config package.
 """
 
 from functools import lru_cache
+from typing import Literal
 
 from pydantic import (
     DirectoryPath,
-    NewPath
+    FilePath,
+    NewPath,
+    NonNegativeInt,
+    PositiveFloat,
+    PositiveInt,
 )
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -47,6 +52,8 @@ class SaleSettings(BaseDataSettings):
 
     model_config = SettingsConfigDict(env_file=".env.sale")
 
+    # The workbook with only the new or restated periods
+    DELTA_FILENAME: NewPath | FilePath | None = None
     RENAME_COLUMNS: list[str]
     MERGE_COLUMNS: list[str]
 
@@ -57,15 +64,58 @@ class SellOutSettings(BaseDataSettings):
     model_config = SettingsConfigDict(env_file=".env.sellout")
 
     TYPE: str
+    # The workbook with only the new or restated periods
+    DELTA_FILENAME: NewPath | FilePath | None = None
     RENAME_COLUMNS: list[str]
 
 
+class ExecutorSettings(BaseSettings):
+    """Settings for the thread and process pools that run blocking work"""
+
+    model_config = SettingsConfigDict(env_file=".env.executor")
+
+    CPU_POOL_SIZE: PositiveInt = 2
+    PROCESS_POOL_SIZE: PositiveInt = 2
+    IO_POOL_SIZE: PositiveInt = 4
+    PROCESS_START_METHOD: str = "spawn"
+    GENERATE_IN_PROCESS: bool = False
+    JOB_QUEUE_SIZE: PositiveInt = 32
+    JOB_WORKERS: PositiveInt = 2
+    JOB_RETENTION: PositiveInt = 200
+    # Admission of the /generate and /process executions
+    MAX_CONCURRENT_GENERATIONS: PositiveInt = 2
+    ADMISSION_QUEUE_SIZE: NonNegativeInt = 8
+    ADMISSION_TIMEOUT: PositiveFloat = 30.0
+    # Bytes the admitted executions may hold together, estimated from the
+    # rows of the snapshot, 0 admits them by count only
+    ADMISSION_MEMORY_BYTES: NonNegativeInt = 0
+    ADMISSION_BYTES_PER_ROW: PositiveInt = 1024
+
+
 class GeneralSettings(BaseSettings):
     """General settings for common configurations"""
 
     RAW_PATH: DirectoryPath
     PROCESSED_PATH: DirectoryPath
     OUTPUT_FILENAME: NewPath
+    SNAPSHOT_VERSION_FILENAME: str = "VERSION"
+    SNAPSHOTS_DIRNAME: str = "snapshots"
+    # The snapshots kept besides the current one for the readers still on them
+    SNAPSHOT_RETENTION: NonNegativeInt = 2
+    FACETS_FILENAME: str = "facets.json"
+    DIMENSIONS_DIRNAME: str = "dimensions"
+    STAGING_DIRNAME: str = "staging"
+    MANIFEST_FILENAME: str = "manifest.json"
+    EXCEL_ENGINE: Literal["xlsxwriter", "openpyxl"] = "xlsxwriter"
+    EXCEL_READER: Literal["auto", "calamine", "openpyxl", "pandas"] = "auto"
+    SLICE_CACHE_SIZE: PositiveInt = 8
+    REPORT_CACHE_DIRNAME: str = "reports"
+    # Bytes of generated reports kept in the processed path, 0 disables the
+    # report cache
+    REPORT_CACHE_MAX_BYTES: NonNegativeInt = 256 * 1024 * 1024
+    # Rows per batch when the sales and sellout are ingested in batches, 0
+    # reads each workbook at once
+    INGEST_BATCH_SIZE: NonNegativeInt = 0
 
     model_config = SettingsConfigDict(env_file=".env")
 
@@ -89,6 +139,7 @@ class Settings(BaseSettings):
     sellout: SellOutSettings = SellOutSettings(  # type: ignore
         RAW_PATH=general.RAW_PATH
     )
+    executor: ExecutorSettings = ExecutorSettings()
 
 
 @lru_cache
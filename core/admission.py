@@ -0,0 +1,216 @@
+"""
+A module for the admission control of the heavy executions in the core package.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import AsyncIterator
+
+import pyarrow.parquet as pq
+
+from config.settings import ExecutorSettings, Settings, settings
+from core.cache import get_dimensions_path, get_table_path
+from core.snapshots import get_snapshot_dir
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# The tables whose copies take most of the memory of an execution
+FACT_TABLES: tuple[str, ...] = ("sales", "sellout")
+
+
+class AdmissionRejectedError(Exception):
+    """Raised when an execution is not admitted because the service is saturated"""
+
+    def __init__(self, message: str, status_code: int, retry_after: int) -> None:
+        """
+        Constructor of the class.
+
+        :param message: The reason of the rejection
+        :type message: str
+        :param status_code: The HTTP status of the response, 429 when the
+         queue is full and 503 when the wait timed out
+        :type status_code: int
+        :param retry_after: The seconds after which the client may retry
+        :type retry_after: int
+        :return: None
+        :rtype: NoneType
+        """
+        super().__init__(message)
+        self.status_code: int = status_code
+        self.retry_after: int = retry_after
+
+
+@lru_cache(maxsize=4)
+def _count_rows(tables: tuple[Path, ...], nodes_path: Path) -> tuple[int, int]:
+    """
+    Count the rows of the fact tables and the nodes of a snapshot from the
+    parquet footers. The files of a snapshot never change, so the counts are
+    kept per snapshot
+
+    :param tables: The paths of the fact tables
+    :type tables: tuple[Path, ...]
+    :param nodes_path: The path of the node dimension table
+    :type nodes_path: Path
+    :return: The rows of the fact tables and the number of nodes, 1 for
+     snapshots without dimension tables
+    :rtype: tuple[int, int]
+    """
+    rows: int = sum(pq.read_metadata(path).num_rows for path in tables if path.exists())
+    nodes: int = pq.read_metadata(nodes_path).num_rows if nodes_path.exists() else 1
+    return rows, max(nodes, 1)
+
+
+def estimate_memory(settings: Settings, per_node: bool = False) -> int:
+    """
+    Estimate the memory an execution holds from the rows of the current
+    snapshot
+
+    :param settings: The settings with the snapshot and the bytes per row
+    :type settings: Settings
+    :param per_node: Whether the execution reads the rows of a single node,
+     as a report does, instead of every row
+    :type per_node: bool
+    :return: The estimated bytes, 0 if the estimate is disabled
+    :rtype: int
+    """
+    if not settings.executor.ADMISSION_MEMORY_BYTES:
+        return 0
+    directory: Path = get_snapshot_dir(settings.general)
+    rows, nodes = _count_rows(
+        tuple(get_table_path(settings, name, directory) for name in FACT_TABLES),
+        get_dimensions_path(settings, directory) / "node.parquet",
+    )
+    if per_node:
+        rows = math.ceil(rows / nodes)
+    return rows * settings.executor.ADMISSION_BYTES_PER_ROW
+
+
+class AdmissionController:
+    """
+    Bound the executions that run at once and the memory they hold.
+
+    The executions that do not fit wait in a bounded queue. They are
+    rejected at once when the queue is full, or once they waited longer than
+    the timeout, with the seconds after which the client may retry.
+    """
+
+    def __init__(self, executor_settings: ExecutorSettings) -> None:
+        """
+        Constructor of the class.
+
+        :param executor_settings: The settings with the limits, the queue
+         size and the timeout
+        :type executor_settings: ExecutorSettings
+        :return: None
+        :rtype: NoneType
+        """
+        self.settings: ExecutorSettings = executor_settings
+        self._condition: asyncio.Condition = asyncio.Condition()
+        self.running: int = 0
+        self.waiting: int = 0
+        self.reserved: int = 0
+        self.rejected: int = 0
+        # The average seconds of an execution, to estimate the retry delay
+        self._duration: float = 1.0
+
+    def _fits(self, cost: int) -> bool:
+        """
+        Check whether an execution can start now
+
+        :param cost: The estimated bytes of the execution
+        :type cost: int
+        :return: True if there is a free slot and memory for the execution.
+         An execution larger than the memory limit only runs alone
+        :rtype: bool
+        """
+        if self.running >= self.settings.MAX_CONCURRENT_GENERATIONS:
+            return False
+        limit: int = self.settings.ADMISSION_MEMORY_BYTES
+        return not limit or self.running == 0 or self.reserved + cost <= limit
+
+    def _retry_after(self) -> int:
+        """
+        Estimate the seconds until the queued executions are done
+
+        :return: The seconds after which the client may retry
+        :rtype: int
+        """
+        rounds: float = (self.waiting + 1) / self.settings.MAX_CONCURRENT_GENERATIONS
+        return max(math.ceil(rounds * self._duration), 1)
+
+    def _reject(self, message: str, status_code: int) -> AdmissionRejectedError:
+        """
+        Build the error of a rejected execution
+
+        :param message: The reason of the rejection
+        :type message: str
+        :param status_code: The HTTP status of the response
+        :type status_code: int
+        :return: The rejection error
+        :rtype: AdmissionRejectedError
+        """
+        self.rejected += 1
+        retry_after: int = self._retry_after()
+        logger.warning(f"{message}, retry after {retry_after}s")
+        return AdmissionRejectedError(message, status_code, retry_after)
+
+    @asynccontextmanager
+    async def admit(self, cost: int = 0) -> AsyncIterator[None]:
+        """
+        Wait until an execution can start and hold its slot while it runs
+
+        :param cost: The estimated bytes of the execution
+        :type cost: int
+        :return: The context of the admitted execution
+        :rtype: AsyncIterator[None]
+        :raises AdmissionRejectedError: If the queue is full or the wait
+         timed out
+        """
+        async with self._condition:
+            if not self._fits(cost):
+                if self.waiting >= self.settings.ADMISSION_QUEUE_SIZE:
+                    raise self._reject("Too many executions are waiting, try again later", 429)
+                self.waiting += 1
+                try:
+                    await asyncio.wait_for(
+                        self._condition.wait_for(lambda: self._fits(cost)),
+                        self.settings.ADMISSION_TIMEOUT,
+                    )
+                except asyncio.TimeoutError:
+                    raise self._reject("The service is saturated, try again later", 503) from None
+                finally:
+                    self.waiting -= 1
+            self.running += 1
+            self.reserved += cost
+        start: float = time.perf_counter()
+        try:
+            yield
+        finally:
+            # Smoothed so a single slow execution does not dominate
+            self._duration = 0.8 * self._duration + 0.2 * (time.perf_counter() - start)
+            async with self._condition:
+                self.running -= 1
+                self.reserved -= cost
+                self._condition.notify_all()
+
+    def stats(self) -> dict[str, int]:
+        """
+        Get the executions running, waiting and rejected
+
+        :return: The admission statistics
+        :rtype: dict[str, int]
+        """
+        return {
+            "running": self.running,
+            "waiting": self.waiting,
+            "reserved_bytes": self.reserved,
+            "rejected": self.rejected,
+        }
+
+
+admission: AdmissionController = AdmissionController(settings.executor)
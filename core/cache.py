@@ -0,0 +1,435 @@
+"""
+A module for the snapshot cache in the core package.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Generic, Hashable, TypeVar
+
+from config.settings import Settings
+from core.snapshots import get_pointer_path, get_snapshot_dir
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+K = TypeVar("K", bound=Hashable)
+
+Fingerprint = tuple[tuple[str, int, int] | tuple[str, str] | None, ...]
+
+
+def _stat_fingerprint(path: Path) -> tuple[str, int, int] | None:
+    """
+    Build the fingerprint of a single file from its modification time and
+     size
+
+    :param path: The path of the file
+    :type path: Path
+    :return: The path, modification time and size, or None if missing
+    :rtype: tuple[str, int, int] | None
+    """
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return str(path), stat.st_mtime_ns, stat.st_size
+
+
+def _version_fingerprint(path: Path) -> tuple[str, str] | None:
+    """
+    Build the fingerprint of the snapshot version file from its content
+
+    :param path: The path of the snapshot version file
+    :type path: Path
+    :return: The path and the version written by the process step, or None
+     if missing
+    :rtype: tuple[str, str] | None
+    """
+    try:
+        return str(path), path.read_text().strip()
+    except FileNotFoundError:
+        return None
+
+
+def get_snapshot_version_path(settings: Settings) -> Path:
+    """
+    Get the path of the file holding the current snapshot version
+
+    :param settings: The settings with the raw path
+    :type settings: Settings
+    :return: The path of the snapshot version file
+    :rtype: Path
+    """
+    return get_pointer_path(settings.general)
+
+
+def get_facet_index_path(settings: Settings, directory: Path | None = None) -> Path:
+    """
+    Get the path of the facet index persisted next to the parquet files
+
+    :param settings: The settings with the raw path
+    :type settings: Settings
+    :param directory: The snapshot directory, the current one if None
+    :type directory: Path | None
+    :return: The path of the facet index file
+    :rtype: Path
+    """
+    return (directory or get_snapshot_dir(settings.general)) / settings.general.FACETS_FILENAME
+
+
+def get_dimensions_path(settings: Settings, directory: Path | None = None) -> Path:
+    """
+    Get the directory of the dimension tables persisted next to the parquet
+    files
+
+    :param settings: The settings with the raw path
+    :type settings: Settings
+    :param directory: The snapshot directory, the current one if None
+    :type directory: Path | None
+    :return: The path of the dimensions directory
+    :rtype: Path
+    """
+    return (directory or get_snapshot_dir(settings.general)) / settings.general.DIMENSIONS_DIRNAME
+
+
+def get_table_path(settings: Settings, name: str, directory: Path | None = None) -> Path:
+    """
+    Get the parquet file of a table of the snapshot
+
+    :param settings: The settings with the parquet filenames
+    :type settings: Settings
+    :param name: The name of the table
+    :type name: str
+    :param directory: The snapshot directory, the current one if None
+    :type directory: Path | None
+    :return: The path of the parquet file
+    :rtype: Path
+    """
+    filename: str = Path(getattr(settings, name).PARQUET_FILENAME).name
+    return (directory or get_snapshot_dir(settings.general)) / filename
+
+
+def get_snapshot_paths(settings: Settings) -> list[Path]:
+    """
+    Get the parquet files that make up the current data snapshot
+
+    :param settings: The settings with the parquet filenames
+    :type settings: Settings
+    :return: The list of parquet paths
+    :rtype: list[Path]
+    """
+    directory: Path = get_snapshot_dir(settings.general)
+    return [
+        get_table_path(settings, name, directory)
+        for name in ("binnacle", "clients", "prices", "sales", "sellout")
+    ] + sorted(get_dimensions_path(settings, directory).glob("*.parquet"))
+
+
+def build_fingerprint(paths: list[Path], settings: Settings) -> Fingerprint:
+    """
+    Build the fingerprint of the files behind a cached value and of the
+    snapshot version
+
+    :param paths: The files behind the cached value
+    :type paths: list[Path]
+    :param settings: The settings with the raw path
+    :type settings: Settings
+    :return: The fingerprint of the snapshot
+    :rtype: Fingerprint
+    """
+    files = tuple(_stat_fingerprint(path) for path in paths)
+    version = _version_fingerprint(get_snapshot_version_path(settings))
+    return files + (version,)
+
+
+class SnapshotCache(Generic[T]):
+    """
+    Process-wide cache for data loaded from the parquet snapshot.
+
+    The cached value is reloaded whenever the modification time or size of
+    any of its files changes, or when the process step publishes a new
+    snapshot version. While a caller loads the new value, the others keep
+    getting the previous one instead of waiting.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        loader: Callable[[Settings], T],
+        paths: Callable[[Settings], list[Path]],
+    ) -> None:
+        """
+        Constructor of the class.
+
+        :param name: The name of the cache used in logs and stats
+        :type name: str
+        :param loader: The function that loads the value from disk
+        :type loader: Callable[[Settings], T]
+        :param paths: The function that lists the files behind the value
+        :type paths: Callable[[Settings], list[Path]]
+        :return: None
+        :rtype: NoneType
+        """
+        self.name: str = name
+        self._loader: Callable[[Settings], T] = loader
+        self._paths: Callable[[Settings], list[Path]] = paths
+        self._lock: threading.Lock = threading.Lock()
+        self._load_lock: threading.Lock = threading.Lock()
+        self._value: T | None = None
+        self._fingerprint: Fingerprint | None = None
+        self._loaded_at: datetime | None = None
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def _build_fingerprint(self, settings: Settings) -> Fingerprint:
+        """
+        Build the fingerprint of the files behind the cached value
+
+        :param settings: The settings to resolve the paths
+        :type settings: Settings
+        :return: The fingerprint of the snapshot
+        :rtype: Fingerprint
+        """
+        return build_fingerprint(self._paths(settings), settings)
+
+    def get(self, settings: Settings) -> T:
+        """
+        Get the cached value, loading it again if the snapshot changed
+
+        :param settings: The settings required to load the value
+        :type settings: Settings
+        :return: The cached value. It is shared between callers and must
+         not be mutated
+        :rtype: T
+        """
+        fingerprint: Fingerprint = self._build_fingerprint(settings)
+        with self._lock:
+            if self._value is not None and fingerprint == self._fingerprint:
+                self.hits += 1
+                return self._value
+            previous: T | None = self._value
+        if previous is not None and not self._load_lock.acquire(blocking=False):
+            # Another caller is loading the new snapshot
+            with self._lock:
+                self.hits += 1
+            return previous
+        if previous is None:
+            self._load_lock.acquire()
+        try:
+            with self._lock:
+                if self._value is not None and fingerprint == self._fingerprint:
+                    self.hits += 1
+                    return self._value
+                self.misses += 1
+            logger.info(f"Loading {self.name} snapshot into the cache")
+            value: T = self._loader(settings)
+            with self._lock:
+                self._value = value
+                self._fingerprint = fingerprint
+                self._loaded_at = datetime.now()
+            return value
+        finally:
+            self._load_lock.release()
+
+    def invalidate(self) -> None:
+        """
+        Drop the cached value so the next call loads it again
+
+        :return: None
+        :rtype: NoneType
+        """
+        with self._lock:
+            self._value = None
+            self._fingerprint = None
+            self._loaded_at = None
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Get the hit and miss counters of the cache
+
+        :return: The cache statistics
+        :rtype: dict[str, Any]
+        """
+        with self._lock:
+            return {
+                "name": self.name,
+                "hits": self.hits,
+                "misses": self.misses,
+                "loaded": self._value is not None,
+                "loaded_at": (
+                    self._loaded_at.isoformat() if self._loaded_at else None
+                ),
+            }
+
+
+
+class SliceCache(Generic[K, T]):
+    """
+    Process-wide cache for slices of the parquet snapshot.
+
+    Every slice is loaded on its own, with a lock per key so the slices of
+    different keys load at the same time, and the least recently used ones
+    are dropped beyond the maximum size. All the slices are reloaded when
+    the snapshot changes, and the slices of the previous snapshot are served
+    while another caller loads a new one. The slices of both snapshots
+    together are kept within the maximum size.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        loader: Callable[[Settings, K], T],
+        paths: Callable[[Settings], list[Path]],
+        maxsize: int,
+    ) -> None:
+        """
+        Constructor of the class.
+
+        :param name: The name of the cache used in logs and stats
+        :type name: str
+        :param loader: The function that loads a slice from disk
+        :type loader: Callable[[Settings, K], T]
+        :param paths: The function that lists the files behind the slices
+        :type paths: Callable[[Settings], list[Path]]
+        :param maxsize: The maximum number of slices kept in memory
+        :type maxsize: int
+        :return: None
+        :rtype: NoneType
+        """
+        self.name: str = name
+        self.maxsize: int = maxsize
+        self._loader: Callable[[Settings, K], T] = loader
+        self._paths: Callable[[Settings], list[Path]] = paths
+        self._lock: threading.Lock = threading.Lock()
+        self._load_locks: dict[K, threading.Lock] = {}
+        self._slices: OrderedDict[K, T] = OrderedDict()
+        self._previous: dict[K, T] = {}
+        self._fingerprint: Fingerprint | None = None
+        self._loaded_at: datetime | None = None
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def get(self, settings: Settings, key: K) -> T:
+        """
+        Get a cached slice, loading it again if the snapshot changed
+
+        :param settings: The settings required to load the slice
+        :type settings: Settings
+        :param key: The key of the slice
+        :type key: K
+        :return: The cached slice. It is shared between callers and must
+         not be mutated
+        :rtype: T
+        """
+        fingerprint: Fingerprint = build_fingerprint(self._paths(settings), settings)
+        with self._lock:
+            if fingerprint != self._fingerprint:
+                if self._fingerprint is not None:
+                    self._previous = dict(self._slices)
+                self._slices = OrderedDict()
+                self._fingerprint = fingerprint
+            if key in self._slices:
+                self.hits += 1
+                self._slices.move_to_end(key)
+                return self._slices[key]
+            previous: T | None = self._previous.get(key)
+            load_lock: threading.Lock = self._load_locks.setdefault(key, threading.Lock())
+        if previous is not None and not load_lock.acquire(blocking=False):
+            # Another caller is loading the slice of the new snapshot
+            with self._lock:
+                self.hits += 1
+            return previous
+        if previous is None:
+            load_lock.acquire()
+        try:
+            with self._lock:
+                if fingerprint == self._fingerprint and key in self._slices:
+                    self.hits += 1
+                    self._slices.move_to_end(key)
+                    return self._slices[key]
+                self.misses += 1
+            logger.info(f"Loading {self.name} slice {key} into the cache")
+            value: T = self._loader(settings, key)
+            with self._lock:
+                if fingerprint == self._fingerprint:
+                    self._slices[key] = value
+                    self._previous.pop(key, None)
+                    self._evict()
+                    self._loaded_at = datetime.now()
+            return value
+        finally:
+            load_lock.release()
+            with self._lock:
+                self._drop_load_lock(key)
+
+    def _evict(self) -> None:
+        """
+        Drop the slices beyond the maximum size, the slices of the previous
+        snapshot first and then the least recently used ones. The lock must
+        be held
+
+        :return: None
+        :rtype: NoneType
+        """
+        while len(self._slices) + len(self._previous) > self.maxsize:
+            evicted: K
+            if self._previous:
+                evicted = next(iter(self._previous))
+                del self._previous[evicted]
+            else:
+                evicted, _ = self._slices.popitem(last=False)
+            self._drop_load_lock(evicted)
+
+    def _drop_load_lock(self, key: K) -> None:
+        """
+        Drop the load lock of a key that is no longer cached and that no
+        caller is loading. The lock must be held
+
+        :param key: The key of the slice
+        :type key: K
+        :return: None
+        :rtype: NoneType
+        """
+        load_lock: threading.Lock | None = self._load_locks.get(key)
+        if (
+            load_lock is not None
+            and not load_lock.locked()
+            and key not in self._slices
+            and key not in self._previous
+        ):
+            del self._load_locks[key]
+
+    def invalidate(self) -> None:
+        """
+        Drop the cached slices so the next calls load them again
+
+        :return: None
+        :rtype: NoneType
+        """
+        with self._lock:
+            self._slices.clear()
+            self._previous.clear()
+            self._load_locks = {key: lock for key, lock in self._load_locks.items() if lock.locked()}
+            self._fingerprint = None
+            self._loaded_at = None
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Get the hit and miss counters and the keys of the cached slices
+
+        :return: The cache statistics
+        :rtype: dict[str, Any]
+        """
+        with self._lock:
+            return {
+                "name": self.name,
+                "hits": self.hits,
+                "misses": self.misses,
+                "loaded": bool(self._slices),
+                "loaded_at": (
+                    self._loaded_at.isoformat() if self._loaded_at else None
+                ),
+                "slices": [list(key) if isinstance(key, tuple) else key for key in self._slices],
+            }
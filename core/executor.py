@@ -0,0 +1,219 @@
+"""
+A module for the execution pools in the core package.
+"""
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable
+
+from config.settings import ExecutorSettings, settings
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+class ExecutionPools:
+    """
+    Dedicated pools to run blocking work outside the asyncio event loop.
+
+    The CPU pool runs the pandas and openpyxl stages of a report, the process
+    pool runs the stages that do not need the in-memory caches, and the small
+    I/O pool serves light work so it is never queued behind a report.
+    """
+
+    def __init__(self, executor_settings: ExecutorSettings) -> None:
+        """
+        Constructor of the class.
+
+        :param executor_settings: The settings with the size of each pool
+        :type executor_settings: ExecutorSettings
+        :return: None
+        :rtype: NoneType
+        """
+        self.settings: ExecutorSettings = executor_settings
+        self._lock: threading.Lock = threading.Lock()
+        self._cpu: ThreadPoolExecutor | None = None
+        self._process: ProcessPoolExecutor | None = None
+        self._io: ThreadPoolExecutor | None = None
+
+    @property
+    def cpu(self) -> ThreadPoolExecutor:
+        """
+        Get the thread pool for CPU-heavy stages
+
+        :return: The CPU thread pool
+        :rtype: ThreadPoolExecutor
+        """
+        with self._lock:
+            if self._cpu is None:
+                self._cpu = ThreadPoolExecutor(
+                    max_workers=self.settings.CPU_POOL_SIZE,
+                    thread_name_prefix="scope-cpu",
+                )
+            return self._cpu
+
+    @property
+    def process(self) -> ProcessPoolExecutor:
+        """
+        Get the process pool for CPU-heavy stages
+
+        :return: The process pool
+        :rtype: ProcessPoolExecutor
+        """
+        with self._lock:
+            if self._process is None:
+                self._process = ProcessPoolExecutor(
+                    max_workers=self.settings.PROCESS_POOL_SIZE,
+                    mp_context=multiprocessing.get_context(
+                        self.settings.PROCESS_START_METHOD
+                    ),
+                )
+            return self._process
+
+    @property
+    def io(self) -> ThreadPoolExecutor:
+        """
+        Get the thread pool for I/O and light work
+
+        :return: The I/O thread pool
+        :rtype: ThreadPoolExecutor
+        """
+        with self._lock:
+            if self._io is None:
+                self._io = ThreadPoolExecutor(
+                    max_workers=self.settings.IO_POOL_SIZE,
+                    thread_name_prefix="scope-io",
+                )
+            return self._io
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Shut down every pool that has been started
+
+        :param wait: Wait for the pending work to finish
+        :type wait: bool
+        :return: None
+        :rtype: NoneType
+        """
+        with self._lock:
+            pools: list[Executor | None] = [self._cpu, self._process, self._io]
+            self._cpu, self._process, self._io = None, None, None
+        for pool in pools:
+            if pool is not None:
+                pool.shutdown(wait=wait)
+        logger.info("Execution pools shut down")
+
+
+async def _run(
+    executor: Executor,
+    func: Callable[..., Any],
+    *args: Any,
+    **kwargs: Any,
+) -> Any:
+    """
+    Run a blocking function in the given executor and await its result
+
+    :param executor: The executor to run the function in
+    :type executor: Executor
+    :param func: The blocking function
+    :type func: Callable[..., Any]
+    :param args: Positional arguments to be passed to the function
+    :type args: Any
+    :param kwargs: Keyword arguments to be passed to the function
+    :type kwargs: Any
+    :return: The result of the function
+    :rtype: Any
+    """
+    loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+
+
+async def run_in_cpu(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run a CPU-heavy function in the CPU thread pool
+
+    :param func: The blocking function
+    :type func: Callable[..., Any]
+    :param args: Positional arguments to be passed to the function
+    :type args: Any
+    :param kwargs: Keyword arguments to be passed to the function
+    :type kwargs: Any
+    :return: The result of the function
+    :rtype: Any
+    """
+    return await _run(pools.cpu, func, *args, **kwargs)
+
+
+async def run_in_process(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run a CPU-heavy function in the process pool. The function and its
+    arguments must be picklable
+
+    :param func: The blocking function
+    :type func: Callable[..., Any]
+    :param args: Positional arguments to be passed to the function
+    :type args: Any
+    :param kwargs: Keyword arguments to be passed to the function
+    :type kwargs: Any
+    :return: The result of the function
+    :rtype: Any
+    """
+    return await _run(pools.process, func, *args, **kwargs)
+
+
+async def run_in_io(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run an I/O-bound or light function in the I/O thread pool
+
+    :param func: The blocking function
+    :type func: Callable[..., Any]
+    :param args: Positional arguments to be passed to the function
+    :type args: Any
+    :param kwargs: Keyword arguments to be passed to the function
+    :type kwargs: Any
+    :return: The result of the function
+    :rtype: Any
+    """
+    return await _run(pools.io, func, *args, **kwargs)
+
+
+async def run_in_thread(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run a blocking function that mostly waits on the other pools, such as
+    the orchestration of a task graph, in a thread outside the pools, so it
+    never holds a thread the light work needs
+
+    :param func: The blocking function
+    :type func: Callable[..., Any]
+    :param args: Positional arguments to be passed to the function
+    :type args: Any
+    :param kwargs: Keyword arguments to be passed to the function
+    :type kwargs: Any
+    :return: The result of the function
+    :rtype: Any
+    """
+    return await asyncio.to_thread(func, *args, **kwargs)
+
+
+async def run_report(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run a report generation function in the pool configured for it
+
+    :param func: The blocking function
+    :type func: Callable[..., Any]
+    :param args: Positional arguments to be passed to the function
+    :type args: Any
+    :param kwargs: Keyword arguments to be passed to the function
+    :type kwargs: Any
+    :return: The result of the function
+    :rtype: Any
+    """
+    if pools.settings.GENERATE_IN_PROCESS:
+        return await run_in_process(func, *args, **kwargs)
+    return await run_in_cpu(func, *args, **kwargs)
+
+
+pools: ExecutionPools = ExecutionPools(settings.executor)
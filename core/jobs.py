@@ -0,0 +1,263 @@
+"""
+A module for the report generation jobs in the core package.
+"""
+
+import asyncio
+import logging
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+from config.settings import ExecutorSettings
+from core.admission import AdmissionRejectedError
+from core.stages import STAGES, StageCallback
+from schemas.request.options import Options
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+JobRunner = Callable[[Options, StageCallback], Awaitable[Path]]
+
+
+class JobState(str, Enum):
+    """The states of a report generation job"""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class JobQueueFullError(Exception):
+    """Raised when the job queue cannot accept more jobs"""
+
+
+@dataclass
+class Job:
+    """A report generation job and its progress"""
+
+    id: str
+    key: str
+    options: Options
+    state: JobState = JobState.QUEUED
+    stages: dict[str, str] = field(
+        default_factory=lambda: dict.fromkeys(STAGES, "pending")
+    )
+    created_at: datetime = field(default_factory=datetime.now)
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    result: Path | None = None
+    error: str | None = None
+
+    @property
+    def finished(self) -> bool:
+        """
+        Check whether the job is finished
+
+        :return: True if the job succeeded or failed
+        :rtype: bool
+        """
+        return self.state in (JobState.SUCCEEDED, JobState.FAILED)
+
+    def start_stage(self, stage: str) -> None:
+        """
+        Mark a stage as running and the previous running stages as done
+
+        :param stage: The name of the stage
+        :type stage: str
+        :return: None
+        :rtype: NoneType
+        """
+        for name, status in self.stages.items():
+            if status == "running":
+                self.stages[name] = "done"
+        self.stages[stage] = "running"
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Convert the job into a JSON serializable dictionary
+
+        :return: The job state and progress
+        :rtype: dict[str, Any]
+        """
+        return {
+            "id": self.id,
+            "state": self.state.value,
+            "options": self.options.model_dump(),
+            "stages": dict(self.stages),
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "file_name": self.result.name if self.result else None,
+            "error": self.error,
+        }
+
+
+class JobManager:
+    """
+    Accept report generation jobs into a bounded queue drained by a fixed
+    number of workers.
+
+    Jobs with the same options that are still queued or running are shared,
+    and only the latest finished jobs are kept. The generations of the jobs
+    share the admission limits of /generate, and a job that is not admitted
+    stays queued until it is.
+    """
+
+    def __init__(self, runner: JobRunner, executor_settings: ExecutorSettings) -> None:
+        """
+        Constructor of the class.
+
+        :param runner: The coroutine function that generates the report file
+        :type runner: JobRunner
+        :param executor_settings: The settings with the queue size, workers
+         and retention
+        :type executor_settings: ExecutorSettings
+        :return: None
+        :rtype: NoneType
+        """
+        self._runner: JobRunner = runner
+        self.settings: ExecutorSettings = executor_settings
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._active: dict[str, Job] = {}
+        self._queue: asyncio.Queue[Job] | None = None
+        self._workers: list[asyncio.Task[None]] = []
+
+    async def start(self) -> None:
+        """
+        Start the workers that drain the job queue
+
+        :return: None
+        :rtype: NoneType
+        """
+        self._queue = asyncio.Queue(maxsize=self.settings.JOB_QUEUE_SIZE)
+        self._workers = [
+            asyncio.create_task(self._work(), name=f"job-worker-{number}")
+            for number in range(self.settings.JOB_WORKERS)
+        ]
+        logger.info(f"Started {len(self._workers)} job workers")
+
+    async def stop(self) -> None:
+        """
+        Cancel the workers of the job queue
+
+        :return: None
+        :rtype: NoneType
+        """
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+
+    def submit(self, options: Options) -> Job:
+        """
+        Submit a report generation job, reusing the job with the same options
+        if it is still queued or running
+
+        :param options: The selected options
+        :type options: Options
+        :return: The submitted job
+        :rtype: Job
+        """
+        if self._queue is None:
+            raise RuntimeError("The job manager has not been started")
+        key: str = options.model_dump_json()
+        if key in self._active:
+            return self._active[key]
+        job: Job = Job(id=uuid.uuid4().hex, key=key, options=options)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull as e:
+            raise JobQueueFullError("The job queue is full, try again later") from e
+        self._jobs[job.id] = job
+        self._active[key] = job
+        self._evict()
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        """
+        Get a job by its id
+
+        :param job_id: The id of the job
+        :type job_id: str
+        :return: The job, or None if it does not exist
+        :rtype: Job | None
+        """
+        return self._jobs.get(job_id)
+
+    def _evict(self) -> None:
+        """
+        Drop the oldest finished jobs above the retention limit
+
+        :return: None
+        :rtype: NoneType
+        """
+        excess: int = len(self._jobs) - self.settings.JOB_RETENTION
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.finished][:max(excess, 0)]:
+            del self._jobs[job_id]
+
+    async def _work(self) -> None:
+        """
+        Run the queued jobs one at a time
+
+        :return: None
+        :rtype: NoneType
+        """
+        assert self._queue is not None
+        queue: asyncio.Queue[Job] = self._queue
+        while True:
+            job: Job = await queue.get()
+            try:
+                await self._run(job)
+            finally:
+                queue.task_done()
+
+    async def _generate(self, job: Job) -> Path:
+        """
+        Generate the file of a job, waiting the suggested time and trying
+        again while the generation is not admitted
+
+        :param job: The job to be run
+        :type job: Job
+        :return: The path of the generated file
+        :rtype: Path
+        """
+        while True:
+            try:
+                return await self._runner(job.options, job.start_stage)
+            except AdmissionRejectedError as e:
+                job.state = JobState.QUEUED
+                logger.info(f"Job {job.id} was not admitted, retrying in {e.retry_after}s")
+                await asyncio.sleep(e.retry_after)
+                job.state = JobState.RUNNING
+
+    async def _run(self, job: Job) -> None:
+        """
+        Run a job and record its outcome
+
+        :param job: The job to be run
+        :type job: Job
+        :return: None
+        :rtype: NoneType
+        """
+        job.state = JobState.RUNNING
+        job.started_at = datetime.now()
+        try:
+            job.result = await self._generate(job)
+            job.stages = dict.fromkeys(job.stages, "done")
+            job.state = JobState.SUCCEEDED
+            logger.info(f"Job {job.id} succeeded")
+        except Exception as e:
+            for stage, status in job.stages.items():
+                if status == "running":
+                    job.stages[stage] = "failed"
+            job.error = str(e)
+            job.state = JobState.FAILED
+            logger.error(f"Job {job.id} failed: {e}")
+        finally:
+            job.finished_at = datetime.now()
+            self._active.pop(job.key, None)
@@ -2,6 +2,8 @@
 A module for persistence manager in the core package.
 """
 
+import json
+from pathlib import Path
 from typing import Any, Type
 
 import pandas as pd
@@ -9,12 +11,14 @@ from pandas.errors import EmptyDataError, ParserError
 from pydantic import BaseModel, FilePath
 
 from config.base_settings import BaseDataSettings
+from core.readers import read_excel
 
 
 def load_file(
     settings: BaseDataSettings,
     model: Type[BaseModel],
     *args: tuple[Any, ...],
+    reader: str = "auto",
     **kwargs: dict[str, Any],
 ) -> pd.DataFrame:
     """
@@ -26,6 +30,9 @@ def load_file(
     :type model: Type[BaseModel]
     :param args: Positional arguments to be passed to the function
     :type args: tuple[Any, ...]
+    :param reader: The preferred Excel reader, or 'auto' for the fastest
+     installed one. It is ignored when extra arguments are given
+    :type reader: str
     :param kwargs: Keyword arguments to be passed to the function
     :type kwargs: dict[str, Any]
     :return: The loaded dataframe from the given Excel file
@@ -34,6 +41,8 @@ def load_file(
     if not settings.FILENAME:
         raise ValueError("The filename must be specified")
     try:
+        if not args and not kwargs:
+            return read_excel(settings, reader)
         dataframe: pd.DataFrame = pd.read_excel(
             io=settings.FILENAME,
             sheet_name=settings.SHEET,
@@ -55,6 +64,7 @@ def load_file(
 def load_parquet(
     settings: BaseDataSettings,
     *args: tuple[Any, ...],
+    directory: Path | None = None,
     **kwargs: dict[str, Any],
 ) -> pd.DataFrame:
     """
@@ -64,23 +74,66 @@ def load_parquet(
     :type settings: BaseDataSettings
     :param args: Positional arguments to be passed to the function
     :type args: tuple[Any, ...]
+    :param directory: The snapshot directory to load the file from, or None
+     for the configured path
+    :type directory: Path | None
     :param kwargs: Keyword arguments to be passed to the function
     :type kwargs: dict[str, Any]
     """
     if not settings.PARQUET_FILENAME:
         raise ValueError("The filename must be specified")
+    path: Path = Path(settings.PARQUET_FILENAME)
+    if directory is not None:
+        path = directory / path.name
     try:
-        dataframe: pd.DataFrame = pd.read_parquet(
-            path=settings.PARQUET_FILENAME,
-            *args,
-            **kwargs,
-        )
+        # The string columns are read as Arrow-backed strings without
+        # copying them into Python objects
+        with pd.option_context("mode.string_storage", "pyarrow"):
+            dataframe: pd.DataFrame = pd.read_parquet(
+                path=path,
+                *args,
+                **kwargs,
+            )
         return dataframe
     except FileNotFoundError as e:
-        raise FileNotFoundError(f"File not found: {settings.PARQUET_FILENAME}. Error: {e}")
+        raise FileNotFoundError(f"File not found: {path}. Error: {e}")
     except EmptyDataError as e:
-        raise EmptyDataError(f"No data found in the file: {settings.PARQUET_FILENAME}. Error: {e}")
+        raise EmptyDataError(f"No data found in the file: {path}. Error: {e}")
     except ParserError as e:
-        raise ParserError(f"Error parsing the file: {settings.PARQUET_FILENAME}. Error: {e}")
+        raise ParserError(f"Error parsing the file: {path}. Error: {e}")
     except Exception as e:
-        raise Exception(f"An unexpected error occurred while loading the file: {settings.PARQUET_FILENAME}. Error: {e}")
+        raise Exception(f"An unexpected error occurred while loading the file: {path}. Error: {e}")
+
+def load_parquet_file(path: Path) -> pd.DataFrame:
+    """
+    Load a parquet file that has no data settings, like a dimension table
+
+    :param path: The path of the parquet file
+    :type path: Path
+    :return: The loaded dataframe with Arrow-backed strings
+    :rtype: pd.DataFrame
+    """
+    try:
+        with pd.option_context("mode.string_storage", "pyarrow"):
+            return pd.read_parquet(path)
+    except FileNotFoundError as e:
+        raise FileNotFoundError(f"File not found: {path}. Error: {e}")
+
+def load_json(path: Path, encoding: str = "UTF-8") -> Any:
+    """
+    Load the JSON file from the specified path
+
+    :param path: The path of the JSON file
+    :type path: Path
+    :param encoding: The encoding of the file
+    :type encoding: str
+    :return: The deserialized content of the file
+    :rtype: Any
+    """
+    try:
+        with open(path, encoding=encoding) as f:
+            return json.load(f)
+    except FileNotFoundError as e:
+        raise FileNotFoundError(f"File not found: {path}. Error: {e}")
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Error parsing the file: {path}. Error: {e}")
@@ -0,0 +1,184 @@
+"""
+A module for the ingestion manifest in the core package.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any
+
+from config.base_settings import BaseDataSettings
+from config.settings import Settings
+from core.cache import (
+    get_dimensions_path,
+    get_facet_index_path,
+    get_snapshot_version_path,
+    get_table_path,
+)
+from core.snapshots import get_snapshot_dir
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Bumped when the pipeline writes different artifacts from the same inputs,
+# so the snapshots written before are rebuilt
+MANIFEST_VERSION: int = 2
+SOURCES: tuple[str, ...] = ("binnacle", "clients", "prices", "sales", "sellout")
+CHUNK_SIZE: int = 1 << 20
+
+Manifest = dict[str, Any]
+
+
+def get_manifest_path(settings: Settings) -> Path:
+    """
+    Get the path of the ingestion manifest persisted next to the parquet
+    files
+
+    :param settings: The settings with the raw path
+    :type settings: Settings
+    :return: The path of the manifest file
+    :rtype: Path
+    """
+    return (
+        Path(settings.general.RAW_PATH)
+        / "parquet"
+        / settings.general.MANIFEST_FILENAME
+    ).resolve()
+
+
+def hash_file(path: Path) -> str:
+    """
+    Hash the content of a file in chunks
+
+    :param path: The path of the file
+    :type path: Path
+    :return: The SHA-256 of the content
+    :rtype: str
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fingerprint_settings(source_settings: BaseDataSettings) -> str:
+    """
+    Hash the settings a source is read and cleaned with
+
+    :param source_settings: The settings of the source
+    :type source_settings: BaseDataSettings
+    :return: The SHA-256 of the settings as JSON
+    :rtype: str
+    """
+    return hashlib.sha256(source_settings.model_dump_json().encode("utf-8")).hexdigest()
+
+
+def build_source_entry(source_settings: BaseDataSettings) -> dict[str, Any] | None:
+    """
+    Build the manifest entry of a source file
+
+    :param source_settings: The settings of the source
+    :type source_settings: BaseDataSettings
+    :return: The content hash, size and settings fingerprint of the source,
+     or None if the file is missing
+    :rtype: dict[str, Any] | None
+    """
+    path: Path = Path(source_settings.FILENAME)
+    try:
+        size: int = path.stat().st_size
+        content_hash: str = hash_file(path)
+    except FileNotFoundError:
+        return None
+    return {
+        "file": str(path),
+        "size": size,
+        "hash": content_hash,
+        "settings": fingerprint_settings(source_settings),
+    }
+
+
+def build_manifest(settings: Settings) -> Manifest:
+    """
+    Build the manifest of the current source files
+
+    :param settings: The settings with the source files
+    :type settings: Settings
+    :return: The manifest version and the entry of every source
+    :rtype: Manifest
+    """
+    return {
+        "version": MANIFEST_VERSION,
+        "sources": {name: build_source_entry(getattr(settings, name)) for name in SOURCES},
+    }
+
+
+def read_manifest(settings: Settings) -> Manifest:
+    """
+    Read the manifest of the last successful ingestion
+
+    :param settings: The settings with the raw path
+    :type settings: Settings
+    :return: The manifest, empty if there is none or it can not be read
+    :rtype: Manifest
+    """
+    try:
+        with open(get_manifest_path(settings), encoding="UTF-8") as f:
+            manifest: Manifest = json.load(f)
+        return manifest
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def write_manifest(manifest: Manifest, settings: Settings) -> None:
+    """
+    Write the manifest of a successful ingestion
+
+    :param manifest: The manifest to write
+    :type manifest: Manifest
+    :param settings: The settings with the raw path
+    :type settings: Settings
+    :return: None
+    :rtype: NoneType
+    """
+    path: Path = get_manifest_path(settings)
+    os.makedirs(path.parent, exist_ok=True)
+    with open(path, "w", encoding="UTF-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+
+def get_changed_sources(previous: Manifest, current: Manifest, settings: Settings) -> set[str]:
+    """
+    Get the sources whose inputs changed since the last ingestion, or whose
+    artifacts are not in the current snapshot
+
+    :param previous: The manifest of the last ingestion
+    :type previous: Manifest
+    :param current: The manifest of the current source files
+    :type current: Manifest
+    :param settings: The settings with the raw path
+    :type settings: Settings
+    :return: The names of the sources to rebuild. Every source when the
+     manifest is from another version or a shared file is missing
+    :rtype: set[str]
+    """
+    directory: Path = get_snapshot_dir(settings.general)
+    shared: list[Path] = [
+        get_snapshot_version_path(settings),
+        get_facet_index_path(settings, directory),
+        get_dimensions_path(settings, directory),
+    ]
+    if previous.get("version") != MANIFEST_VERSION or not all(path.exists() for path in shared):
+        return set(SOURCES)
+    changed: set[str] = set()
+    for name in SOURCES:
+        entry: dict[str, Any] | None = current["sources"][name]
+        if (
+            entry is None
+            or entry != previous.get("sources", {}).get(name)
+            or not get_table_path(settings, name, directory).exists()
+        ):
+            changed.add(name)
+    logger.info(f"Sources to rebuild: {sorted(changed)}")
+    return changed
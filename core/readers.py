@@ -0,0 +1,216 @@
+"""
+A module for the Excel readers in the core package.
+"""
+
+import importlib.util
+import logging
+from itertools import islice
+from typing import Any, Callable, Iterator
+
+import pandas as pd
+from openpyxl import load_workbook
+from openpyxl.cell.cell import ERROR_CODES
+from pandas.io.parsers import TextParser
+
+from config.base_settings import BaseDataSettings
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+ExcelReader = Callable[[BaseDataSettings], pd.DataFrame]
+
+
+def read_with_pandas(settings: BaseDataSettings) -> pd.DataFrame:
+    """
+    Read the sheet with the default engine of pandas
+
+    :param settings: The settings with the file, sheet, header and columns
+    :type settings: BaseDataSettings
+    :return: The loaded dataframe
+    :rtype: pd.DataFrame
+    """
+    return pd.read_excel(
+        io=settings.FILENAME,
+        sheet_name=settings.SHEET,
+        header=settings.HEADER,
+        usecols=settings.COLUMNS,
+    )
+
+
+def read_with_calamine(settings: BaseDataSettings) -> pd.DataFrame:
+    """
+    Read the sheet with the compiled calamine engine of pandas
+
+    :param settings: The settings with the file, sheet, header and columns
+    :type settings: BaseDataSettings
+    :return: The loaded dataframe
+    :rtype: pd.DataFrame
+    """
+    return pd.read_excel(
+        io=settings.FILENAME,
+        sheet_name=settings.SHEET,
+        header=settings.HEADER,
+        usecols=settings.COLUMNS,
+        engine="calamine",
+    )
+
+
+def _convert_value(value: Any) -> Any:
+    """
+    Convert a cell value the same way the openpyxl engine of pandas does
+
+    :param value: The cell value
+    :type value: Any
+    :return: An empty text for empty cells, NaN for error cells and an
+     integer for integral numbers
+    :rtype: Any
+    """
+    if value is None:
+        return ""
+    if type(value) is float:
+        return int(value) if value.is_integer() else value
+    if type(value) is str and value in ERROR_CODES:
+        return float("nan")
+    return value
+
+
+def _iter_rows(settings: BaseDataSettings) -> Iterator[list[Any]]:
+    """
+    Stream the values of the configured columns row by row, starting with
+    the rows up to the header, in read-only mode
+
+    :param settings: The settings with the file, sheet, header and columns
+    :type settings: BaseDataSettings
+    :return: The converted values of each row. Empty rows at the end of the
+     sheet are left out, as the default engine does
+    :rtype: Iterator[list[Any]]
+    """
+    columns: set[str] = set(settings.COLUMNS)
+    workbook = load_workbook(settings.FILENAME, read_only=True, data_only=True, keep_links=False)
+    try:
+        sheet = workbook[settings.SHEET]
+        sheet.reset_dimensions()
+        header_rows: list[tuple[Any, ...]] = []
+        positions: list[int] = []
+        empty_rows: list[list[Any]] = []
+        for number, row in enumerate(sheet.iter_rows(values_only=True)):
+            if number <= settings.HEADER:  # type: ignore
+                header_rows.append(row)
+                if number == settings.HEADER:
+                    positions = [position for position, value in enumerate(row) if value in columns]
+                    for kept in header_rows:
+                        yield [_convert_value(kept[position]) if position < len(kept) else "" for position in positions]
+                continue
+            values: list[Any] = [_convert_value(row[position]) if position < len(row) else "" for position in positions]
+            if all(value is None for value in row):
+                # Only kept if there are more rows with data after it
+                empty_rows.append(values)
+                continue
+            yield from empty_rows
+            empty_rows.clear()
+            yield values
+    finally:
+        workbook.close()
+
+
+def read_with_openpyxl(settings: BaseDataSettings) -> pd.DataFrame:
+    """
+    Read the sheet streaming the values of its rows in read-only mode,
+    keeping only the configured columns while the rows are parsed
+
+    The header row gives the positions of the columns, and the kept values
+    go through the same parser as pd.read_excel, so the result is the same
+    as the default engine.
+
+    :param settings: The settings with the file, sheet, header and columns
+    :type settings: BaseDataSettings
+    :return: The loaded dataframe
+    :rtype: pd.DataFrame
+    """
+    if settings.HEADER is None:
+        # The columns can only be located by name in the header row
+        return read_with_pandas(settings)
+    return TextParser(
+        list(_iter_rows(settings)), header=settings.HEADER, usecols=settings.COLUMNS
+    ).read()
+
+
+def iter_excel_batches(settings: BaseDataSettings, batch_size: int) -> Iterator[pd.DataFrame]:
+    """
+    Read the sheet in batches of rows, so only a batch of the sheet is held
+    in memory at once
+
+    Every batch is parsed with the header rows in front, the same way the
+    whole sheet is parsed by read_with_openpyxl. The column types are
+    inferred per batch.
+
+    :param settings: The settings with the file, sheet, header and columns
+    :type settings: BaseDataSettings
+    :param batch_size: The number of rows of each batch
+    :type batch_size: int
+    :return: The batches of the sheet as dataframes
+    :rtype: Iterator[pd.DataFrame]
+    """
+    if settings.HEADER is None:
+        yield read_with_pandas(settings)
+        return
+    rows: Iterator[list[Any]] = _iter_rows(settings)
+    header_rows: list[list[Any]] = list(islice(rows, settings.HEADER + 1))
+    while batch := list(islice(rows, batch_size)):
+        yield TextParser(
+            header_rows + batch, header=settings.HEADER, usecols=settings.COLUMNS
+        ).read()
+
+
+EXCEL_READERS: dict[str, ExcelReader] = {
+    "calamine": read_with_calamine,
+    "openpyxl": read_with_openpyxl,
+    "pandas": read_with_pandas,
+}
+# The module each reader needs, in order of preference
+READER_MODULES: dict[str, str] = {
+    "calamine": "python_calamine",
+    "openpyxl": "openpyxl",
+    "pandas": "openpyxl",
+}
+
+
+def get_excel_readers(preferred: str = "auto") -> list[str]:
+    """
+    Get the readers to try in order, ending with the default engine of
+    pandas
+
+    :param preferred: The preferred reader, or 'auto' for the fastest
+     installed one
+    :type preferred: str
+    :return: The names of the installed readers to try
+    :rtype: list[str]
+    """
+    names: list[str] = list(READER_MODULES) if preferred == "auto" else [preferred, "pandas"]
+    return [
+        name for name in dict.fromkeys(names)
+        if importlib.util.find_spec(READER_MODULES[name]) is not None
+    ]
+
+
+def read_excel(settings: BaseDataSettings, preferred: str = "auto") -> pd.DataFrame:
+    """
+    Read the configured columns of a sheet with the first reader that
+    succeeds
+
+    :param settings: The settings with the file, sheet, header and columns
+    :type settings: BaseDataSettings
+    :param preferred: The preferred reader, or 'auto' for the fastest
+     installed one
+    :type preferred: str
+    :return: The loaded dataframe
+    :rtype: pd.DataFrame
+    """
+    readers: list[str] = get_excel_readers(preferred)
+    for name in readers[:-1]:
+        try:
+            return EXCEL_READERS[name](settings)
+        except FileNotFoundError:
+            raise
+        except Exception as e:
+            logger.warning(f"The {name} reader failed on {settings.FILENAME}, trying the next one: {e}")
+    return EXCEL_READERS[readers[-1]](settings)
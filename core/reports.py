@@ -0,0 +1,214 @@
+"""
+A module for the report cache in the core package.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from config.settings import Settings
+from core.cache import build_fingerprint, get_snapshot_paths
+from schemas.request.options import Options
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CachedReport:
+    """A generated report file kept in the cache"""
+
+    path: Path
+    size: int
+
+
+def build_report_key(settings: Settings, options: Options) -> str:
+    """
+    Build the key of a report from its options, the snapshot it is built
+    from and the engine it is written with
+
+    :param settings: The settings with the snapshot files and the engine
+    :type settings: Settings
+    :param options: The selected options
+    :type options: Options
+    :return: The SHA-256 of the inputs of the report
+    :rtype: str
+    """
+    content: str = json.dumps(
+        {
+            "options": options.model_dump(mode="json"),
+            "snapshot": build_fingerprint(get_snapshot_paths(settings), settings),
+            "engine": settings.general.EXCEL_ENGINE,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class ReportCache:
+    """
+    Process-wide cache of the generated report files.
+
+    Every report is kept on disk in a directory named after its key, with
+    its original file name, and the index of the cached reports is kept in
+    memory. The least recently used reports are removed once the files
+    take more than the maximum size. The index is rebuilt from the
+    directory when it is first used, so the reports survive a restart.
+    """
+
+    def __init__(self, name: str, directory: Path, max_bytes: int) -> None:
+        """
+        Constructor of the class.
+
+        :param name: The name of the cache used in logs and stats
+        :type name: str
+        :param directory: The directory of the cached reports
+        :type directory: Path
+        :param max_bytes: The maximum size of the cached reports, 0 disables
+         the cache
+        :type max_bytes: int
+        :return: None
+        :rtype: NoneType
+        """
+        self.name: str = name
+        self.directory: Path = directory
+        self.max_bytes: int = max_bytes
+        self._lock: threading.Lock = threading.Lock()
+        self._reports: OrderedDict[str, CachedReport] | None = None
+        self._bytes: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def _load_index(self) -> OrderedDict[str, CachedReport]:
+        """
+        Get the index of the cached reports, rebuilding it from the
+        directory in order of last use the first time
+
+        :return: The cached reports by key, the most recently used last
+        :rtype: OrderedDict[str, CachedReport]
+        """
+        if self._reports is not None:
+            return self._reports
+        found: list[tuple[float, str, CachedReport]] = []
+        if self.directory.is_dir():
+            for entry in self.directory.iterdir():
+                files: list[Path] = sorted(entry.glob("*.xlsx")) if entry.is_dir() else []
+                if not files:
+                    continue
+                stat: os.stat_result = files[0].stat()
+                found.append((stat.st_mtime, entry.name, CachedReport(files[0], stat.st_size)))
+        self._reports = OrderedDict((key, report) for _, key, report in sorted(found))
+        self._bytes = sum(report.size for report in self._reports.values())
+        return self._reports
+
+    def _remove(self, key: str) -> None:
+        """
+        Remove a report from the index and from disk
+
+        :param key: The key of the report
+        :type key: str
+        :return: None
+        :rtype: NoneType
+        """
+        reports: OrderedDict[str, CachedReport] = self._load_index()
+        report: CachedReport = reports.pop(key)
+        self._bytes -= report.size
+        shutil.rmtree(self.directory / key, ignore_errors=True)
+
+    def get(self, key: str) -> Path | None:
+        """
+        Get the file of a cached report
+
+        :param key: The key of the report
+        :type key: str
+        :return: The path of the report, or None if it is not cached
+        :rtype: Path | None
+        """
+        if not self.max_bytes:
+            return None
+        with self._lock:
+            reports: OrderedDict[str, CachedReport] = self._load_index()
+            report: CachedReport | None = reports.get(key)
+            if report is not None and not report.path.exists():
+                # Removed by another process sharing the directory
+                self._remove(key)
+                report = None
+            if report is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            reports.move_to_end(key)
+            # The modification time keeps the order of use across restarts
+            os.utime(report.path)
+            return report.path
+
+    def put(self, key: str, path: Path) -> Path:
+        """
+        Move a generated report into the cache, removing the least recently
+        used reports beyond the maximum size
+
+        :param key: The key of the report
+        :type key: str
+        :param path: The path of the generated report
+        :type path: Path
+        :return: The path of the cached report, or the given path if the
+         cache is disabled
+        :rtype: Path
+        """
+        if not self.max_bytes:
+            return path
+        with self._lock:
+            reports: OrderedDict[str, CachedReport] = self._load_index()
+            if key in reports and reports[key].path.exists():
+                # Generated at the same time by another request
+                path.unlink(missing_ok=True)
+                reports.move_to_end(key)
+                return reports[key].path
+            if key in reports:
+                self._remove(key)
+            os.makedirs(self.directory / key, exist_ok=True)
+            cached: Path = self.directory / key / path.name
+            os.replace(path, cached)
+            reports[key] = CachedReport(cached, cached.stat().st_size)
+            self._bytes += reports[key].size
+            # The report just generated is kept even if it is over the size
+            while self._bytes > self.max_bytes and len(reports) > 1:
+                evicted: str = next(iter(reports))
+                logger.info(f"Evicting {self.name} report {evicted}")
+                self._remove(evicted)
+            return cached
+
+    def clear(self) -> None:
+        """
+        Remove every cached report
+
+        :return: None
+        :rtype: NoneType
+        """
+        with self._lock:
+            for key in list(self._load_index()):
+                self._remove(key)
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Get the hit and miss counters and the size of the cached reports
+
+        :return: The cache statistics
+        :rtype: dict[str, Any]
+        """
+        with self._lock:
+            reports: OrderedDict[str, CachedReport] = self._load_index()
+            return {
+                "name": self.name,
+                "hits": self.hits,
+                "misses": self.misses,
+                "reports": len(reports),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
@@ -0,0 +1,170 @@
+"""
+A module for the task graph scheduler in the core package.
+"""
+
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Task:
+    """
+    A node of the task graph. The results of its dependencies are passed to
+    the function as positional arguments, in the same order
+
+    The source is the input file the task reads, if any, and the restore
+    function gets the result of the task back from its persisted artifact
+    when the task does not need to run again.
+    """
+
+    name: str
+    func: Callable[..., Any]
+    dependencies: tuple[str, ...] = ()
+    source: str | None = None
+    restore: Callable[[], Any] | None = None
+
+
+@dataclass
+class GraphRun:
+    """The results of a task graph run and the time spent on each task"""
+
+    results: dict[str, Any] = field(default_factory=dict)
+    timings: dict[str, float] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+
+def _timed(func: Callable[..., Any], *args: Any) -> tuple[Any, float]:
+    """
+    Run a task function and measure the time it takes where it runs
+
+    :param func: The task function
+    :type func: Callable[..., Any]
+    :param args: The results of the dependencies of the task
+    :type args: Any
+    :return: The result of the function and the seconds it took
+    :rtype: tuple[Any, float]
+    """
+    start: float = time.perf_counter()
+    result: Any = func(*args)
+    return result, time.perf_counter() - start
+
+
+def sort_tasks(tasks: list[Task]) -> list[Task]:
+    """
+    Sort the tasks so every task comes after its dependencies, keeping the
+    given order between independent tasks
+
+    :param tasks: The tasks of the graph
+    :type tasks: list[Task]
+    :return: The tasks in topological order
+    :rtype: list[Task]
+    :raises ValueError: If a dependency is unknown or the graph has a cycle
+    """
+    names: set[str] = {task.name for task in tasks}
+    for task in tasks:
+        unknown: set[str] = set(task.dependencies) - names
+        if unknown:
+            raise ValueError(f"The task {task.name} depends on unknown tasks: {sorted(unknown)}")
+    ordered: list[Task] = []
+    done: set[str] = set()
+    pending: list[Task] = list(tasks)
+    while pending:
+        ready: list[Task] = [task for task in pending if done.issuperset(task.dependencies)]
+        if not ready:
+            raise ValueError(f"The task graph has a cycle between: {[task.name for task in pending]}")
+        ordered.extend(ready)
+        done.update(task.name for task in ready)
+        pending = [task for task in pending if task.name not in done]
+    return ordered
+
+
+def plan_graph(tasks: list[Task], changed: set[str]) -> list[Task]:
+    """
+    Keep only the tasks affected by the changed sources
+
+    The tasks that read a changed source and every task that depends on
+    them run again. The other tasks they depend on are restored from their
+    artifacts when they can be, or run again otherwise, and the rest are
+    skipped.
+
+    :param tasks: The tasks of the graph
+    :type tasks: list[Task]
+    :param changed: The names of the changed sources
+    :type changed: set[str]
+    :return: The tasks to run, in the given order
+    :rtype: list[Task]
+    :raises ValueError: If a dependency is unknown or the graph has a cycle
+    """
+    ordered: list[Task] = sort_tasks(tasks)
+    by_name: dict[str, Task] = {task.name: task for task in ordered}
+    dirty: set[str] = set()
+    for task in ordered:
+        if task.source in changed or dirty.intersection(task.dependencies):
+            dirty.add(task.name)
+
+    planned: dict[str, Task] = {}
+    pending: list[str] = list(dirty)
+    while pending:
+        task = by_name[pending.pop()]
+        if task.name in planned:
+            continue
+        if task.name not in dirty and task.restore is not None:
+            planned[task.name] = Task(task.name, task.restore)
+            continue
+        planned[task.name] = task
+        pending.extend(task.dependencies)
+    return [planned[task.name] for task in tasks if task.name in planned]
+
+
+def run_graph(tasks: list[Task], executor: Executor | None = None) -> GraphRun:
+    """
+    Run a task graph, submitting every task to the executor as soon as its
+    dependencies are done so independent chains run concurrently
+
+    :param tasks: The tasks of the graph. Independent tasks are submitted in
+     the given order, so the slowest chains should come first
+    :type tasks: list[Task]
+    :param executor: The executor to run the tasks in. The tasks run one by
+     one in the current thread if it is None
+    :type executor: Executor | None
+    :return: The result and the timing of each task
+    :rtype: GraphRun
+    :raises ValueError: If a dependency is unknown or the graph has a cycle
+    """
+    ordered: list[Task] = sort_tasks(tasks)
+    run: GraphRun = GraphRun()
+    start: float = time.perf_counter()
+    if executor is None:
+        for task in ordered:
+            args: list[Any] = [run.results[name] for name in task.dependencies]
+            run.results[task.name], run.timings[task.name] = _timed(task.func, *args)
+    else:
+        pending: list[Task] = ordered
+        running: dict[Future, Task] = {}
+        try:
+            while pending or running:
+                ready: list[Task] = [
+                    task for task in pending if all(name in run.results for name in task.dependencies)
+                ]
+                for task in ready:
+                    args = [run.results[name] for name in task.dependencies]
+                    running[executor.submit(_timed, task.func, *args)] = task
+                pending = [task for task in pending if task not in ready]
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    task = running.pop(future)
+                    run.results[task.name], run.timings[task.name] = future.result()
+        finally:
+            # Nothing else is started once a task fails
+            for future in running:
+                future.cancel()
+    run.elapsed = time.perf_counter() - start
+    for name, seconds in run.timings.items():
+        logger.info(f"Task {name} took {seconds:.3f}s")
+    logger.info(f"Task graph took {run.elapsed:.3f}s")
+    return run
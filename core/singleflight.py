@@ -0,0 +1,65 @@
+"""
+A module for the coalescing of concurrent calls in the core package.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Share one computation between the concurrent calls with the same key.
+
+    The first call starts the computation and the calls with the same key
+    that arrive while it runs await the same result or exception. The key is
+    released once the computation finishes, so later calls start a new one.
+    """
+
+    def __init__(self, name: str) -> None:
+        """
+        Constructor of the class.
+
+        :param name: The name of the computations used in logs
+        :type name: str
+        :return: None
+        :rtype: NoneType
+        """
+        self.name: str = name
+        self._flights: dict[str, asyncio.Task[Any]] = {}
+
+    async def do(self, key: str, func: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:
+        """
+        Await the computation of the given key, starting it if none is running
+
+        :param key: The key of the computation
+        :type key: str
+        :param func: The coroutine function of the computation
+        :type func: Callable[..., Awaitable[Any]]
+        :param args: Positional arguments to be passed to the function
+        :type args: Any
+        :param kwargs: Keyword arguments to be passed to the function
+        :type kwargs: Any
+        :return: The result of the computation
+        :rtype: Any
+        """
+        flight: asyncio.Task[Any] | None = self._flights.get(key)
+        if flight is None:
+            flight = asyncio.ensure_future(func(*args, **kwargs))
+            self._flights[key] = flight
+            flight.add_done_callback(lambda _: self._flights.pop(key, None))
+        else:
+            logger.info(f"Joining the running {self.name} computation")
+        # A caller that goes away does not cancel the computation of the others
+        return await asyncio.shield(flight)
+
+    def __len__(self) -> int:
+        """
+        Get the number of running computations
+
+        :return: The number of running computations
+        :rtype: int
+        """
+        return len(self._flights)
@@ -0,0 +1,194 @@
+"""
+A module for the versioned parquet snapshots in the core package.
+"""
+
+import logging
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+
+from config.settings import GeneralSettings
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+def get_parquet_path(general_settings: GeneralSettings) -> Path:
+    """
+    Get the directory of the parquet files, which holds the snapshots and
+    the pointer to the current one
+
+    :param general_settings: The general settings with the raw path
+    :type general_settings: GeneralSettings
+    :return: The parquet directory
+    :rtype: Path
+    """
+    return (Path(general_settings.RAW_PATH) / "parquet").resolve()
+
+
+def get_pointer_path(general_settings: GeneralSettings) -> Path:
+    """
+    Get the path of the file holding the version of the current snapshot
+
+    :param general_settings: The general settings with the raw path
+    :type general_settings: GeneralSettings
+    :return: The path of the snapshot version file
+    :rtype: Path
+    """
+    return get_parquet_path(general_settings) / general_settings.SNAPSHOT_VERSION_FILENAME
+
+
+def get_snapshots_path(general_settings: GeneralSettings) -> Path:
+    """
+    Get the directory with a directory per snapshot version
+
+    :param general_settings: The general settings with the raw path
+    :type general_settings: GeneralSettings
+    :return: The snapshots directory
+    :rtype: Path
+    """
+    return get_parquet_path(general_settings) / general_settings.SNAPSHOTS_DIRNAME
+
+
+def read_current_version(general_settings: GeneralSettings) -> str | None:
+    """
+    Read the version of the current snapshot
+
+    :param general_settings: The general settings with the raw path
+    :type general_settings: GeneralSettings
+    :return: The published version, or None if nothing was published
+    :rtype: str | None
+    """
+    try:
+        return get_pointer_path(general_settings).read_text().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def get_snapshot_dir(general_settings: GeneralSettings) -> Path:
+    """
+    Get the directory of the current snapshot. The files of a published
+    snapshot never change, so a reader that resolves the directory once
+    reads a consistent set of files
+
+    :param general_settings: The general settings with the raw path
+    :type general_settings: GeneralSettings
+    :return: The directory of the published version, or the parquet
+     directory for snapshots written before the versions existed
+    :rtype: Path
+    """
+    version: str | None = read_current_version(general_settings)
+    if version is not None:
+        directory: Path = get_snapshots_path(general_settings) / version
+        if directory.is_dir():
+            return directory
+    return get_parquet_path(general_settings)
+
+
+def create_snapshot(general_settings: GeneralSettings) -> tuple[str, Path]:
+    """
+    Create the directory of a new snapshot version, not visible to the
+    readers until it is published
+
+    :param general_settings: The general settings with the raw path
+    :type general_settings: GeneralSettings
+    :return: The new version and its directory
+    :rtype: tuple[str, Path]
+    """
+    version: str = datetime.now().strftime("%Y%m%d%H%M%S%f")
+    directory: Path = get_snapshots_path(general_settings) / version
+    os.makedirs(directory)
+    return version, directory
+
+
+def publish_snapshot(general_settings: GeneralSettings, version: str) -> str:
+    """
+    Make a snapshot version the current one by replacing the pointer file
+    atomically, so the readers see either the previous snapshot or the new
+    one. A version older than the current one is not published, so a slower
+    run never replaces the result of a newer one
+
+    :param general_settings: The general settings with the raw path
+    :type general_settings: GeneralSettings
+    :param version: The version to publish
+    :type version: str
+    :return: The current version after the publication
+    :rtype: str
+    """
+    current: str | None = read_current_version(general_settings)
+    if current is not None and current > version:
+        logger.warning(f"The snapshot {version} is older than the current {current}, it is not published")
+        return current
+    pointer: Path = get_pointer_path(general_settings)
+    temporary: Path = pointer.with_name(f"{pointer.name}.{os.getpid()}.tmp")
+    with open(temporary, "w") as f:
+        f.write(version)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, pointer)
+    logger.info(f"Published the snapshot {version}")
+    return version
+
+
+def discard_snapshot(directory: Path) -> None:
+    """
+    Remove the directory of a snapshot that was not published
+
+    :param directory: The directory of the snapshot
+    :type directory: Path
+    :return: None
+    :rtype: NoneType
+    """
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+def prune_snapshots(general_settings: GeneralSettings) -> list[str]:
+    """
+    Remove the snapshots older than the current one beyond the retention.
+    Newer ones may still be written, so they are left alone
+
+    :param general_settings: The general settings with the raw path and the
+     number of previous snapshots to keep
+    :type general_settings: GeneralSettings
+    :return: The removed versions
+    :rtype: list[str]
+    """
+    current: str | None = read_current_version(general_settings)
+    path: Path = get_snapshots_path(general_settings)
+    if current is None or not path.is_dir():
+        return []
+    older: list[str] = sorted(
+        directory.name for directory in path.iterdir() if directory.is_dir() and directory.name < current
+    )
+    removed: list[str] = older[:max(len(older) - general_settings.SNAPSHOT_RETENTION, 0)]
+    for version in removed:
+        shutil.rmtree(path / version, ignore_errors=True)
+    if removed:
+        logger.info(f"Removed the snapshots {removed}")
+    return removed
+
+
+def link_snapshot_files(source: Path, target: Path, names: list[str]) -> None:
+    """
+    Carry files or directories of a snapshot over to a new one. The files
+    are hard linked since they never change, or copied where links are not
+    supported
+
+    :param source: The directory of the current snapshot
+    :type source: Path
+    :param target: The directory of the new snapshot
+    :type target: Path
+    :param names: The names of the files or directories to carry over
+    :type names: list[str]
+    :return: None
+    :rtype: NoneType
+    """
+    for name in names:
+        if (source / name).is_dir():
+            os.makedirs(target / name, exist_ok=True)
+            link_snapshot_files(source / name, target / name, [path.name for path in (source / name).iterdir()])
+            continue
+        try:
+            os.link(source / name, target / name)
+        except OSError:
+            shutil.copy2(source / name, target / name)
@@ -0,0 +1,24 @@
+"""
+A module for the report pipeline stages in the core package.
+"""
+
+from typing import Callable
+
+STAGES: tuple[str, ...] = ("extract", "integrate", "load", "format")
+
+StageCallback = Callable[[str], None]
+
+
+def notify_stage(on_stage: StageCallback | None, stage: str) -> None:
+    """
+    Notify that a stage of the report pipeline has started
+
+    :param on_stage: The callback to be notified, if any
+    :type on_stage: StageCallback | None
+    :param stage: The name of the stage
+    :type stage: str
+    :return: None
+    :rtype: NoneType
+    """
+    if on_stage is not None:
+        on_stage(stage)
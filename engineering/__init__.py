@@ -0,0 +1,10 @@
+"""
+Package engineering initialization.
+"""
+
+import pandas as pd
+
+# Every DataFrame derived from another behaves as a copy, so the stages never
+# change the tables they are given and the cached snapshots can be shared
+# between threads without defensive copies
+pd.set_option("mode.copy_on_write", True)
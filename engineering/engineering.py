@@ -2,29 +2,583 @@
 A module for pipeline in the engineering package.
 """
 
+import logging
+from concurrent.futures import Executor
+from functools import partial
+from pathlib import Path
+from typing import Callable
+
 import pandas as pd
+from pydantic import BaseModel, FilePath
 
-from config.settings import Settings
-from engineering.extraction.extraction import extract
+from config.base_settings import BaseDataSettings
+from config.settings import GeneralSettings, Settings
+from core.manager import load_file, load_parquet
+from core.manifest import (
+    SOURCES,
+    Manifest,
+    build_manifest,
+    get_changed_sources,
+    read_manifest,
+    write_manifest,
+)
+from core.scheduler import GraphRun, Task, plan_graph, run_graph
+from core.snapshots import (
+    create_snapshot,
+    discard_snapshot,
+    get_snapshot_dir,
+    link_snapshot_files,
+    prune_snapshots,
+    publish_snapshot,
+)
+from core.stages import StageCallback, notify_stage
+from engineering.extraction.extraction import read_dimensions, read_snapshot_table
 from engineering.transformation.integration.integration import integrate
-from engineering.transformation.preprocessing.preprocessing import preprocess
-from engineering.loading.loading import load
+from engineering.transformation.preprocessing.cleaning.process.process import (
+    process_binnacle,
+    process_client,
+    process_price,
+    process_sale,
+    process_sellout,
+)
+from engineering.transformation.preprocessing.integration.integration import (
+    integrate_sales,
+    integrate_sellout,
+)
+from engineering.loading.delta import PERIOD_COLUMNS, get_delta_settings, get_periods, replace_periods
+from engineering.loading.loading import encode_file_base64, write_report
+from engineering.loading.staging import BatchProcess, get_staging_path, ingest_in_batches
+from schemas.binnacle import Binnacle
+from schemas.client import Client
+from schemas.price import Price
 from schemas.request.options import Options
-from engineering.loading.utils import save_dataframes_to_parquet
+from schemas.sale import Sale
+from schemas.sellout import SellOut
+from engineering.loading.utils import (
+    save_dataframe_to_parquet,
+    save_dimensions_to_parquet,
+    save_facet_index,
+)
+from engineering.transformation.preprocessing.dimensions import (
+    FACT_TABLES,
+    attach_descriptions,
+    build_star_schema,
+    get_id_column,
+)
+from engineering.transformation.preprocessing.dtypes import apply_snapshot_dtypes
+from engineering.transformation.preprocessing.facets import build_facet_index
+from engineering.transformation.preprocessing.rules import compile_binnacle
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+def _save_table(dataframe: pd.DataFrame, name: str, directory: Path) -> None:
+    """
+    Save a preprocessed table with its snapshot column types
+
+    :param dataframe: The preprocessed table
+    :type dataframe: pd.DataFrame
+    :param name: The name of the table
+    :type name: str
+    :param directory: The directory of the new snapshot
+    :type directory: Path
+    :return: None
+    :rtype: NoneType
+    """
+    save_dataframe_to_parquet(
+        name, apply_snapshot_dtypes({name: dataframe})[name], directory
+    )
+
+def _save_facts(
+    sales: pd.DataFrame,
+    sellout: pd.DataFrame,
+    general_settings: GeneralSettings,
+    directory: Path,
+) -> None:
+    """
+    Save the sales and sellout as fact tables along with their dimensions
+
+    :param sales: The integrated sales
+    :type sales: pd.DataFrame
+    :param sellout: The integrated sellout
+    :type sellout: pd.DataFrame
+    :param general_settings: The general settings required to save the tables
+    :type general_settings: GeneralSettings
+    :param directory: The directory of the new snapshot
+    :type directory: Path
+    :return: None
+    :rtype: NoneType
+    """
+    facts, dimensions = build_star_schema(
+        apply_snapshot_dtypes({"sales": sales, "sellout": sellout})
+    )
+    save_dimensions_to_parquet(dimensions, general_settings, directory)
+    for name in FACT_TABLES:
+        save_dataframe_to_parquet(name, facts[name], directory)
+
+def _save_facets(
+    binnacle: pd.DataFrame,
+    sales: pd.DataFrame,
+    sellout: pd.DataFrame,
+    general_settings: GeneralSettings,
+    directory: Path,
+) -> None:
+    """
+    Save the facet index of the filter options
+
+    :param binnacle: The compiled binnacle
+    :type binnacle: pd.DataFrame
+    :param sales: The integrated sales
+    :type sales: pd.DataFrame
+    :param sellout: The integrated sellout
+    :type sellout: pd.DataFrame
+    :param general_settings: The general settings required to save the index
+    :type general_settings: GeneralSettings
+    :param directory: The directory of the new snapshot
+    :type directory: Path
+    :return: None
+    :rtype: NoneType
+    """
+    data: dict[str, pd.DataFrame] = apply_snapshot_dtypes(
+        {"binnacle": binnacle, "sales": sales, "sellout": sellout}
+    )
+    save_facet_index(build_facet_index(data), general_settings, directory)
+
+def _publish(*saved: None, version: str, general_settings: GeneralSettings) -> str:
+    """
+    Publish the new snapshot once every file has been saved
+
+    :param saved: The results of the save tasks
+    :type saved: None
+    :param version: The version of the new snapshot
+    :type version: str
+    :param general_settings: The general settings with the raw path
+    :type general_settings: GeneralSettings
+    :return: The published snapshot version
+    :rtype: str
+    """
+    return publish_snapshot(general_settings, version)
+
+def _get_filenames(settings: Settings, *names: str) -> list[str]:
+    """
+    Get the parquet filenames of tables of the snapshot
 
+    :param settings: The settings with the parquet filenames
+    :type settings: Settings
+    :param names: The names of the tables
+    :type names: str
+    :return: The filenames within a snapshot directory
+    :rtype: list[str]
+    """
+    return [Path(getattr(settings, name).PARQUET_FILENAME).name for name in names]
 
-def run_load_data(settings: Settings) -> None:
+def build_load_graph(settings: Settings, version: str, directory: Path, current: Path) -> list[Task]:
     """
-    Executes the extraction, transformation and loading steps from the pipeline
+    Build the task graph of the extraction, transformation and loading
+    steps, with a chain per source and the dependencies between sources
+
+    The sales need the clients and the binnacle and the sellout needs the
+    binnacle. The sales chain is the slowest, so it is listed first. With
+    a batch size in the settings, the sales and sellout are read and
+    cleaned batch by batch instead of at once. The tasks whose result is
+    persisted can be restored from the current snapshot on an incremental
+    run, and the files of the save tasks that do not run are carried over.
 
     :param settings: The settings required for the pipeline execution
     :type settings: Settings
-    :return: Return the file in base64 and the file name
-    :rtype: tuple[str, str]
+    :param version: The version of the new snapshot
+    :type version: str
+    :param directory: The directory of the new snapshot
+    :type directory: Path
+    :param current: The directory of the current snapshot
+    :type current: Path
+    :return: The tasks of the pipeline
+    :rtype: list[Task]
+    """
+    general: GeneralSettings = settings.general
+    clean_sales: BatchProcess = partial(process_sale, sale_settings=settings.sales)
+    clean_sellout: BatchProcess = partial(process_sellout, sellout_settings=settings.sellout)
+    report_tasks: list[Task]
+    if general.INGEST_BATCH_SIZE:
+        # The accumulated reports are read and cleaned batch by batch
+        report_tasks = [
+            Task("ingest:sales", partial(
+                ingest_in_batches, settings.sales, clean_sales, general.INGEST_BATCH_SIZE,
+                get_staging_path("sales", general),
+            ), source="sales"),
+            Task("ingest:sellout", partial(
+                ingest_in_batches, settings.sellout, clean_sellout, general.INGEST_BATCH_SIZE,
+                get_staging_path("sellout", general), ["YEAR", "MONTH"],
+            ), source="sellout"),
+        ]
+    else:
+        report_tasks = [
+            Task(
+                "extract:sales",
+                partial(load_file, settings.sales, Sale, reader=general.EXCEL_READER),
+                source="sales",
+            ),
+            Task(
+                "extract:sellout",
+                partial(load_file, settings.sellout, SellOut, reader=general.EXCEL_READER),
+                source="sellout",
+            ),
+            Task("ingest:sales", clean_sales, ("extract:sales",)),
+            Task("ingest:sellout", clean_sellout, ("extract:sellout",)),
+        ]
+    restore_binnacle: partial[pd.DataFrame] = partial(read_snapshot_table, settings, "binnacle", current)
+    return report_tasks + [
+        Task(
+            "extract:binnacle",
+            partial(load_file, settings.binnacle, Binnacle, reader=general.EXCEL_READER),
+            source="binnacle",
+        ),
+        Task(
+            "extract:clients",
+            partial(load_file, settings.clients, Client, reader=general.EXCEL_READER),
+            source="clients",
+        ),
+        Task(
+            "extract:prices",
+            partial(load_file, settings.prices, Price, reader=general.EXCEL_READER),
+            source="prices",
+        ),
+        # The compiled binnacle keeps every column of the cleaned one
+        Task(
+            "clean:binnacle",
+            partial(process_binnacle, binnacle_settings=settings.binnacle),
+            ("extract:binnacle",),
+            restore=restore_binnacle,
+        ),
+        Task(
+            "clean:clients",
+            partial(process_client, client_settings=settings.clients),
+            ("extract:clients",),
+            restore=partial(read_snapshot_table, settings, "clients", current),
+        ),
+        Task(
+            "clean:prices",
+            partial(process_price, price_settings=settings.prices),
+            ("extract:prices",),
+            restore=partial(read_snapshot_table, settings, "prices", current),
+        ),
+        Task(
+            "integrate:sales",
+            partial(integrate_sales, settings=settings),
+            ("ingest:sales", "clean:clients", "clean:binnacle"),
+            restore=partial(read_snapshot_table, settings, "sales", current),
+        ),
+        Task(
+            "integrate:sellout",
+            integrate_sellout,
+            ("ingest:sellout", "clean:binnacle"),
+            restore=partial(read_snapshot_table, settings, "sellout", current),
+        ),
+        Task("compile:binnacle", compile_binnacle, ("clean:binnacle",), restore=restore_binnacle),
+        Task(
+            "persist:facts",
+            partial(_save_facts, general_settings=general, directory=directory),
+            ("integrate:sales", "integrate:sellout"),
+            restore=partial(
+                link_snapshot_files, current, directory,
+                [*_get_filenames(settings, *FACT_TABLES), general.DIMENSIONS_DIRNAME],
+            ),
+        ),
+        Task(
+            "persist:facets",
+            partial(_save_facets, general_settings=general, directory=directory),
+            ("compile:binnacle", "integrate:sales", "integrate:sellout"),
+            restore=partial(link_snapshot_files, current, directory, [general.FACETS_FILENAME]),
+        ),
+        Task(
+            "persist:binnacle",
+            partial(_save_table, name="binnacle", directory=directory),
+            ("compile:binnacle",),
+            restore=partial(link_snapshot_files, current, directory, _get_filenames(settings, "binnacle")),
+        ),
+        Task(
+            "persist:clients",
+            partial(_save_table, name="clients", directory=directory),
+            ("clean:clients",),
+            restore=partial(link_snapshot_files, current, directory, _get_filenames(settings, "clients")),
+        ),
+        Task(
+            "persist:prices",
+            partial(_save_table, name="prices", directory=directory),
+            ("clean:prices",),
+            restore=partial(link_snapshot_files, current, directory, _get_filenames(settings, "prices")),
+        ),
+        Task(
+            "persist:version",
+            partial(_publish, version=version, general_settings=general),
+            ("persist:facts", "persist:facets", "persist:binnacle", "persist:clients", "persist:prices"),
+        ),
+    ]
+
+def _run_in_snapshot(
+    build: Callable[[str, Path, Path], list[Task]],
+    settings: Settings,
+    executor: Executor | None = None,
+) -> GraphRun:
+    """
+    Run a task graph that writes a new snapshot and publishes it. The new
+    snapshot is removed if the graph fails, and the current one stays
+    published
+
+    :param build: The function that builds the tasks from the version and
+     directory of the new snapshot and the directory of the current one
+    :type build: Callable[[str, Path, Path], list[Task]]
+    :param settings: The settings required for the pipeline execution
+    :type settings: Settings
+    :param executor: The executor to run the independent steps concurrently,
+     or None to run them one by one
+    :type executor: Executor | None
+    :return: The result and the timing of each task
+    :rtype: GraphRun
+    """
+    current: Path = get_snapshot_dir(settings.general)
+    version, directory = create_snapshot(settings.general)
+    try:
+        run: GraphRun = run_graph(build(version, directory, current), executor)
+    except BaseException:
+        discard_snapshot(directory)
+        raise
+    prune_snapshots(settings.general)
+    return run
+
+def run_load_data(
+    settings: Settings,
+    executor: Executor | None = None,
+    force: bool = False,
+) -> dict[str, float]:
+    """
+    Executes the extraction, transformation and loading steps from the
+    pipeline for the sources that changed since the last run, and the steps
+    that depend on them
+
+    :param settings: The settings required for the pipeline execution
+    :type settings: Settings
+    :param executor: The executor to run the independent steps concurrently,
+     or None to run them one by one
+    :type executor: Executor | None
+    :param force: Rebuild every source even if it did not change
+    :type force: bool
+    :return: The seconds spent on each step, empty if nothing changed
+    :rtype: dict[str, float]
     """
-    raw_data: dict[str, pd.DataFrame] = extract(settings)
-    preprocessed_data = preprocess(raw_data, settings)
-    save_dataframes_to_parquet(preprocessed_data, settings.general)
+    manifest: Manifest = build_manifest(settings)
+    changed: set[str] = set(SOURCES) if force else get_changed_sources(
+        read_manifest(settings), manifest, settings
+    )
+    if not changed:
+        return {}
+    run: GraphRun = _run_in_snapshot(
+        lambda *args: plan_graph(build_load_graph(settings, *args), changed), settings, executor
+    )
+    write_manifest(manifest, settings)
+    return run.timings
+
+def _merge_facts(
+    *tables: pd.DataFrame,
+    names: tuple[str, ...],
+    settings: Settings,
+    directory: Path,
+    current: Path,
+) -> None:
+    """
+    Replace the periods of the delta workbooks in the stored fact tables,
+    extending the stored dimensions with the new descriptions. The stored
+    rows of the dimensions keep their keys, so the fact tables without a
+    delta workbook are carried over as they are
+
+    :param tables: The cleaned and the integrated rows of every delta, in
+     the order of the names
+    :type tables: pd.DataFrame
+    :param names: The names of the fact tables with a delta workbook
+    :type names: tuple[str, ...]
+    :param settings: The settings with the snapshot files
+    :type settings: Settings
+    :param directory: The directory of the new snapshot
+    :type directory: Path
+    :param current: The directory of the current snapshot
+    :type current: Path
+    :return: None
+    :rtype: NoneType
+    :raises ValueError: If the snapshot has no dimension tables
+    """
+    dimensions: dict[str, pd.DataFrame] = read_dimensions(settings, current)
+    if not dimensions:
+        raise ValueError("The snapshot has no dimension tables, process the accumulated reports first")
+    facts, dimensions = build_star_schema(
+        apply_snapshot_dtypes({name: tables[2 * i + 1] for i, name in enumerate(names)}), dimensions
+    )
+    save_dimensions_to_parquet(dimensions, settings.general, directory)
+    for i, name in enumerate(names):
+        stored: pd.DataFrame = load_parquet(getattr(settings, name), directory=current)
+        save_dataframe_to_parquet(
+            name, replace_periods(stored, facts[name], get_periods(tables[2 * i])), directory
+        )
+    unchanged: list[str] = [name for name in FACT_TABLES if name not in names]
+    link_snapshot_files(current, directory, _get_filenames(settings, *unchanged))
+
+def _save_period_facets(
+    binnacle: pd.DataFrame, *saved: None, settings: Settings, directory: Path
+) -> None:
+    """
+    Save the facet index from the distinct node and period rows of the
+    fact tables, which give the same index as the whole tables
+
+    :param binnacle: The compiled binnacle
+    :type binnacle: pd.DataFrame
+    :param saved: The results of the save tasks
+    :type saved: None
+    :param settings: The settings with the snapshot files
+    :type settings: Settings
+    :param directory: The directory of the new snapshot, with the fact
+     tables already saved
+    :type directory: Path
+    :return: None
+    :rtype: NoneType
+    """
+    dimensions: dict[str, pd.DataFrame] = read_dimensions(settings, directory)
+    columns: list[str] = [get_id_column("node"), *PERIOD_COLUMNS]
+    periods: dict[str, pd.DataFrame] = {
+        name: attach_descriptions(
+            load_parquet(getattr(settings, name), directory=directory, columns=columns).drop_duplicates(),
+            dimensions,
+        )
+        for name in FACT_TABLES
+    }
+    save_facet_index(build_facet_index({"binnacle": binnacle, **periods}), settings.general, directory)
+
+def build_delta_graph(settings: Settings, version: str, directory: Path, current: Path) -> list[Task]:
+    """
+    Build the task graph that merges the delta workbooks of the sales and
+    sellout into a new snapshot
+
+    Only the delta workbooks are read from Excel. The clients and the
+    binnacle they are integrated with are restored from the current
+    snapshot, and their files are carried over.
+
+    :param settings: The settings required for the pipeline execution
+    :type settings: Settings
+    :param version: The version of the new snapshot
+    :type version: str
+    :param directory: The directory of the new snapshot
+    :type directory: Path
+    :param current: The directory of the current snapshot
+    :type current: Path
+    :return: The tasks of the pipeline
+    :rtype: list[Task]
+    :raises ValueError: If there is no delta workbook
+    """
+    general: GeneralSettings = settings.general
+    deltas: dict[str, BaseDataSettings] = {
+        name: delta_settings
+        for name in FACT_TABLES
+        if (delta_settings := get_delta_settings(getattr(settings, name))) is not None
+    }
+    if not deltas:
+        raise ValueError("There is no delta workbook of the sales or the sellout to process")
+    chains: dict[str, tuple[BatchProcess, type[BaseModel], Callable[..., pd.DataFrame], tuple[str, ...]]] = {
+        "sales": (
+            partial(process_sale, sale_settings=settings.sales),
+            Sale,
+            partial(integrate_sales, settings=settings),
+            ("clean:clients", "clean:binnacle"),
+        ),
+        "sellout": (
+            partial(process_sellout, sellout_settings=settings.sellout),
+            SellOut,
+            integrate_sellout,
+            ("clean:binnacle",),
+        ),
+    }
+    tasks: list[Task] = []
+    for name, delta_settings in deltas.items():
+        clean, model, integrate_delta, dependencies = chains[name]
+        tasks += [
+            Task(f"extract:{name}", partial(load_file, delta_settings, model, reader=general.EXCEL_READER)),
+            Task(f"ingest:{name}", clean, (f"extract:{name}",)),
+            Task(f"integrate:{name}", integrate_delta, (f"ingest:{name}", *dependencies)),
+        ]
+    names: tuple[str, ...] = tuple(deltas)
+    return tasks + [
+        Task("clean:binnacle", partial(read_snapshot_table, settings, "binnacle", current)),
+        Task("clean:clients", partial(read_snapshot_table, settings, "clients", current)),
+        Task(
+            "persist:facts",
+            partial(_merge_facts, names=names, settings=settings, directory=directory, current=current),
+            tuple(task for name in names for task in (f"ingest:{name}", f"integrate:{name}")),
+        ),
+        Task(
+            "persist:facets",
+            partial(_save_period_facets, settings=settings, directory=directory),
+            ("clean:binnacle", "persist:facts"),
+        ),
+        Task(
+            "persist:tables",
+            partial(
+                link_snapshot_files, current, directory,
+                _get_filenames(settings, "binnacle", "clients", "prices"),
+            ),
+        ),
+        Task(
+            "persist:version",
+            partial(_publish, version=version, general_settings=general),
+            ("persist:facets", "persist:tables"),
+        ),
+    ]
+
+def run_delta_data(settings: Settings, executor: Executor | None = None) -> dict[str, float]:
+    """
+    Executes the pipeline on the delta workbooks of the sales and sellout,
+    replacing only their periods in the snapshot
+
+    The delta workbooks are removed once they are merged, so they are not
+    merged again over a later rebuild. A rebuild of the accumulated reports
+    replaces every period, including the merged ones.
+
+    :param settings: The settings required for the pipeline execution
+    :type settings: Settings
+    :param executor: The executor to run the independent steps concurrently,
+     or None to run them one by one
+    :type executor: Executor | None
+    :return: The seconds spent on each step
+    :rtype: dict[str, float]
+    :raises ValueError: If there is no delta workbook
+    """
+    run: GraphRun = _run_in_snapshot(partial(build_delta_graph, settings), settings, executor)
+    for name in FACT_TABLES:
+        delta_settings: BaseDataSettings | None = get_delta_settings(getattr(settings, name))
+        if delta_settings is not None:
+            Path(delta_settings.FILENAME).unlink()
+            logger.info(f"Merged and removed the delta workbook {delta_settings.FILENAME}")
+    return run.timings
+
+def run_report_data(
+    dataframes: dict[str, pd.DataFrame],
+    settings: Settings,
+    options: Options,
+    on_stage: StageCallback | None = None,
+) -> FilePath:
+    """
+    Generate the report file based on the selected options.
+
+    :param dataframes: The dataframes to generate the data
+    :type dataframes: dict[str, pd.DataFrame]
+    :param settings: The settings required for the pipeline execution
+    :type settings: Settings
+    :param options: The selected options for the transformation
+    :type options: Options
+    :param on_stage: The callback notified when each stage starts
+    :type on_stage: StageCallback | None
+    :return: The path of the generated file
+    :rtype: FilePath
+    """
+    notify_stage(on_stage, "integrate")
+    integrated_data: dict[str, pd.DataFrame] = integrate(dataframes, options)
+    return write_report(integrated_data, settings.general, options, on_stage)
 
 def run_process_data(
     dataframes: dict[str, pd.DataFrame],
@@ -43,6 +597,5 @@ def run_process_data(
     :return: Return the file in base64 and the file name
     :rtype: tuple[str, str]
     """
-    integrated_data: dict[str, pd.DataFrame] = integrate(dataframes, options)
-    file_name, file_base64 = load(integrated_data, settings.general, options)
-    return file_name, file_base64
\ No newline at end of file
+    path: FilePath = run_report_data(dataframes, settings, options)
+    return path.name, encode_file_base64(path)
\ No newline at end of file
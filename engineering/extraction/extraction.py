@@ -2,16 +2,47 @@
 A module for extraction in the engineering package.
 """
 
+from pathlib import Path
+from typing import Any
+
 import pandas as pd
 
 from config.settings import Settings
-from core.manager import load_file, load_parquet
+from config.settings import settings as app_settings
+from core.cache import (
+    SliceCache,
+    SnapshotCache,
+    get_dimensions_path,
+    get_facet_index_path,
+    get_snapshot_paths,
+)
+from core.manager import load_file, load_json, load_parquet, load_parquet_file
+from core.snapshots import get_snapshot_dir
+from engineering.transformation.preprocessing.dimensions import (
+    DIMENSIONS,
+    FACT_TABLES,
+    attach_descriptions,
+    get_id_column,
+)
+from engineering.transformation.preprocessing.dtypes import (
+    apply_snapshot_dtypes,
+)
+from engineering.transformation.preprocessing.facets import build_facet_index
+from engineering.transformation.preprocessing.rules import (
+    PERIOD_MONTHS,
+    compile_binnacle,
+    is_compiled,
+)
 from schemas.binnacle import Binnacle
 from schemas.client import Client
 from schemas.price import Price
+from schemas.request.options import Options
 from schemas.sale import Sale
 from schemas.sellout import SellOut
 
+# The node, year and month of the slice read for a report
+SliceKey = tuple[str, str, str]
+
 
 def extract(settings: Settings) -> dict[str, pd.DataFrame]:
     """
@@ -22,11 +53,12 @@ def extract(settings: Settings) -> dict[str, pd.DataFrame]:
     :return: A dictionary that contains the extracted dataframes
     :rtype: dict[str, pd.DataFrame]
     """
-    binnacle: pd.DataFrame = load_file(settings.binnacle, Binnacle)
-    clients: pd.DataFrame = load_file(settings.clients, Client)
-    prices: pd.DataFrame = load_file(settings.prices, Price)
-    sales: pd.DataFrame = load_file(settings.sales, Sale)
-    sellout: pd.DataFrame = load_file(settings.sellout, SellOut)
+    reader: str = settings.general.EXCEL_READER
+    binnacle: pd.DataFrame = load_file(settings.binnacle, Binnacle, reader=reader)
+    clients: pd.DataFrame = load_file(settings.clients, Client, reader=reader)
+    prices: pd.DataFrame = load_file(settings.prices, Price, reader=reader)
+    sales: pd.DataFrame = load_file(settings.sales, Sale, reader=reader)
+    sellout: pd.DataFrame = load_file(settings.sellout, SellOut, reader=reader)
     return {
         "binnacle": binnacle,
         "clients": clients,
@@ -35,6 +67,84 @@ def extract(settings: Settings) -> dict[str, pd.DataFrame]:
         "sellout": sellout,
     }
 
+def read_binnacle(settings: Settings, directory: Path | None = None) -> pd.DataFrame:
+    """
+    Extraction function for the compiled binnacle in parquet format
+
+    :param settings: The settings to extract the binnacle
+    :type settings: Settings
+    :param directory: The snapshot directory, the current one if None
+    :type directory: Path | None
+    :return: The binnacle with the columns of the rule table
+    :rtype: pd.DataFrame
+    """
+    binnacle: pd.DataFrame = load_parquet(
+        settings.binnacle, directory=directory or get_snapshot_dir(settings.general)
+    )
+    if not is_compiled(binnacle):
+        # Snapshots written before the rule table existed
+        binnacle = compile_binnacle(binnacle)
+    return binnacle
+
+def read_dimensions(settings: Settings, directory: Path | None = None) -> dict[str, pd.DataFrame]:
+    """
+    Extraction function for the dimension tables in parquet format
+
+    :param settings: The settings to extract the dimensions
+    :type settings: Settings
+    :param directory: The snapshot directory, the current one if None
+    :type directory: Path | None
+    :return: The dimension tables by name, empty for snapshots written
+     before the dimension tables existed
+    :rtype: dict[str, pd.DataFrame]
+    """
+    path: Path = get_dimensions_path(settings, directory)
+    return {
+        dimension: load_parquet_file(path / f"{dimension}.parquet")
+        for dimension in DIMENSIONS
+        if (path / f"{dimension}.parquet").exists()
+    }
+
+def attach_dimensions(
+    data: dict[str, pd.DataFrame], dimensions: dict[str, pd.DataFrame]
+) -> dict[str, pd.DataFrame]:
+    """
+    Attach the descriptions of the dimensions to the fact tables
+
+    :param data: The snapshot tables by name
+    :type data: dict[str, pd.DataFrame]
+    :param dimensions: The dimension tables by name
+    :type dimensions: dict[str, pd.DataFrame]
+    :return: The tables with the descriptive columns of the sales and sellout
+    :rtype: dict[str, pd.DataFrame]
+    """
+    return {
+        name: attach_descriptions(dataframe, dimensions) if name in FACT_TABLES else dataframe
+        for name, dataframe in data.items()
+    }
+
+def read_snapshot_table(settings: Settings, name: str, directory: Path | None = None) -> pd.DataFrame:
+    """
+    Extraction function for a single table of the snapshot in parquet format
+
+    :param settings: The settings to extract the table
+    :type settings: Settings
+    :param name: The name of the table
+    :type name: str
+    :param directory: The snapshot directory, the current one if None
+    :type directory: Path | None
+    :return: The table, with the descriptions of the dimensions attached to
+     the fact tables
+    :rtype: pd.DataFrame
+    """
+    directory = directory or get_snapshot_dir(settings.general)
+    if name == "binnacle":
+        return read_binnacle(settings, directory)
+    dataframe: pd.DataFrame = load_parquet(getattr(settings, name), directory=directory)
+    return apply_snapshot_dtypes(
+        attach_dimensions({name: dataframe}, read_dimensions(settings, directory))
+    )[name]
+
 def read_to_parquet(settings: Settings) -> dict[str, pd.DataFrame]:
     """
     Extraction function for the data in JSON format
@@ -44,15 +154,120 @@ def read_to_parquet(settings: Settings) -> dict[str, pd.DataFrame]:
     :return: A dictionary that contains the extracted dataframes
     :rtype: dict[str, pd.DataFrame]
     """
-    binnacle: pd.DataFrame = load_parquet(settings.binnacle)
-    clients: pd.DataFrame = load_parquet(settings.clients)
-    prices: pd.DataFrame = load_parquet(settings.prices)
-    sales: pd.DataFrame = load_parquet(settings.sales)
-    sellout: pd.DataFrame = load_parquet(settings.sellout)
-    return {
+    # Resolved once, so every table comes from the same snapshot
+    directory: Path = get_snapshot_dir(settings.general)
+    binnacle: pd.DataFrame = read_binnacle(settings, directory)
+    clients: pd.DataFrame = load_parquet(settings.clients, directory=directory)
+    prices: pd.DataFrame = load_parquet(settings.prices, directory=directory)
+    sales: pd.DataFrame = load_parquet(settings.sales, directory=directory)
+    sellout: pd.DataFrame = load_parquet(settings.sellout, directory=directory)
+    # Snapshots written before the Arrow strings are converted on load
+    return apply_snapshot_dtypes(attach_dimensions({
         "binnacle": binnacle,
         "clients": clients,
         "prices": prices,
         "sales": sales,
         "sellout": sellout,
-    }
+    }, read_dimensions(settings, directory)))
+
+snapshot_cache: SnapshotCache[dict[str, pd.DataFrame]] = SnapshotCache(
+    "parquet", read_to_parquet, get_snapshot_paths
+)
+
+def get_slice_key(options: Options) -> SliceKey:
+    """
+    Get the key of the snapshot slice required by the selected options
+
+    :param options: The selected options
+    :type options: Options
+    :return: The node, year and month of the slice
+    :rtype: SliceKey
+    """
+    return str(options.nodo), str(options.year), str(options.month)
+
+def read_snapshot_slice(settings: Settings, key: SliceKey) -> dict[str, pd.DataFrame]:
+    """
+    Extraction function for the data of a single report, pushing the node,
+    year and month predicates into the parquet reader so only the matching
+    row groups and rows are loaded. The descriptions of the dimensions are
+    attached to the rows of the slice only
+
+    :param settings: The settings to extract the data
+    :type settings: Settings
+    :param key: The node, year and month of the slice
+    :type key: SliceKey
+    :return: A dictionary that contains the extracted dataframes, with the
+     sales and sellout of the slice
+    :rtype: dict[str, pd.DataFrame]
+    """
+    nodo, year, month = key
+    # Resolved once, so every table comes from the same snapshot
+    directory: Path = get_snapshot_dir(settings.general)
+    binnacle: pd.DataFrame = read_binnacle(settings, directory)
+    # The periods reach back at most the longest period from the month
+    period_filters: list[tuple[str, str, Any]] = [
+        ("YEAR", "==", int(year)),
+        ("MONTH", "<=", int(month)),
+        ("MONTH", ">", int(month) - max(PERIOD_MONTHS.values())),
+    ]
+    # The sellout has its own node names, so it is matched by code
+    codes: list[str] = binnacle.loc[binnacle["DES_ZNJE"] == nodo, "COD_ZNJE"].unique().tolist()
+    dimensions: dict[str, pd.DataFrame] = read_dimensions(settings, directory)
+    sales_filter: tuple[str, str, Any]
+    sellout_filter: tuple[str, str, Any]
+    if "node" in dimensions:
+        nodes: pd.DataFrame = dimensions["node"]
+        node_id: str = get_id_column("node")
+        sales_filter = (node_id, "in", nodes.loc[nodes["DES_ZNJE"] == nodo, node_id].tolist())
+        sellout_filter = (node_id, "in", nodes.loc[nodes["COD_ZNJE"].isin(codes), node_id].tolist())
+    else:
+        # Snapshots written before the dimension tables existed
+        sales_filter = ("DES_ZNJE", "==", nodo)
+        sellout_filter = ("COD_ZNJE", "in", codes)
+    sales: pd.DataFrame = load_parquet(
+        settings.sales, directory=directory, filters=period_filters + [sales_filter]
+    )
+    sellout_filters: list[tuple[str, str, Any]] = period_filters + ([sellout_filter] if codes else [])
+    sellout: pd.DataFrame = load_parquet(settings.sellout, directory=directory, filters=sellout_filters)
+    return apply_snapshot_dtypes(attach_dimensions({
+        "binnacle": binnacle,
+        "clients": load_parquet(settings.clients, directory=directory),
+        "prices": load_parquet(settings.prices, directory=directory),
+        "sales": sales,
+        "sellout": sellout,
+    }, dimensions))
+
+slice_cache: SliceCache[SliceKey, dict[str, pd.DataFrame]] = SliceCache(
+    "slices", read_snapshot_slice, get_snapshot_paths, app_settings.general.SLICE_CACHE_SIZE
+)
+
+def read_facet_index(settings: Settings) -> dict[str, Any]:
+    """
+    Extraction function for the facet index of the filter options
+
+    :param settings: The settings to extract the facet index
+    :type settings: Settings
+    :return: The facet index by liquidation
+    :rtype: dict[str, Any]
+    """
+    path: Path = get_facet_index_path(settings)
+    if not path.exists():
+        # Snapshots written before the facet index existed
+        return build_facet_index(snapshot_cache.get(settings))
+    facet_index: dict[str, Any] = load_json(path)
+    return facet_index
+
+def get_facet_index_paths(settings: Settings) -> list[Path]:
+    """
+    Get the files behind the facet index
+
+    :param settings: The settings with the parquet filenames
+    :type settings: Settings
+    :return: The list of paths
+    :rtype: list[Path]
+    """
+    return get_snapshot_paths(settings) + [get_facet_index_path(settings)]
+
+facet_cache: SnapshotCache[dict[str, Any]] = SnapshotCache(
+    "facets", read_facet_index, get_facet_index_paths
+)
@@ -0,0 +1,71 @@
+"""
+A module for the monthly delta ingestion in the engineering.loading package.
+"""
+
+import logging
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from config.base_settings import BaseDataSettings
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# The columns of the partitions a delta workbook replaces
+PERIOD_COLUMNS: list[str] = ["YEAR", "MONTH"]
+
+
+def get_delta_settings(settings: BaseDataSettings) -> BaseDataSettings | None:
+    """
+    Get the settings to read the delta workbook of an accumulated report
+
+    :param settings: The settings of the accumulated report
+    :type settings: BaseDataSettings
+    :return: The same settings pointing to the delta workbook, or None if
+     there is no delta workbook to ingest
+    :rtype: BaseDataSettings | None
+    """
+    delta_filename: Path | None = getattr(settings, "DELTA_FILENAME", None)
+    if delta_filename is None or not Path(delta_filename).exists():
+        return None
+    return settings.model_copy(update={"FILENAME": delta_filename})
+
+
+def get_periods(dataframe: pd.DataFrame) -> pd.MultiIndex:
+    """
+    Get the distinct periods of a table
+
+    :param dataframe: The table with the period columns
+    :type dataframe: pd.DataFrame
+    :return: The years and months of the table
+    :rtype: pd.MultiIndex
+    """
+    return pd.MultiIndex.from_frame(dataframe[PERIOD_COLUMNS].drop_duplicates())
+
+
+def replace_periods(
+    stored: pd.DataFrame, delta: pd.DataFrame, periods: pd.MultiIndex
+) -> pd.DataFrame:
+    """
+    Replace the rows of the given periods of a stored table with the rows of
+    the delta
+
+    The accumulated reports are ordered by period, so the rows are sorted
+    back by period with a stable sort and every other row keeps its order.
+
+    :param stored: The stored table
+    :type stored: pd.DataFrame
+    :param delta: The rows of the replaced periods
+    :type delta: pd.DataFrame
+    :param periods: The periods of the cleaned delta, so a period whose rows
+     are all left out by the integration ends up empty
+    :type periods: pd.MultiIndex
+    :return: The table with the periods replaced
+    :rtype: pd.DataFrame
+    """
+    replaced: np.ndarray = pd.MultiIndex.from_frame(stored[PERIOD_COLUMNS]).isin(periods)
+    logger.info(f"Replacing {int(replaced.sum())} rows of {len(periods)} periods with {len(delta)} rows")
+    return pd.concat(
+        [stored[~replaced], delta], ignore_index=True
+    ).sort_values(by=PERIOD_COLUMNS, kind="stable", ignore_index=True)
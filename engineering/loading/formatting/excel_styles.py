@@ -8,6 +8,7 @@ from typing import Any
 from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
 from openpyxl.worksheet.worksheet import Worksheet
 
+from engineering.loading.formatting.sheet_plan import SheetPlan
 from engineering.loading.formatting.utils import get_excel_column_letter, get_cols_widths
 
 
@@ -46,95 +47,150 @@ def generate_styles() -> dict[str, Any]:
 
     return dict_styles
 
-def subtotal_format(data: pd.DataFrame, worksheet: Worksheet, list_columns: list[str]) -> None:
+def subtotal_format(data: pd.DataFrame, worksheet: Worksheet | SheetPlan, list_columns: list[str]) -> None:
     """
     Apply formatting to the subtotal of the worksheet.
 
     :param data: The exported dataframe
     :type data: pd.DataFrame
     :param worksheet: The worksheet to apply formatting to
-    :type worksheet: Worksheet
+    :type worksheet: Worksheet | SheetPlan
     :param list_columns: The list of columns to apply the subtotal
     :type list_columns: list[str]
     """
     for column_num, column_name in enumerate(data.columns):
-        column_letter: str = get_excel_column_letter(column_num + 1)
         if column_name in list_columns:
+            column_letter: str = get_excel_column_letter(column_num + 1)
             formula = f'=SUBTOTAL(9,{column_letter}3:{column_letter}{len(data) + 2})'
-            worksheet[f'{column_letter}1'] = formula
+            cell = worksheet[f'{column_letter}1']
+            cell.value = formula
             # Add formatting to the subtotal
-            worksheet[f'{column_letter}1'].font = styles["bold_black_font"]
-            worksheet[f'{column_letter}1'].fill = styles["yellow_fill"]
-            worksheet[f'{column_letter}1'].border = styles["thin_border"]
-            worksheet[f'{column_letter}1'].number_format = styles["numeric"]
+            cell.font = styles["bold_black_font"]
+            cell.fill = styles["yellow_fill"]
+            cell.border = styles["thin_border"]
+            cell.number_format = styles["numeric"]
 
-def header_format(data: pd.DataFrame, worksheet: Worksheet) -> None:
+def header_format(data: pd.DataFrame, worksheet: Worksheet | SheetPlan) -> None:
     """
     Apply formatting to the header of the worksheet.
 
     :param data: The exported dataframe
     :type data: pd.DataFrame
     :param worksheet: The worksheet to apply formatting to
-    :type worksheet: Worksheet
+    :type worksheet: Worksheet | SheetPlan
     """
     for column_num, (value, width) in enumerate(zip(data.columns.values, get_cols_widths(data))):
-        worksheet.column_dimensions[get_excel_column_letter(column_num + 1)].width = width + 2
-        worksheet[f'{get_excel_column_letter(column_num + 1)}2'] = value
+        column_letter: str = get_excel_column_letter(column_num + 1)
+        worksheet.column_dimensions[column_letter].width = width + 2
+        cell = worksheet[f'{column_letter}2']
+        cell.value = value
         # Add formatting to the header
-        worksheet[f'{get_excel_column_letter(column_num + 1)}2'].font = styles["bold_white_font"]
-        worksheet[f'{get_excel_column_letter(column_num + 1)}2'].fill = styles["dark_blue_fill"]
-        worksheet[f'{get_excel_column_letter(column_num + 1)}2'].alignment = styles["top_alignment"]
+        cell.font = styles["bold_white_font"]
+        cell.fill = styles["dark_blue_fill"]
+        cell.alignment = styles["top_alignment"]
 
-def summary_format(data: pd.DataFrame, worksheet: Worksheet) -> None:
+def summary_format(data: pd.DataFrame, worksheet: Worksheet | SheetPlan) -> None:
     """
     Load dataframes into an Excel file and apply formatting.
 
     :param data: The exported dataframe
     :type data: pd.DataFrame
     :param worksheet: The worksheet to apply formatting to
-    :type worksheet: Worksheet
+    :type worksheet: Worksheet | SheetPlan
     """
-    for column_num, value in enumerate(data.columns.values):
-        worksheet[f'{get_excel_column_letter(column_num + 1)}1'] = value
+    column_letters: list[str] = [get_excel_column_letter(column_num + 1) for column_num in range(len(data.columns))]
+    for column_letter, value in zip(column_letters, data.columns.values):
+        cell = worksheet[f'{column_letter}1']
+        cell.value = value
         # Add formatting to the header
-        worksheet[f'{get_excel_column_letter(column_num + 1)}1'].font = styles["bold_white_font"]
-        worksheet[f'{get_excel_column_letter(column_num + 1)}1'].fill = styles["dark_blue_fill"]
-        worksheet[f'{get_excel_column_letter(column_num + 1)}1'].alignment = styles["top_alignment"]
+        cell.font = styles["bold_white_font"]
+        cell.fill = styles["dark_blue_fill"]
+        cell.alignment = styles["top_alignment"]
 
-    for column_num, value in enumerate(data.iloc[-1]):
-        worksheet[f'{get_excel_column_letter(column_num + 1)}{len(data) + 1}'] = value
+    for column_letter, value in zip(column_letters, data.iloc[-1]):
+        cell = worksheet[f'{column_letter}{len(data) + 1}']
+        cell.value = value
         # Add formatting to the footer
-        worksheet[f'{get_excel_column_letter(column_num + 1)}{len(data) + 1}'].font = styles["bold_black_font"]
-        worksheet[f'{get_excel_column_letter(column_num + 1)}{len(data) + 1}'].fill = styles["yellow_fill"]
-        worksheet[f'{get_excel_column_letter(column_num + 1)}{len(data) + 1}'].border = styles["thin_border"]
-        worksheet[f'{get_excel_column_letter(column_num + 1)}{len(data) + 1}'].number_format = styles["numeric"]
+        cell.font = styles["bold_black_font"]
+        cell.fill = styles["yellow_fill"]
+        cell.border = styles["thin_border"]
+        cell.number_format = styles["numeric"]
 
-    for column_num, width in enumerate(get_cols_widths(data)):
-        worksheet.column_dimensions[get_excel_column_letter(column_num + 1)].width = width + 2
+    for column_letter, width in zip(column_letters, get_cols_widths(data)):
+        worksheet.column_dimensions[column_letter].width = width + 2
 
-def columns_format(data: pd.DataFrame, worksheet: Worksheet) -> None:
+def columns_format(data: pd.DataFrame, worksheet: Worksheet | SheetPlan) -> None:
     """
     Apply formatting to the columns of the worksheet.
 
     :param data: The exported dataframe
     :type data: pd.DataFrame
     :param worksheet: The worksheet to apply formatting to
-    :type worksheet: Worksheet
+    :type worksheet: Worksheet | SheetPlan
+    """
+    for column, style_name in get_columns_styles(data).items():
+        # Skip the subtotal and header rows. The range reaches the row after
+        # the last one, which the previous columns may have extended
+        number_format_range(worksheet, column, 3, worksheet.max_row + 1, styles[style_name])
+
+def get_columns_styles(data: pd.DataFrame) -> dict[int, str]:
+    """
+    Get the named number style of each formatted column of the worksheet.
+
+    :param data: The exported dataframe
+    :type data: pd.DataFrame
+    :return: The style name by column number (1-based)
+    :rtype: dict[int, str]
+    """
+    return {
+        column_num + 1: column_styles[column_name]
+        for column_num, column_name in enumerate(data.columns)
+        if column_name in column_styles
+    }
+
+def number_format_range(
+    worksheet: Worksheet | SheetPlan,
+    column: int,
+    first_row: int,
+    last_row: int,
+    number_format: str,
+) -> None:
+    """
+    Apply a number format to a range of rows of a column.
+
+    :param worksheet: The worksheet to apply formatting to
+    :type worksheet: Worksheet | SheetPlan
+    :param column: The column number (1-based)
+    :type column: int
+    :param first_row: The first row of the range
+    :type first_row: int
+    :param last_row: The last row of the range
+    :type last_row: int
+    :param number_format: The number format
+    :type number_format: str
+    """
+    if isinstance(worksheet, SheetPlan):
+        worksheet.number_format_range(column, first_row, last_row, number_format)
+        return
+    for (cell,) in worksheet.iter_rows(min_row=first_row, max_row=last_row, min_col=column, max_col=column):
+        cell.number_format = number_format
+
+def generate_column_styles() -> dict[str, str]:
+    """
+    Generate the named number style of the formatted columns.
+
+    :return: A dictionary of style names by column name
+    :rtype: dict[str, str]
     """
     number_columns: list[str] = ["Cliente", "Material", "Codigo Destinatario"]
     percentage_columns: list[str] = ["Bonificación", "Dto. Factura", "Dto. Adicional", "Bonif. P.Base", "Bonif. P.Neto"]
     thousand_columns: list[str] = ["Valor neto", "PVP", "P. Crédito", "APORTE", "Importe NC", "APORTE Bonif. P.Base", "APORTE Bonif. P.Neto"]
-    list_columns: list[str] = number_columns + percentage_columns + thousand_columns
-    for column_num, column_name in enumerate(data.columns):
-        if column_name in list_columns:
-            column_letter: str = get_excel_column_letter(column_num + 1)
-            # Add formatting in each cell of the column
-            for row in range(3, worksheet.max_row + 2):  # Skip the header row
-                if column_name in number_columns:
-                    worksheet[f'{column_letter}{row}'].number_format = styles["number"]
-                elif column_name in percentage_columns:
-                    worksheet[f'{column_letter}{row}'].number_format = styles["percentage"]
-                elif column_name in thousand_columns:
-                    worksheet[f'{column_letter}{row}'].number_format = styles["numeric"]
-
-styles: dict[str, Any] = generate_styles()
\ No newline at end of file
+    # The first list that contains a column sets its style
+    dict_column_styles: dict[str, str] = {}
+    for style_name, columns in (("number", number_columns), ("percentage", percentage_columns), ("numeric", thousand_columns)):
+        for column_name in columns:
+            dict_column_styles.setdefault(column_name, style_name)
+    return dict_column_styles
+
+styles: dict[str, Any] = generate_styles()
+column_styles: dict[str, str] = generate_column_styles()
\ No newline at end of file
@@ -10,9 +10,35 @@ from openpyxl.worksheet.worksheet import Worksheet
 
 from engineering.loading.formatting.sellin.sellin_format import sellin_format
 from engineering.loading.formatting.sellout.sellout_format import sellout_format
+from engineering.loading.formatting.sheet_plan import SheetPlan
 from schemas.request.options import Options
 
 
+def apply_format(
+    data: dict[str, pd.DataFrame],
+    worksheet: Worksheet | SheetPlan,
+    sheet_name: str,
+    options: Options
+) -> None:
+    """
+    Apply the formatting of the selected liquidation to a worksheet.
+
+    :param data: A dictionary with keys as sheet names and values as dataframes.
+    :type data: Dict[str, pd.DataFrame]
+    :param worksheet: The worksheet, or the plan of the worksheet, to format
+    :type worksheet: Worksheet | SheetPlan
+    :param sheet_name: The name of the sheet
+    :type sheet_name: str
+    :param options: The selected options
+    :type options: Options
+    :return: None
+    :rtype: NoneType
+    """
+    if options.liquidation == "Sell In":
+        sellin_format(data, worksheet, sheet_name, options)
+    else:
+        sellout_format(data, worksheet, sheet_name, options)
+
 def format_worksheet(
     data: dict[str, pd.DataFrame],
     path: FilePath,
@@ -35,8 +61,5 @@ def format_worksheet(
     for sheet_name in data:
         if sheet_name in workbook.sheetnames:
             worksheet = workbook[sheet_name]
-            if options.liquidation == "Sell In":
-                sellin_format(data, worksheet, sheet_name, options)
-            else:
-                sellout_format(data, worksheet, sheet_name, options)
+            apply_format(data, worksheet, sheet_name, options)
     workbook.save(path)
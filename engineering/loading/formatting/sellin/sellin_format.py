@@ -13,13 +13,14 @@ from engineering.loading.formatting.excel_styles import (
     summary_format,
     styles,
 )
+from engineering.loading.formatting.sheet_plan import SheetPlan
 from engineering.loading.formatting.utils import get_excel_column_letter
 from schemas.request.options import Options
 
 
 def sellin_format(
     dataframe: dict[str, pd.DataFrame],
-    worksheet: Worksheet,
+    worksheet: Worksheet | SheetPlan,
     sheet_name: str,
     options: Options
 ) -> None:
@@ -29,7 +30,7 @@ def sellin_format(
     :param dataframe: The exported dataframe
     :type dataframe: pd.DataFrame
     :param worksheet: The worksheet to apply formatting to
-    :type worksheet: Worksheet
+    :type worksheet: Worksheet | SheetPlan
     :param sheet_name: The name of the sheet
     :type sheet_name: str
     :param options: The selected options
@@ -11,6 +11,7 @@ from engineering.loading.formatting.excel_styles import (
     summary_format,
     subtotal_format, columns_format,
 )
+from engineering.loading.formatting.sheet_plan import SheetPlan
 from engineering.loading.formatting.utils import (
     get_cols_widths,
     get_excel_column_letter,
@@ -20,7 +21,7 @@ from schemas.request.options import Options
 
 def base_sheet_format(
     dataframe: dict[str, pd.DataFrame],
-    worksheet: Worksheet,
+    worksheet: Worksheet | SheetPlan,
     sheet_name: str,
     options: Options
 ) -> None:
@@ -30,7 +31,7 @@ def base_sheet_format(
     :param dataframe: The exported dataframe
     :type dataframe: dict[str, pd.DataFrame]
     :param worksheet: The worksheet to apply formatting to
-    :type worksheet: Worksheet
+    :type worksheet: Worksheet | SheetPlan
     :param sheet_name: The name of the sheet
     :type sheet_name: str
     :param options: The selected options
@@ -77,7 +78,7 @@ def base_sheet_format(
 
 def sellout_format(
     dataframe: dict[str, pd.DataFrame],
-    worksheet: Worksheet,
+    worksheet: Worksheet | SheetPlan,
     sheet_name: str,
     options: Options
 ) -> None:
@@ -87,7 +88,7 @@ def sellout_format(
     :param dataframe: The exported dataframe
     :type dataframe: pd.DataFrame
     :param worksheet: The worksheet to apply formatting to
-    :type worksheet: Worksheet
+    :type worksheet: Worksheet | SheetPlan
     :param sheet_name: The name of the sheet
     :type sheet_name: str
     :param options: The selected options
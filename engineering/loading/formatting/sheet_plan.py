@@ -0,0 +1,165 @@
+"""
+A module for the worksheet plan in the engineering.loading.formatting package.
+"""
+
+from collections import defaultdict
+from typing import Any
+
+from openpyxl.styles import Alignment, Border, Font, PatternFill
+from openpyxl.utils.cell import coordinate_to_tuple
+
+UNSET: Any = object()
+
+
+class CellPlan:
+    """The value and style recorded for a single cell"""
+
+    __slots__ = ("value", "font", "fill", "border", "alignment", "number_format")
+
+    def __init__(self) -> None:
+        """
+        Constructor of the class.
+
+        :return: None
+        :rtype: NoneType
+        """
+        self.value: Any = UNSET
+        self.font: Font | None = None
+        self.fill: PatternFill | None = None
+        self.border: Border | None = None
+        self.alignment: Alignment | None = None
+        self.number_format: str | None = None
+
+
+class ColumnPlan:
+    """The dimensions recorded for a single column"""
+
+    def __init__(self) -> None:
+        """
+        Constructor of the class.
+
+        :return: None
+        :rtype: NoneType
+        """
+        self.width: float | None = None
+
+
+class SheetViewPlan:
+    """The view options recorded for a worksheet"""
+
+    def __init__(self) -> None:
+        """
+        Constructor of the class.
+
+        :return: None
+        :rtype: NoneType
+        """
+        self.showGridLines: bool = True
+
+
+class SheetPlan:
+    """
+    Record the formatting applied to a worksheet before it is written.
+
+    It exposes the part of the openpyxl worksheet interface used by the
+    formatting functions, so they can format an openpyxl worksheet or
+    record the formatting to be written in a single pass.
+    """
+
+    def __init__(self, title: str, max_row: int) -> None:
+        """
+        Constructor of the class.
+
+        :param title: The name of the sheet
+        :type title: str
+        :param max_row: The last row written with the data of the sheet
+        :type max_row: int
+        :return: None
+        :rtype: NoneType
+        """
+        self.title: str = title
+        self.cells: dict[tuple[int, int], CellPlan] = {}
+        self.column_formats: defaultdict[int, list[tuple[int, int, str]]] = defaultdict(list)
+        self.column_dimensions: defaultdict[str, ColumnPlan] = defaultdict(ColumnPlan)
+        self.sheet_view: SheetViewPlan = SheetViewPlan()
+        self._max_row: int = max(max_row, 1)
+
+    @property
+    def max_row(self) -> int:
+        """
+        Get the last row with data or with a recorded cell
+
+        :return: The last row number (1-based)
+        :rtype: int
+        """
+        return self._max_row
+
+    def __getitem__(self, coordinate: str) -> CellPlan:
+        """
+        Get the cell recorded at a coordinate, creating it like openpyxl does
+
+        :param coordinate: The cell coordinate, e.g. A1
+        :type coordinate: str
+        :return: The recorded cell
+        :rtype: CellPlan
+        """
+        row, column = coordinate_to_tuple(coordinate)
+        cell: CellPlan | None = self.cells.get((row, column))
+        if cell is None:
+            cell = self.cells[(row, column)] = CellPlan()
+            self._max_row = max(self._max_row, row)
+        return cell
+
+    def number_format_range(self, column: int, first_row: int, last_row: int, number_format: str) -> None:
+        """
+        Record a number format for a range of rows of a column, without
+        creating a cell for each row
+
+        :param column: The column number (1-based)
+        :type column: int
+        :param first_row: The first row of the range
+        :type first_row: int
+        :param last_row: The last row of the range
+        :type last_row: int
+        :param number_format: The number format
+        :type number_format: str
+        :return: None
+        :rtype: NoneType
+        """
+        if first_row > last_row:
+            return
+        # Cells already recorded in the range take the new format, as in openpyxl
+        for (row, cell_column), cell in self.cells.items():
+            if cell_column == column and first_row <= row <= last_row:
+                cell.number_format = number_format
+        self.column_formats[column].append((first_row, last_row, number_format))
+        self._max_row = max(self._max_row, last_row)
+
+    def get_range_format(self, row: int, column: int) -> str | None:
+        """
+        Get the number format recorded for the range that contains a cell
+
+        :param row: The row number (1-based)
+        :type row: int
+        :param column: The column number (1-based)
+        :type column: int
+        :return: The number format of the latest range with the cell, if any
+        :rtype: str | None
+        """
+        for first_row, last_row, number_format in reversed(self.column_formats.get(column, [])):
+            if first_row <= row <= last_row:
+                return number_format
+        return None
+
+    def __setitem__(self, coordinate: str, value: Any) -> None:
+        """
+        Record the value of the cell at a coordinate
+
+        :param coordinate: The cell coordinate, e.g. A1
+        :type coordinate: str
+        :param value: The value or formula of the cell
+        :type value: Any
+        :return: None
+        :rtype: NoneType
+        """
+        self[coordinate].value = value
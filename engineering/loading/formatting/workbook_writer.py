@@ -0,0 +1,374 @@
+"""
+A module for the single-pass workbook writer in the engineering.loading.formatting package.
+"""
+
+import datetime
+import logging
+import math
+from collections import defaultdict
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+from openpyxl.utils.cell import column_index_from_string
+from pydantic import FilePath
+from xlsxwriter import Workbook
+from xlsxwriter.format import Format
+from xlsxwriter.worksheet import Worksheet
+
+from engineering.loading.formatting.formatting import apply_format
+from engineering.loading.formatting.sheet_plan import UNSET, CellPlan, SheetPlan
+from schemas.request.options import Options
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Style pandas gives to the header row when it writes a dataframe
+PANDAS_HEADER: CellPlan = CellPlan()
+PANDAS_HEADER.font = Font(bold=True)
+PANDAS_HEADER.border = Border(
+    left=Side(style="thin"),
+    right=Side(style="thin"),
+    top=Side(style="thin"),
+    bottom=Side(style="thin"),
+)
+PANDAS_HEADER.alignment = Alignment(horizontal="center", vertical="top")
+
+# Number formats pandas gives to dates when it writes a dataframe
+DATETIME_FORMAT: str = "YYYY-MM-DD HH:MM:SS"
+DATE_FORMAT: str = "YYYY-MM-DD"
+
+# xlsxwriter adds this padding (5 pixels of 7 per character) to the widths
+COLUMN_PADDING: float = 5 / 7
+
+BORDER_STYLES: dict[str, int] = {
+    "thin": 1, "medium": 2, "dashed": 3, "dotted": 4, "thick": 5,
+    "double": 6, "hair": 7, "mediumDashed": 8, "dashDot": 9,
+    "mediumDashDot": 10, "dashDotDot": 11, "mediumDashDotDot": 12,
+    "slantDashDot": 13,
+}
+
+StyleKey = tuple[Font | None, PatternFill | None, Border | None, Alignment | None, str | None]
+
+
+def _to_color(color: Any) -> str | None:
+    """
+    Convert an openpyxl color into an xlsxwriter color
+
+    :param color: The openpyxl color
+    :type color: Any
+    :return: The color as #RRGGBB, or None if it is not an RGB color
+    :rtype: str | None
+    """
+    rgb: Any = getattr(color, "rgb", None)
+    if not isinstance(rgb, str):
+        return None
+    return f"#{rgb[-6:]}"
+
+def _style_properties(key: StyleKey) -> dict[str, Any]:
+    """
+    Convert the openpyxl styles of a cell into xlsxwriter format properties
+
+    :param key: The font, fill, border, alignment and number format
+    :type key: StyleKey
+    :return: The xlsxwriter format properties
+    :rtype: dict[str, Any]
+    """
+    font, fill, border, alignment, number_format = key
+    properties: dict[str, Any] = {}
+    if font is not None:
+        if font.b:
+            properties["bold"] = True
+        if font.i:
+            properties["italic"] = True
+        if font.u:
+            properties["underline"] = True
+        if font.name:
+            properties["font_name"] = font.name
+        if font.sz:
+            properties["font_size"] = font.sz
+        if (color := _to_color(font.color)) is not None:
+            properties["font_color"] = color
+    if fill is not None and fill.fill_type == "solid":
+        properties["pattern"] = 1
+        if (color := _to_color(fill.fgColor)) is not None:
+            properties["bg_color"] = color
+    if border is not None:
+        for side in ("left", "right", "top", "bottom"):
+            style: str | None = getattr(border, side).style
+            if style is not None:
+                properties[side] = BORDER_STYLES.get(style, 1)
+    if alignment is not None:
+        if alignment.horizontal:
+            properties["align"] = alignment.horizontal
+        if alignment.vertical:
+            properties["valign"] = alignment.vertical
+        if alignment.wrap_text:
+            properties["text_wrap"] = True
+    if number_format is not None and number_format != "General":
+        properties["num_format"] = number_format
+    return properties
+
+
+class FormatRegistry:
+    """Create each distinct cell format of a workbook once"""
+
+    def __init__(self, workbook: Workbook) -> None:
+        """
+        Constructor of the class.
+
+        :param workbook: The workbook that owns the formats
+        :type workbook: Workbook
+        :return: None
+        :rtype: NoneType
+        """
+        self.workbook: Workbook = workbook
+        self._formats: dict[StyleKey, Format | None] = {}
+        self._number_formats: dict[str | None, Format | None] = {}
+
+    def get(self, cell: CellPlan | None, base: CellPlan | None = None, number_format: str | None = None) -> Format | None:
+        """
+        Get the format of a cell, with the recorded style on top of the base
+        style
+
+        :param cell: The recorded cell, if any
+        :type cell: CellPlan | None
+        :param base: The style the cell has before being formatted
+        :type base: CellPlan | None
+        :param number_format: The number format of the written value
+        :type number_format: str | None
+        :return: The xlsxwriter format, or None for the default format
+        :rtype: Format | None
+        """
+        if cell is None and base is None:
+            # Most data cells only have the number format of their column
+            if number_format not in self._number_formats:
+                self._number_formats[number_format] = self.get(CellPlan(), number_format=number_format)
+            return self._number_formats[number_format]
+        layers: list[CellPlan] = [layer for layer in (cell, base) if layer is not None]
+        key: StyleKey = (
+            next((layer.font for layer in layers if layer.font is not None), None),
+            next((layer.fill for layer in layers if layer.fill is not None), None),
+            next((layer.border for layer in layers if layer.border is not None), None),
+            next((layer.alignment for layer in layers if layer.alignment is not None), None),
+            next((layer.number_format for layer in layers if layer.number_format is not None), number_format),
+        )
+        if key not in self._formats:
+            properties: dict[str, Any] = _style_properties(key)
+            self._formats[key] = self.workbook.add_format(properties) if properties else None
+        return self._formats[key]
+
+
+def _to_excel_value(value: Any) -> tuple[Any, str | None]:
+    """
+    Convert a dataframe value the same way pandas does before writing it
+
+    :param value: The dataframe value
+    :type value: Any
+    :return: The value to be written and its number format
+    :rtype: tuple[Any, str | None]
+    """
+    if value is None or value is pd.NA or value is pd.NaT:
+        return "", None
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value), None
+    if isinstance(value, (int, np.integer)):
+        return int(value), None
+    if isinstance(value, (float, np.floating)):
+        if math.isnan(value):
+            return "", None
+        if math.isinf(value):
+            return "inf" if value > 0 else "-inf", None
+        return float(value), None
+    if isinstance(value, datetime.datetime):
+        return value, DATETIME_FORMAT
+    if isinstance(value, datetime.date):
+        return value, DATE_FORMAT
+    if isinstance(value, str):
+        return value, None
+    return str(value), None
+
+def _column_values(series: pd.Series) -> tuple[list[Any], list[str | None] | None, bool]:
+    """
+    Convert a dataframe column the same way pandas does before writing it
+
+    :param series: The dataframe column
+    :type series: pd.Series
+    :return: The values to be written (None for blanks), their number
+     formats if any, and whether every value is a number
+    :rtype: tuple[list[Any], list[str | None] | None, bool]
+    """
+    if pd.api.types.is_bool_dtype(series.dtype) or pd.api.types.is_integer_dtype(series.dtype):
+        if not series.hasnans:
+            return series.tolist(), None, not pd.api.types.is_bool_dtype(series.dtype)
+    elif pd.api.types.is_float_dtype(series.dtype):
+        array: np.ndarray = series.to_numpy(dtype=float, na_value=np.nan)
+        if not np.isinf(array).any():
+            return [None if value != value else value for value in array.tolist()], None, True
+    values: list[Any] = []
+    number_formats: list[str | None] = []
+    for raw_value in series.tolist():
+        value, number_format = _to_excel_value(raw_value)
+        values.append(None if isinstance(value, str) and value == "" else value)
+        number_formats.append(number_format)
+    return values, number_formats if any(number_formats) else None, False
+
+def _write_cell(worksheet: Worksheet, row: int, column: int, value: Any, cell_format: Format | None) -> None:
+    """
+    Write a cell the way openpyxl stores its value
+
+    :param worksheet: The worksheet to write to
+    :type worksheet: Worksheet
+    :param row: The row number (0-based)
+    :type row: int
+    :param column: The column number (0-based)
+    :type column: int
+    :param value: The value of the cell
+    :type value: Any
+    :param cell_format: The format of the cell
+    :type cell_format: Format | None
+    :return: None
+    :rtype: NoneType
+    """
+    # The formatters may set a missing value of a dataframe on a cell, which
+    # openpyxl writes as a formatted blank
+    if value is pd.NA or value is pd.NaT or (isinstance(value, (float, np.floating)) and not math.isfinite(value)):
+        value = _to_excel_value(value)[0]
+    if value is None or value is UNSET or (isinstance(value, str) and value == ""):
+        if cell_format is not None:
+            worksheet.write_blank(row, column, None, cell_format)
+    elif isinstance(value, (bool, np.bool_)):
+        worksheet.write_boolean(row, column, bool(value), cell_format)
+    elif isinstance(value, (int, float, np.integer, np.floating)):
+        worksheet.write_number(row, column, value, cell_format)
+    elif isinstance(value, str):
+        if len(value) > 1 and value.startswith("="):
+            worksheet.write_formula(row, column, value, cell_format)
+        else:
+            worksheet.write_string(row, column, value, cell_format)
+    elif isinstance(value, (datetime.datetime, datetime.date)):
+        worksheet.write_datetime(row, column, value, cell_format)
+    else:
+        worksheet.write_string(row, column, str(value), cell_format)
+
+def _write_sheet(
+    workbook: Workbook,
+    formats: FormatRegistry,
+    dataframe: pd.DataFrame,
+    plan: SheetPlan,
+    start_row: int,
+    header: bool,
+) -> None:
+    """
+    Write a dataframe and its recorded formatting into a new worksheet
+
+    :param workbook: The workbook to add the worksheet to
+    :type workbook: Workbook
+    :param formats: The formats of the workbook
+    :type formats: FormatRegistry
+    :param dataframe: The dataframe of the sheet
+    :type dataframe: pd.DataFrame
+    :param plan: The formatting recorded for the sheet
+    :type plan: SheetPlan
+    :param start_row: The row where the dataframe starts (0-based)
+    :type start_row: int
+    :param header: Write the column names before the data
+    :type header: bool
+    :return: None
+    :rtype: NoneType
+    """
+    worksheet: Worksheet = workbook.add_worksheet(plan.title)
+    if not plan.sheet_view.showGridLines:
+        worksheet.hide_gridlines(2)
+    for letter, dimension in plan.column_dimensions.items():
+        if dimension.width is not None:
+            column: int = column_index_from_string(letter) - 1
+            worksheet.set_column(column, column, dimension.width - COLUMN_PADDING)
+
+    cells: dict[tuple[int, int], CellPlan] = dict(plan.cells)
+    cell_format: Format | None
+    row: int = start_row + 1
+    if header:
+        for column, name in enumerate(dataframe.columns, 1):
+            cell: CellPlan | None = cells.pop((row, column), None)
+            value: Any = cell.value if cell is not None and cell.value is not UNSET else str(name)
+            range_format: str | None = plan.get_range_format(row, column)
+            _write_cell(worksheet, row - 1, column - 1, value, formats.get(cell, PANDAS_HEADER, range_format))
+        row += 1
+
+    first_data_row: int = row
+    last_data_row: int = first_data_row + len(dataframe) - 1
+    rows: range = range(first_data_row, last_data_row + 1)
+    cells_by_column: defaultdict[int, dict[int, CellPlan]] = defaultdict(dict)
+    for (row, column) in [key for key in cells if key[0] in rows and key[1] <= dataframe.shape[1]]:
+        cells_by_column[column][row] = cells.pop((row, column))
+
+    for column, (_, series) in enumerate(dataframe.items(), 1):
+        values, value_formats, numeric = _column_values(series)
+        # The number format of the ranges is resolved once per column
+        row_formats: list[str | None] = [None] * len(rows)
+        for first_row, last_row, number_format in plan.column_formats.get(column, []):
+            first, last = max(first_row, first_data_row), min(last_row, last_data_row)
+            if first <= last:
+                row_formats[first - first_data_row:last - first_data_row + 1] = [number_format] * (last - first + 1)
+        if value_formats is not None:
+            row_formats = [range_format or value_format for range_format, value_format in zip(row_formats, value_formats)]
+        column_cells: dict[int, CellPlan] = cells_by_column.get(column, {})
+        for row, value, number_format in zip(rows, values, row_formats):
+            cell = column_cells.get(row) if column_cells else None
+            if cell is None:
+                cell_format = formats.get(None, number_format=number_format) if number_format else None
+                if numeric and value is not None:
+                    worksheet.write_number(row - 1, column - 1, value, cell_format)
+                    continue
+            else:
+                if cell.value is not UNSET:
+                    value = cell.value
+                cell_format = formats.get(cell, number_format=number_format)
+            _write_cell(worksheet, row - 1, column - 1, value, cell_format)
+
+    for (row, column), cell in cells.items():
+        _write_cell(worksheet, row - 1, column - 1, cell.value, formats.get(cell, number_format=plan.get_range_format(row, column)))
+
+    # Rows of a range without data or recorded cells are written as formatted blanks
+    for column, ranges in plan.column_formats.items():
+        for first_row, last_row, _ in ranges:
+            for row in range(first_row, last_row + 1):
+                if first_data_row <= row <= last_data_row or (row, column) in cells:
+                    continue
+                _write_cell(worksheet, row - 1, column - 1, None, formats.get(None, number_format=plan.get_range_format(row, column)))
+
+def save_formatted_workbook(
+    data: dict[str, pd.DataFrame],
+    path: FilePath,
+    options: Options,
+) -> None:
+    """
+    Save dataframes into an Excel file applying the formatting while writing.
+
+    The formatting of each sheet is recorded first and then written together
+    with the data, so the workbook is serialized once.
+
+    :param data: A dictionary with keys as sheet names and values as dataframes.
+    :type data: Dict[str, pd.DataFrame]
+    :param path: The file path where to save the Excel file
+    :type path: FilePath
+    :param options: The selected options
+    :type options: Options
+    :return: None
+    :rtype: NoneType
+    """
+    with Workbook(path) as workbook:
+        formats: FormatRegistry = FormatRegistry(workbook)
+        for sheet_name, dataframe in data.items():
+            if "Base" in sheet_name:
+                start_row, header = 2, False
+            elif "Resumen" in sheet_name:
+                start_row, header = 0, True
+            else:
+                continue
+            data_rows: int = len(dataframe) + int(header)
+            plan: SheetPlan = SheetPlan(sheet_name, start_row + data_rows if data_rows else 0)
+            apply_format(data, plan, sheet_name, options)
+            _write_sheet(workbook, formats, dataframe, plan, start_row, header)
+    logger.info("Workbook written in a single pass")
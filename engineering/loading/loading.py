@@ -9,20 +9,25 @@ import pandas as pd
 from pydantic import FilePath, NewPath
 
 from config.settings import GeneralSettings
+from core.stages import StageCallback, notify_stage
 from engineering.loading.formatting.formatting import format_worksheet
+from engineering.loading.formatting.workbook_writer import save_formatted_workbook
 from schemas.request.options import Options
 from engineering.loading.utils import save_dataframes_to_excel, generate_output_filename
 
 logger: logging.Logger = logging.getLogger(__name__)
 
+XLSX_MEDIA_TYPE: str = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
 
-def load(
+
+def write_report(
     transformed_data: dict[str, pd.DataFrame],
     general_settings: GeneralSettings,
     options: Options,
-) -> tuple[str, str]:
+    on_stage: StageCallback | None = None,
+) -> FilePath:
     """
-    Load dataframes into an Excel file and apply formatting.
+    Write dataframes into an Excel file and apply formatting.
 
     :param transformed_data: A dictionary with keys as sheet names and values as dataframes.
     :type transformed_data: dict[str, pd.DataFrame]
@@ -30,9 +35,11 @@ def load(
     dataframes
     :type general_settings: GeneralSettings
     :param options: The selected options
-    :type options: dict[str, Any]
-    :return: The path where the data has been saved and the updated output filename
-    :rtype: tuple[str, str]
+    :type options: Options
+    :param on_stage: The callback notified when each stage starts
+    :type on_stage: StageCallback | None
+    :return: The path where the data has been saved
+    :rtype: FilePath
     """
     updated_output_filename: NewPath = generate_output_filename(
         general_settings, options
@@ -41,12 +48,58 @@ def load(
         general_settings.PROCESSED_PATH
         / updated_output_filename
     ).resolve()
-    save_dataframes_to_excel(transformed_data, path)
-    format_worksheet(transformed_data, path, options)
+    notify_stage(on_stage, "load")
+    if general_settings.EXCEL_ENGINE == "xlsxwriter":
+        # The formatting is applied while the data is written
+        save_formatted_workbook(transformed_data, path, options)
+    else:
+        save_dataframes_to_excel(transformed_data, path)
+        notify_stage(on_stage, "format")
+        format_worksheet(transformed_data, path, options)
     logging.info("Data has been loaded successfully")
-    # Convert the file to base64
-    file_name: str = updated_output_filename.name
-    file_bytes: bytes = path.read_bytes()
+    return path
+
+def encode_base64(file_bytes: bytes) -> str:
+    """
+    Encode the content of an Excel file as a base64 data URL.
+
+    :param file_bytes: The content of the Excel file
+    :type file_bytes: bytes
+    :return: The file as a base64 data URL
+    :rtype: str
+    """
     file_base64: str = base64.b64encode(file_bytes).decode("utf-8")
-    file_base64 = f"data:application/vnd.openxmlformats-officedocument.spreadsheetml.sheet;base64,{file_base64}"
-    return file_name, file_base64
+    return f"data:{XLSX_MEDIA_TYPE};base64,{file_base64}"
+
+def encode_file_base64(path: FilePath) -> str:
+    """
+    Encode an Excel file as a base64 data URL.
+
+    :param path: The path of the Excel file
+    :type path: FilePath
+    :return: The file as a base64 data URL
+    :rtype: str
+    """
+    return encode_base64(path.read_bytes())
+
+def load(
+    transformed_data: dict[str, pd.DataFrame],
+    general_settings: GeneralSettings,
+    options: Options,
+) -> tuple[str, str]:
+    """
+    Load dataframes into an Excel file and apply formatting.
+
+    :param transformed_data: A dictionary with keys as sheet names and values as dataframes.
+    :type transformed_data: dict[str, pd.DataFrame]
+    :param general_settings: The general settings required to load the
+    dataframes
+    :type general_settings: GeneralSettings
+    :param options: The selected options
+    :type options: dict[str, Any]
+    :return: The path where the data has been saved and the updated output filename
+    :rtype: tuple[str, str]
+    """
+    path: FilePath = write_report(transformed_data, general_settings, options)
+    # Convert the file to base64
+    return path.name, encode_file_base64(path)
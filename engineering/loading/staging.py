@@ -0,0 +1,155 @@
+"""
+A module for the batched ingestion in the engineering.loading package.
+"""
+
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from config.base_settings import BaseDataSettings
+from config.settings import GeneralSettings
+from core.readers import iter_excel_batches
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+BatchProcess = Callable[[pd.DataFrame], pd.DataFrame]
+
+
+def get_staging_path(name: str, general_settings: GeneralSettings) -> Path:
+    """
+    Get the directory where the batches of a table are staged
+
+    :param name: The name of the table
+    :type name: str
+    :param general_settings: The general settings with the raw path
+    :type general_settings: GeneralSettings
+    :return: The staging directory of the table
+    :rtype: Path
+    """
+    return (
+        Path(general_settings.RAW_PATH)
+        / "parquet"
+        / general_settings.STAGING_DIRNAME
+        / name
+    ).resolve()
+
+
+def stage_in_batches(
+    settings: BaseDataSettings,
+    process: BatchProcess,
+    path: Path,
+    batch_size: int,
+) -> list[Path]:
+    """
+    Read a workbook in batches of rows and stage every cleaned batch as a
+    parquet file, so only a batch is held in memory at once
+
+    :param settings: The settings with the file, sheet, header and columns
+    :type settings: BaseDataSettings
+    :param process: The cleaning steps applied to each batch
+    :type process: BatchProcess
+    :param path: The staging directory, emptied before the batches are
+     written
+    :type path: Path
+    :param batch_size: The number of rows of each batch
+    :type batch_size: int
+    :return: The staged files in the order of the workbook
+    :rtype: list[Path]
+    """
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path)
+    files: list[Path] = []
+    for number, batch in enumerate(iter_excel_batches(settings, batch_size)):
+        cleaned: pd.DataFrame = process(batch)
+        file: Path = path / f"part-{number:05d}.parquet"
+        cleaned.to_parquet(file, engine="pyarrow", index=False)
+        files.append(file)
+    logger.info(f"Staged {len(files)} batches of {settings.FILENAME}")
+    return files
+
+
+def _unify_schema(tables: list[pa.Table]) -> pa.Schema:
+    """
+    Get the schema every staged batch can be cast to
+
+    The column types are inferred per batch, so a column may be integer in
+    one batch and float in another, or have no values at all in a batch.
+    Columns without values do not take part in the promotion.
+
+    :param tables: The staged batches
+    :type tables: list[pa.Table]
+    :return: The promoted schema, with the pandas metadata of the first batch
+    :rtype: pa.Schema
+    """
+    fields: list[pa.Field] = []
+    for field in tables[0].schema:
+        schemas: list[pa.Schema] = [
+            pa.schema([table.schema.field(field.name)])
+            for table in tables
+            if table.column(field.name).null_count < table.num_rows
+        ]
+        fields.append(
+            pa.unify_schemas(schemas or [pa.schema([field])], promote_options="permissive").field(field.name)
+        )
+    return pa.schema(fields, metadata=tables[0].schema.metadata)
+
+
+def compact_staging(files: list[Path], sort_by: list[str] | None = None) -> pd.DataFrame:
+    """
+    Compact the staged batches into a single dataframe
+
+    :param files: The staged files in the order of the workbook
+    :type files: list[Path]
+    :param sort_by: The columns to sort the rows by, as the cleaning of the
+     whole table does. The sort is stable, so it gives the same order
+    :type sort_by: list[str] | None
+    :return: The cleaned table
+    :rtype: pd.DataFrame
+    """
+    tables: list[pa.Table] = [pq.read_table(file) for file in files]
+    if not tables:
+        return pd.DataFrame()
+    schema: pa.Schema = _unify_schema(tables)
+    table: pa.Table = pa.concat_tables([table.cast(schema) for table in tables])
+    with pd.option_context("mode.string_storage", "pyarrow"):
+        dataframe: pd.DataFrame = table.to_pandas()
+    if sort_by:
+        dataframe = dataframe.sort_values(by=sort_by, kind="stable")
+    return dataframe
+
+
+def ingest_in_batches(
+    settings: BaseDataSettings,
+    process: BatchProcess,
+    batch_size: int,
+    path: Path,
+    sort_by: list[str] | None = None,
+) -> pd.DataFrame:
+    """
+    Extract and clean a workbook batch by batch, then compact the staged
+    batches and remove them
+
+    :param settings: The settings with the file, sheet, header and columns
+    :type settings: BaseDataSettings
+    :param process: The cleaning steps applied to each batch
+    :type process: BatchProcess
+    :param batch_size: The number of rows of each batch
+    :type batch_size: int
+    :param path: The staging directory of the table
+    :type path: Path
+    :param sort_by: The columns the cleaning of the whole table sorts by
+    :type sort_by: list[str] | None
+    :return: The cleaned table
+    :rtype: pd.DataFrame
+    """
+    try:
+        files: list[Path] = stage_in_batches(settings, process, path, batch_size)
+        return compact_staging(files, sort_by)
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
@@ -2,16 +2,35 @@
 A module for utils in the engineering.loading.formatting package.
 """
 
+import json
 import os
 from datetime import datetime
 from pathlib import Path
+from typing import Any
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from pydantic import FilePath, NewPath
 
 from config.settings import GeneralSettings
+from core.snapshots import (
+    create_snapshot,
+    discard_snapshot,
+    prune_snapshots,
+    publish_snapshot,
+)
 from schemas.request.options import Options
 
+# The tables written with one row group per slice, so the reports only read
+# the row groups of their year and node
+SLICE_COLUMNS: dict[str, list[str]] = {
+    "sales": ["YEAR", "NODE_ID"],
+    "sellout": ["YEAR", "NODE_ID"],
+}
+ROW_GROUP_SIZE: int = 65536
+
 
 def generate_output_filename(
     settings: GeneralSettings,
@@ -61,16 +80,126 @@ def save_dataframes_to_excel(
 def save_dataframes_to_parquet(
     dataframes: dict[str, pd.DataFrame],
     general_settings: GeneralSettings,
-) -> None:
+) -> str:
     """
-    Save dataframes into a JSON file.
+    Save dataframes into a new snapshot and publish it.
 
     :param dataframes: A dictionary with keys as sheet names and values as dataframes.
     :type dataframes: Dict[str, pd.DataFrame]
     :param general_settings: The general settings required to save the dataframes
     :type general_settings: GeneralSettings
+    :return: The published snapshot version
+    :rtype: str
+    """
+    version, directory = create_snapshot(general_settings)
+    try:
+        for name, dataframe in dataframes.items():
+            save_dataframe_to_parquet(name, dataframe, directory)
+    except BaseException:
+        discard_snapshot(directory)
+        raise
+    publish_snapshot(general_settings, version)
+    prune_snapshots(general_settings)
+    return version
+
+def save_dataframe_to_parquet(
+    name: str,
+    dataframe: pd.DataFrame,
+    directory: Path,
+) -> None:
+    """
+    Save a single table of a snapshot into its parquet file, without
+    publishing the snapshot.
+
+    :param name: The name of the table
+    :type name: str
+    :param dataframe: The table to save
+    :type dataframe: pd.DataFrame
+    :param directory: The directory of the snapshot
+    :type directory: Path
+    :return: None
+    :rtype: NoneType
     """
-    for name, dataframe in dataframes.items():
-        file_path: str = f"{general_settings.RAW_PATH}/parquet/{name}.parquet"
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    file_path: str = f"{directory}/{name}.parquet"
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    if name in SLICE_COLUMNS:
+        save_sliced_parquet(dataframe, file_path, SLICE_COLUMNS[name])
+    else:
         dataframe.to_parquet(file_path, engine="pyarrow", index=False)
+
+def save_sliced_parquet(
+    dataframe: pd.DataFrame,
+    file_path: str,
+    slice_columns: list[str],
+) -> None:
+    """
+    Save a dataframe into a parquet file with its rows grouped by slice.
+
+    Every row group holds the rows of a single slice in their original
+    order, so the min/max statistics of the slice columns let the readers
+    skip the row groups of other slices.
+
+    :param dataframe: The dataframe to save
+    :type dataframe: pd.DataFrame
+    :param file_path: The path of the parquet file
+    :type file_path: str
+    :param slice_columns: The columns that identify a slice
+    :type slice_columns: list[str]
+    :return: None
+    :rtype: NoneType
+    """
+    schema: pa.Schema = pa.Schema.from_pandas(dataframe, preserve_index=False)
+    slices: dict[Any, np.ndarray] = dataframe.groupby(slice_columns, sort=False, dropna=False).indices
+    with pq.ParquetWriter(file_path, schema) as writer:
+        for positions in slices.values():
+            for start in range(0, len(positions), ROW_GROUP_SIZE):
+                chunk: pd.DataFrame = dataframe.iloc[positions[start:start + ROW_GROUP_SIZE]]
+                writer.write_table(
+                    pa.Table.from_pandas(chunk, schema=schema, preserve_index=False),
+                    row_group_size=ROW_GROUP_SIZE,
+                )
+
+def save_dimensions_to_parquet(
+    dimensions: dict[str, pd.DataFrame],
+    general_settings: GeneralSettings,
+    directory: Path,
+) -> None:
+    """
+    Save the dimension tables into their own directory in a snapshot.
+
+    :param dimensions: The dimension tables by name
+    :type dimensions: dict[str, pd.DataFrame]
+    :param general_settings: The general settings required to save the tables
+    :type general_settings: GeneralSettings
+    :param directory: The directory of the snapshot
+    :type directory: Path
+    :return: None
+    :rtype: NoneType
+    """
+    dimensions_path: str = f"{directory}/{general_settings.DIMENSIONS_DIRNAME}"
+    os.makedirs(dimensions_path, exist_ok=True)
+    for name, dataframe in dimensions.items():
+        dataframe.to_parquet(f"{dimensions_path}/{name}.parquet", engine="pyarrow", index=False)
+
+def save_facet_index(
+    facet_index: dict[str, Any],
+    general_settings: GeneralSettings,
+    directory: Path,
+) -> None:
+    """
+    Save the facet index into a JSON file next to the parquet files of a
+    snapshot.
+
+    :param facet_index: The facet index by liquidation
+    :type facet_index: dict[str, Any]
+    :param general_settings: The general settings required to save the index
+    :type general_settings: GeneralSettings
+    :param directory: The directory of the snapshot
+    :type directory: Path
+    :return: None
+    :rtype: NoneType
+    """
+    file_path: str = f"{directory}/{general_settings.FACETS_FILENAME}"
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with open(file_path, "w", encoding="UTF-8") as f:
+        json.dump(facet_index, f, ensure_ascii=False)
@@ -2,6 +2,7 @@
 Module to integrate the binnacle dataframe.
 """
 
+import numpy as np
 import pandas as pd
 
 from typing import Any
@@ -9,6 +10,11 @@ from pydantic import PositiveInt
 
 from schemas.request.options import Options
 
+# Helper columns to keep the order of the rules while expanding wildcards
+ROW_ORDER: str = "__ROW_ORDER"
+VALUE_ORDER: str = "__VALUE_ORDER"
+ROW_LABEL: str = "__ROW_LABEL"
+
 
 class BinnacleIntegrator:
     """
@@ -46,33 +52,7 @@ class BinnacleIntegrator:
         :return: A dataframe with the family column overwritten.
         :rtype: Pd.DataFrame
         """
-        dataframe['FAMILIA'] = dataframe['FAMILIA'].apply(lambda family: str(family).split(" ")[1][:3].upper())
-        return dataframe
-
-    @staticmethod
-    def create_lower_tm_column(dataframe: pd.DataFrame) -> pd.DataFrame:
-        """
-        Create the lower TM column in the binnacle dataframe.
-
-        :param dataframe: The dataframe containing binnacle data.
-        :type dataframe: pd.DataFrame
-        :return: A dataframe with the lower TM column.
-        :rtype: pd.DataFrame
-        """
-        dataframe['LOWER_TM'] = dataframe['CONDICION'].str.split(' - ').str[0].str.replace('K', '').astype(float) * 1000
-        return dataframe
-
-    @staticmethod
-    def create_upper_tm_column(dataframe: pd.DataFrame) -> pd.DataFrame:
-        """
-        Create the upper TM column in the binnacle dataframe.
-
-        :param dataframe: The dataframe containing binnacle data.
-        :type dataframe: pd.DataFrame
-        :return: A dataframe with the upper TM column.
-        :rtype: pd.DataFrame
-        """
-        dataframe['UPPER_TM'] = dataframe['CONDICION'].str.split(' - ').str[1].str.split(' ').str[0].str.replace('K', '').astype(float) * 1000
+        dataframe['FAMILIA'] = dataframe['FAMILY_CODE']
         return dataframe
 
     @staticmethod
@@ -102,7 +82,7 @@ class BinnacleIntegrator:
         """
         filtered_df: pd.DataFrame = dataframe.loc[
             (dataframe["MEAN_TM"] >= dataframe["LOWER_TM"]) & (dataframe["MEAN_TM"] <= dataframe["UPPER_TM"])
-        ].copy()
+        ]
         return filtered_df
 
     @staticmethod
@@ -115,10 +95,7 @@ class BinnacleIntegrator:
         :return: The application of the filtered binnacle
         :rtype: str
         """
-        type_application: str = dataframe['APLICACION'].unique().tolist()[0]
-        type_application = 'TMS' if type_application == 'Tonelada' \
-            else 'P_BASE' if type_application == 'Precio Base' \
-            else 'VALOR_NETO'
+        type_application: str = dataframe['APPLICATION'].unique().tolist()[0]
         return type_application
 
     @staticmethod
@@ -133,12 +110,58 @@ class BinnacleIntegrator:
         :return: The list of months
         :rtype: list[str]
         """
-        period = dataframe['PERIODO'].unique().tolist()[0]
-        period_dict: dict[str, PositiveInt] = {'Mensual': 1, 'Bimensual': 2, 'Trimestral': 3}
-
-        list_month: list[int] = list(range(1, int(selected_month) + 1))[-period_dict[period]:]
+        period: PositiveInt = int(dataframe['PERIOD_MONTHS'].unique().tolist()[0])
+        list_month: list[int] = list(range(1, int(selected_month) + 1))[-period:]
         return list_month
 
+    @staticmethod
+    def expand_wildcard_column(
+        validators_df: pd.DataFrame,
+        sellin_sellout: pd.DataFrame,
+        key_columns: list[str],
+        column: str
+    ) -> pd.DataFrame:
+        """
+        Replace the 'Todo' values of a validator column with every value of
+        the sales that matches the previous validators of the row
+
+        :param validators_df: The binnacle dataframe being expanded
+        :type validators_df: pd.DataFrame
+        :param sellin_sellout: The filtered sellin or sellout dataframe
+        :type sellin_sellout: pd.DataFrame
+        :param key_columns: The validators already expanded
+        :type key_columns: list[str]
+        :param column: The validator to expand
+        :type column: str
+        :return: The dataframe with the column expanded, in the original
+         order of the rows and of the sales values
+        :rtype: pd.DataFrame
+        """
+        is_wildcard: np.ndarray = (validators_df[column] == 'Todo').to_numpy()
+        if not is_wildcard.any():
+            return validators_df
+        row_order: np.ndarray = np.arange(len(validators_df))
+        concrete: pd.DataFrame = validators_df[~is_wildcard].assign(**{ROW_ORDER: row_order[~is_wildcard], VALUE_ORDER: 0})
+
+        # The distinct combinations of the sales in order of first appearance,
+        # without null keys since they never compare equal
+        candidates: pd.DataFrame = sellin_sellout[key_columns + [column]].drop_duplicates()
+        candidates = candidates.dropna(subset=key_columns).astype(object)
+        candidates[VALUE_ORDER] = np.arange(1, len(candidates) + 1)
+
+        wildcards: pd.DataFrame = validators_df[is_wildcard].drop(columns=[column])
+        wildcards = wildcards.astype(dict.fromkeys(key_columns, object))
+        wildcards = wildcards.assign(**{ROW_ORDER: row_order[is_wildcard], ROW_LABEL: validators_df.index[is_wildcard]})
+        if key_columns:
+            expanded: pd.DataFrame = wildcards.merge(candidates, on=key_columns, how='inner')
+        else:
+            expanded = wildcards.merge(candidates, how='cross')
+        expanded = expanded.set_index(ROW_LABEL)[concrete.columns]
+
+        return pd.concat([concrete, expanded]).sort_values(
+            [ROW_ORDER, VALUE_ORDER], kind='stable'
+        ).drop(columns=[ROW_ORDER, VALUE_ORDER])
+
     @staticmethod
     def create_validators_column(
         binnacle: pd.DataFrame,
@@ -159,23 +182,18 @@ class BinnacleIntegrator:
         """
         list_validators: list[str] = ['COD_ZDES', 'COD_ZDEM', 'ETAPA', 'FAMILIA', 'COD_PRODUCTO']
         if is_sellout: list_validators.remove('COD_ZDEM')
-        validators_df: pd.DataFrame = binnacle.copy()
+        validators_df: pd.DataFrame = binnacle
         for index, column in enumerate(list_validators):
-            expanded = []
-            for _, row in validators_df.iterrows():
-                if row[column] == 'Todo':
-                    posibles = sellin_sellout.copy()
-                    for val_col in list_validators[:index]:
-                        posibles = posibles[posibles[val_col] == row[val_col]]
-                    posibles = posibles[column].unique()
-                    if len(posibles) > 0:
-                        for item in posibles:
-                            new_row = row.copy()
-                            new_row[column] = item
-                            expanded.append(new_row)
-                else:
-                    expanded.append(row)
-            validators_df = pd.DataFrame(expanded)
+            validators_df = BinnacleIntegrator.expand_wildcard_column(
+                validators_df, sellin_sellout, list_validators[:index], column
+            )
+            if validators_df.empty:
+                # No rule left to expand
+                return pd.DataFrame([])
+            # Infer the column types of the remaining rules on every step, as
+            # rebuilding the dataframe row by row did
+            validators_df = validators_df.astype(object).infer_objects()
+        validators_df.index.name = None
         return validators_df
 
     @staticmethod
@@ -188,7 +206,7 @@ class BinnacleIntegrator:
         :return: A dataframe generated by pivoting the binnacle data.
         :rtype: pd.DataFrame
         """
-        dataframe['VALOR'] = pd.to_numeric(dataframe['VALOR'])
+        dataframe['VALOR'] = dataframe['VALOR_NUM']
         pivot_df: pd.DataFrame = dataframe.pivot_table(
             index=['COD_ZDES', 'ETAPA', 'FAMILIA', 'COD_PRODUCTO'], # Columns to keep as index
             columns='APLICACION', # Column to pivot
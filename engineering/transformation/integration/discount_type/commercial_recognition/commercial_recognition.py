@@ -30,8 +30,8 @@ def generate_commercial_recognition_sheets(
     :return: The sheets for the commercial recognition discount type
     :rtype: dict[str, pd.DataFrame]
     """
-    binnacle = data["binnacle"].copy()
-    sellin = data["sales"].copy()
+    binnacle = data["binnacle"]
+    sellin = data["sales"]
     application = BinnacleIntegrator.get_type_application(binnacle)
     commercial_recognition: CommercialRecognitionSellinIntegrator = CommercialRecognitionSellinIntegrator()
     if application == "TMS":
@@ -27,7 +27,7 @@ def generate_cr_logistic_sheets(
     :return: The sheets for the cr logistic discount type
     :rtype: dict[str, pd.DataFrame]
     """
-    sellin = data["sales"].copy()
+    sellin = data["sales"]
     cr_logistic: CrLogisticSellinIntegrator = CrLogisticSellinIntegrator()
     sellin = cr_logistic.add_contribution_column(sellin)
     sellin = cr_logistic.filter_ref_order(sellin)
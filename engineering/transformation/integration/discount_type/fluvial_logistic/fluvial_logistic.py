@@ -27,7 +27,7 @@ def generate_fluvial_logistic_sheets(
     :return: The sheets for the fluvial logistic discount type
     :rtype: dict[str, pd.DataFrame]
     """
-    sellin = data["sales"].copy()
+    sellin = data["sales"]
     fluvial_logistic: FluvialLogisticSellinIntegrator = FluvialLogisticSellinIntegrator()
     sellin = fluvial_logistic.add_contribution_column(sellin)
     base_sheets: dict[str, pd.DataFrame] = generate_base_months_sheets(sellin, options, list_month)
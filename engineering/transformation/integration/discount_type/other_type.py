@@ -4,12 +4,12 @@ This module is used to generate the sheets for the other discount type
 
 import pandas as pd
 
-from engineering.transformation.integration.binnacle import BinnacleIntegrator
 from engineering.transformation.integration.discount_type.commercial_recognition.commercial_recognition import \
     generate_commercial_recognition_sheets
 from engineering.transformation.integration.discount_type.cr_logistic.cr_logistic import generate_cr_logistic_sheets
 from engineering.transformation.integration.discount_type.fluvial_logistic.fluvial_logistic import \
     generate_fluvial_logistic_sheets
+from engineering.transformation.integration.rule_matcher import RuleMatcher
 from engineering.transformation.integration.sellin import SellinIntegrator
 from schemas.request.options import Options
 
@@ -31,10 +31,11 @@ def generate_other_discount_type_sheets(
     :return: The sheets for the other discount type
     :rtype: dict[str, pd.DataFrame]
     """
-    binnacle: pd.DataFrame = data["binnacle"].copy()
-    sellin: pd.DataFrame = data["sales"].copy()
-    validators_data: pd.DataFrame = BinnacleIntegrator.create_validators_column(binnacle, sellin)
-    merged_data: pd.DataFrame = SellinIntegrator.merge_dataframes(sellin, validators_data)
+    binnacle: pd.DataFrame = data["binnacle"]
+    sellin: pd.DataFrame = data["sales"]
+    matcher: RuleMatcher = RuleMatcher(binnacle, sellin)
+    validators_data: pd.DataFrame = matcher.live_rules()
+    merged_data: pd.DataFrame = matcher.match(validators_data)
     merged_data = SellinIntegrator.convert_bonus_column(merged_data)
     data.update({"binnacle": validators_data})
     data.update({"sales": merged_data})
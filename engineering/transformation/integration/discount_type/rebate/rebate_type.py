@@ -3,6 +3,7 @@ import pandas as pd
 from engineering.transformation.integration.binnacle import BinnacleIntegrator
 from engineering.transformation.integration.discount_type.rebate.rebate import RebateSellinIntegrator
 from engineering.transformation.integration.discount_type.summary import generate_summary_rebate_sheet
+from engineering.transformation.integration.rule_matcher import RuleMatcher
 from engineering.transformation.integration.utils.utils import generate_base_months_sheets
 from schemas.request.options import Options
 
@@ -24,21 +25,18 @@ def generate_rebate_sheets(
     :return: The sheets for the rebate report
     :rtype: dict[str, pd.DataFrame]
     """
-    binnacle: pd.DataFrame = data["binnacle"].copy()
-    sellin: pd.DataFrame = data["sales"].copy()
+    binnacle: pd.DataFrame = data["binnacle"]
+    sellin: pd.DataFrame = data["sales"]
     if options.nodo == "D. COPACIGULF":
-        binnacle = BinnacleIntegrator.create_lower_tm_column(binnacle)
-        binnacle = BinnacleIntegrator.create_upper_tm_column(binnacle)
         binnacle = BinnacleIntegrator.create_mean_tm_column(binnacle, sellin)
     else:
-        binnacle = BinnacleIntegrator.create_validators_column(binnacle, sellin)
+        matcher: RuleMatcher = RuleMatcher(binnacle, sellin)
+        binnacle = matcher.live_rules()
         application = BinnacleIntegrator.get_type_application(binnacle)
         rebate: RebateSellinIntegrator = RebateSellinIntegrator()
-        sellin = rebate.merge_dataframes(sellin, binnacle)
+        sellin = matcher.match(binnacle)
         if application == "TMS":
-            sellin['Bonificación'] = pd.to_numeric(sellin['Bonificación'].apply(
-                lambda x: str(x).replace("$", "").replace(",", "")
-            ))
+            sellin = rebate.convert_bonus_column(sellin)
         else:
             sellin = rebate.add_pvp_column(sellin)
             sellin = rebate.add_discount_column(sellin)
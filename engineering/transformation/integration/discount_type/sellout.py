@@ -25,9 +25,9 @@ def generate_sellout_sheets(
     :return: The transformed data
     :rtype: dict[str, pd.DataFrame]
     """
-    binnacle: pd.DataFrame = data["binnacle"].copy()
-    sellout: pd.DataFrame = data["sellout"].copy()
-    prices: pd.DataFrame = data["prices"].copy()
+    binnacle: pd.DataFrame = data["binnacle"]
+    sellout: pd.DataFrame = data["sellout"]
+    prices: pd.DataFrame = data["prices"]
     binnacle = BinnacleIntegrator.create_validators_column(binnacle, sellout, True)
 
     sellout_integrator: SellOutIntegrator = SellOutIntegrator(sellout)
@@ -27,7 +27,7 @@ def integrate_sellin(
     :return: The integrated dataframe with sellin info
     :rtype: dict[str, pd.DataFrame]
     """
-    sellin_data = data["sales"].copy()
+    sellin_data = data["sales"]
     list_month: list[int] = BinnacleIntegrator.get_list_month_by_period(data["binnacle"], options.month)  # type: ignore
     filtered_sellin = SellinIntegrator.filter_options(sellin_data, options, list_month)
     data.update({"sales": filtered_sellin})
@@ -53,8 +53,8 @@ def integrate_sellout(
     :return: The integrated dataframe with sellout info
     :rtype: tuple[dict[str, pd.DataFrame], dict[str, pd.DataFrame]]
     """
-    sellout_data = data["sellout"].copy()
-    binnacle_data = data["binnacle"].copy()
+    sellout_data = data["sellout"]
+    binnacle_data = data["binnacle"]
     list_month: list[int] = BinnacleIntegrator.get_list_month_by_period(binnacle_data, options.month)  # type: ignore
     format_binnacle = BinnacleIntegrator.overwrite_family(binnacle_data)
     sellout_integrator: SellOutIntegrator = SellOutIntegrator(sellout_data)
@@ -79,7 +79,10 @@ def integrate(
     :return: The integrated data to load
     :rtype: dict[str, pd.DataFrame]
     """
-    binnacle_data: pd.DataFrame = data["binnacle"].copy()
+    # The stages replace the tables of their own dictionary, so the given
+    # one, which may be cached, is left untouched
+    data = dict(data)
+    binnacle_data: pd.DataFrame = data["binnacle"]
     filtered_binnacle: pd.DataFrame = BinnacleIntegrator.filter_options(binnacle_data, options)
     data.update({"binnacle": filtered_binnacle})
 
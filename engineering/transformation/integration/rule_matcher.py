@@ -0,0 +1,146 @@
+"""
+Module to match the binnacle rules with the sales.
+"""
+
+import numpy as np
+import pandas as pd
+
+SELLIN_VALIDATORS: list[str] = ['COD_ZDES', 'COD_ZDEM', 'ETAPA', 'FAMILIA', 'COD_PRODUCTO']
+WILDCARD: str = 'Todo'
+VALUE_COLUMN: str = 'VALOR_NUM'
+
+# Helper columns to keep the order of the sales rows and of the rules
+ROW_ORDER: str = "__ROW_ORDER"
+RULE_ORDER: str = "__RULE_ORDER"
+
+
+class RuleMatcher:
+    """
+    Class to assign the binnacle rules to the sales without expanding the
+    'Todo' wildcards.
+
+    The rules are grouped by the validators they leave as 'Todo' and each
+    group is joined with the sales on its concrete validators, so the
+    matches are proportional to the sales instead of the expanded rules.
+    A sales row matches a rule when every concrete validator is equal and,
+    as in the expansion, the validators before the last 'Todo' of the rule
+    are not null.
+    """
+
+    def __init__(
+        self,
+        binnacle: pd.DataFrame,
+        sales: pd.DataFrame,
+        validators: list[str] | None = None
+    ) -> None:
+        """
+        Constructor of the class.
+
+        :param binnacle: The filtered binnacle dataframe
+        :type binnacle: pd.DataFrame
+        :param sales: The filtered sales dataframe
+        :type sales: pd.DataFrame
+        :param validators: The validator columns, in the order they are
+         expanded
+        :type validators: list[str] | None
+        :return: None
+        :rtype: NoneType
+        """
+        self.binnacle: pd.DataFrame = binnacle
+        self.sales: pd.DataFrame = sales
+        self.validators: list[str] = validators if validators is not None else SELLIN_VALIDATORS
+        self.wildcards: np.ndarray = (
+            binnacle[self.validators] == WILDCARD
+        ).to_numpy() if not binnacle.empty else np.zeros((0, len(self.validators)), dtype=bool)
+
+    def _has_prefix_match(self, rules: pd.DataFrame, position: int) -> np.ndarray:
+        """
+        Check which rules have a sales row with non-null validators before a
+        position that are equal to their concrete validators
+
+        :param rules: The rules sharing the same wildcard validators
+        :type rules: pd.DataFrame
+        :param position: The position of the validator being expanded
+        :type position: int
+        :return: A flag for each rule
+        :rtype: np.ndarray
+        """
+        prefix: list[str] = self.validators[:position]
+        sales: pd.DataFrame = self.sales[prefix].dropna()
+        concrete: list[str] = [column for column in prefix if (rules[column] != WILDCARD).all()]
+        if not concrete:
+            return np.full(len(rules), len(sales) > 0)
+        keys: pd.MultiIndex = pd.MultiIndex.from_frame(sales[concrete].astype(object).drop_duplicates())
+        return pd.MultiIndex.from_frame(rules[concrete].astype(object)).isin(keys)
+
+    def live_rules(self) -> pd.DataFrame:
+        """
+        Get the rules that have at least one match in the expansion of their
+        wildcards, in their original order
+
+        :return: The live rules, with the column types inferred as the
+         expansion did, or an empty dataframe if no rule is left
+        :rtype: pd.DataFrame
+        """
+        if self.binnacle.empty:
+            return pd.DataFrame([])
+        survives: np.ndarray = np.ones(self.wildcards.shape, dtype=bool)
+        signatures: pd.Series = pd.Series([row.tobytes() for row in self.wildcards])
+        for _, group in signatures.groupby(signatures, sort=False):
+            positions: np.ndarray = group.index.to_numpy()
+            rules: pd.DataFrame = self.binnacle.iloc[positions]
+            for position in np.flatnonzero(self.wildcards[positions[0]]):
+                survives[positions, position] = self._has_prefix_match(rules, int(position))
+
+        live_df: pd.DataFrame = self.binnacle
+        alive: np.ndarray = np.ones(len(self.binnacle), dtype=bool)
+        for position in range(len(self.validators)):
+            alive &= survives[:, position]
+            if not alive.any():
+                return pd.DataFrame([])
+            # The expansion inferred the column types of the remaining rules on
+            # every step
+            live_df = self.binnacle[alive].astype(object).infer_objects()
+        live_df.index.name = None
+        return live_df
+
+    def match(self, live_rules: pd.DataFrame) -> pd.DataFrame:
+        """
+        Assign to each sales row the compiled value of every rule it matches,
+        keeping the first rule of each distinct value, as the merge with the
+        expanded rules did
+
+        :param live_rules: The live rules
+        :type live_rules: pd.DataFrame
+        :return: The sales with the value of the rules as the bonus column
+        :rtype: pd.DataFrame
+        """
+        rules: pd.DataFrame = live_rules[self.validators + [VALUE_COLUMN]].reset_index(drop=True)
+        rules[RULE_ORDER] = np.arange(len(rules))
+        wildcards: np.ndarray = (rules[self.validators] == WILDCARD).to_numpy()
+        sales_keys: pd.DataFrame = self.sales[self.validators].astype(object).reset_index(drop=True)
+        sales_keys[ROW_ORDER] = np.arange(len(sales_keys))
+
+        signatures: pd.Series = pd.Series([row.tobytes() for row in wildcards], dtype=object)
+        list_matches: list[pd.DataFrame] = []
+        for _, group in signatures.groupby(signatures, sort=False):
+            signature: np.ndarray = wildcards[group.index[0]]
+            concrete: list[str] = [column for column, is_wildcard in zip(self.validators, signature) if not is_wildcard]
+            last_wildcard: int = int(np.flatnonzero(signature)[-1]) if signature.any() else 0
+            candidates: pd.DataFrame = sales_keys[sales_keys[self.validators[:last_wildcard]].notna().all(axis=1)]
+            group_rules: pd.DataFrame = rules.iloc[group.index][concrete + [RULE_ORDER]].astype(dict.fromkeys(concrete, object))
+            if concrete:
+                matches: pd.DataFrame = candidates[concrete + [ROW_ORDER]].merge(group_rules, on=concrete, how='inner')
+            else:
+                matches = candidates[[ROW_ORDER]].merge(group_rules, how='cross')
+            list_matches.append(matches[[ROW_ORDER, RULE_ORDER]])
+
+        all_matches: pd.DataFrame = pd.concat(list_matches, ignore_index=True).sort_values([ROW_ORDER, RULE_ORDER])
+        all_matches[VALUE_COLUMN] = rules[VALUE_COLUMN].to_numpy()[all_matches[RULE_ORDER].to_numpy()]
+        all_matches = all_matches.drop_duplicates([ROW_ORDER, VALUE_COLUMN])
+
+        merged_df: pd.DataFrame = self.sales.iloc[all_matches[ROW_ORDER].to_numpy()].reset_index(drop=True)
+        merged_df['Bonificación'] = pd.Series(
+            all_matches[VALUE_COLUMN].to_numpy(), dtype=rules[VALUE_COLUMN].dtype
+        )
+        return merged_df
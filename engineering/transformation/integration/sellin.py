@@ -39,25 +39,6 @@ class SellinIntegrator(ABC):
         ].reset_index(drop=True)
         return filtered_df
 
-    @staticmethod
-    def merge_dataframes(dataframe: pd.DataFrame, binnacle: pd.DataFrame) -> pd.DataFrame:
-        """
-        Filters the binnacle dataframe based on options.
-
-        :param dataframe: The dataframe containing selling data.
-        :type dataframe: pd.DataFrame
-        :param binnacle: The dataframe containing binnacle data.
-        :type binnacle: pd.DataFrame
-        :return: A dataframe filtered by options.
-        :rtype: pd.DataFrame
-        """
-        merged_df: pd.DataFrame = dataframe.merge(
-            binnacle[['COD_ZDES', 'COD_ZDEM', 'ETAPA', 'FAMILIA', 'COD_PRODUCTO', 'VALOR']].drop_duplicates(),
-            how="inner"
-        )
-        merged_df.rename(columns={'VALOR': 'Bonificación'}, inplace=True)
-        return merged_df
-
     @staticmethod
     def convert_bonus_column(dataframe: pd.DataFrame) -> pd.DataFrame:
         """
@@ -68,6 +49,9 @@ class SellinIntegrator(ABC):
         :return: The dataframe with bonus column converted
         :rtype: pd.DataFrame
         """
+        if pd.api.types.is_numeric_dtype(dataframe['Bonificación']):
+            # Already taken from the compiled value of the rules
+            return dataframe
         dataframe['Bonificación'] = pd.to_numeric(dataframe['Bonificación'].apply(
             lambda x: str(x).replace("$", "").replace(",", "")
         ))
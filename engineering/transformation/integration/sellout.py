@@ -40,7 +40,7 @@ class SellOutIntegrator:
             (self.dataframe["COD_ZNJE"] == binnacle[binnacle["DES_ZNJE"] == options.nodo]["COD_ZNJE"].unique().tolist()[0]) &
             (self.dataframe["YEAR"] == int(options.year)) &
             (self.dataframe["MONTH"].isin(list_month))
-        ].reset_index(drop=True).copy()
+        ].reset_index(drop=True)
         return filtered_df
 
     @staticmethod
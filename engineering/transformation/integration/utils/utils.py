@@ -2,19 +2,62 @@
 This module contains the functions to generate the sheets for the sell in report
 """
 
+from typing import Iterator
+
+import numpy as np
 import pandas as pd
 
 from constants.constants import constants
 from schemas.request.options import Options
 
+SheetIterator = Iterator[tuple[str, pd.DataFrame]]
 
-def generate_base_months_sheets(
+
+def _prepare_export(
+    sales: pd.DataFrame,
+    columns_to_drop: list[str],
+    numeric_columns: list[str]
+) -> pd.DataFrame:
+    """
+    Apply the conversions of the Base sheets once over the whole frame
+
+    :param sales: The sales to export
+    :type sales: pd.DataFrame
+    :param columns_to_drop: The columns not shown in the sheets
+    :type columns_to_drop: list[str]
+    :param numeric_columns: The code columns shown as numbers
+    :type numeric_columns: list[str]
+    :return: The frame with the columns of the sheets
+    :rtype: pd.DataFrame
+    """
+    df_export: pd.DataFrame = sales.drop(columns=columns_to_drop)
+    df_export['FECHA'] = pd.to_datetime(df_export['FECHA']).dt.strftime('%d/%m/%Y')
+    for column in numeric_columns:
+        df_export[column] = pd.to_numeric(df_export[column], downcast="integer")
+    df_export.rename(columns=constants.COLUMNS_DATAFRAME, inplace=True)
+    return df_export
+
+def _split_export(df_export: pd.DataFrame, keys: pd.Series) -> dict[object, np.ndarray]:
+    """
+    Get the positions of the rows of each key with a single groupby pass
+
+    :param df_export: The frame with the columns of the sheets
+    :type df_export: pd.DataFrame
+    :param keys: The key of each row, aligned by position
+    :type keys: pd.Series
+    :return: The positions by key, in order of first appearance
+    :rtype: dict[object, np.ndarray]
+    """
+    return df_export.groupby(keys.to_numpy(), sort=False).indices
+
+def iter_base_months_sheets(
     sales: pd.DataFrame,
     options: Options,
     list_month: list[int]
-) -> dict[str, pd.DataFrame]:
+) -> SheetIterator:
     """
-    Generate the sheets for the sell in report
+    Iterate over the Base sheets by month of the sell in report, building
+    each sheet only when it is consumed
 
     :param sales: The sales in data
     :type sales: pd.DataFrame
@@ -22,11 +65,9 @@ def generate_base_months_sheets(
     :type options: Options
     :param list_month: The list of months to generate the sheets
     :type list_month: list[int]
-    :return: The sheets for the sell in report
-    :rtype: dict[str, pd.DataFrame]
+    :return: The sheet names and their dataframes
+    :rtype: SheetIterator
     """
-    sheets: dict[str, pd.DataFrame] = {}
-    sheet_name: str
     if options.discount_type.startswith("Logístico"):  # type: ignore
         list_month = [int(options.month)]  # type: ignore
 
@@ -34,17 +75,52 @@ def generate_base_months_sheets(
     if options.nodo != "D. COPACIGULF":
         columns_to_drop = columns_to_drop + ['CLASE_FACTURA', 'SOCIOS']
 
+    selected: pd.DataFrame = sales.loc[sales['MONTH'].isin(list_month)]
+    df_export: pd.DataFrame = _prepare_export(
+        selected, columns_to_drop, ['COD_ZDES', 'COD_PRODUCTO', 'COD_ZDEM']
+    )
+    positions: dict[object, np.ndarray] = _split_export(df_export, selected['MONTH'])
+    empty: np.ndarray = np.array([], dtype=np.intp)
     for month in list_month:
-        sheet_name = 'Base {}.{}'.format(month if month > 9 else f'0{month}', options.year)
-        df_export: pd.DataFrame = sales.loc[sales['MONTH'] == month].copy()
-        df_export.drop(columns=columns_to_drop, axis=1, inplace=True)
-        df_export['FECHA'] = pd.to_datetime(df_export['FECHA']).dt.strftime('%d/%m/%Y')
-        df_export['COD_ZDES'] = pd.to_numeric(df_export['COD_ZDES'], downcast="integer")
-        df_export['COD_PRODUCTO'] = pd.to_numeric(df_export['COD_PRODUCTO'], downcast="integer")
-        df_export['COD_ZDEM'] = pd.to_numeric(df_export['COD_ZDEM'], downcast="integer")
-        df_export.rename(columns=constants.COLUMNS_DATAFRAME, inplace=True)
-        sheets[sheet_name] = df_export
-    return sheets
+        sheet_name: str = 'Base {}.{}'.format(month if month > 9 else f'0{month}', options.year)
+        yield sheet_name, df_export.iloc[positions.get(month, empty)]
+
+def generate_base_months_sheets(
+    sales: pd.DataFrame,
+    options: Options,
+    list_month: list[int]
+) -> dict[str, pd.DataFrame]:
+    """
+    Generate the sheets for the sell in report
+
+    :param sales: The sales in data
+    :type sales: pd.DataFrame
+    :param options: The options selected by the user
+    :type options: Options
+    :param list_month: The list of months to generate the sheets
+    :type list_month: list[int]
+    :return: The sheets for the sell in report
+    :rtype: dict[str, pd.DataFrame]
+    """
+    return dict(iter_base_months_sheets(sales, options, list_month))
+
+def iter_base_zdes_sheets(
+    sales: pd.DataFrame
+) -> SheetIterator:
+    """
+    Iterate over the Base sheets by client of the sell out report, building
+    each sheet only when it is consumed
+
+    :param sales: The sales out data
+    :type sales: pd.DataFrame
+    :return: The sheet names and their dataframes
+    :rtype: SheetIterator
+    """
+    df_export: pd.DataFrame = _prepare_export(sales, ['YEAR', 'MONTH'], [])
+    descriptions: np.ndarray = sales['DES_ZDES'].to_numpy()
+    for positions in _split_export(df_export, sales['COD_ZDES']).values():
+        sheet_name: str = 'Base {}'.format(descriptions[positions[0]])
+        yield sheet_name, df_export.iloc[positions]
 
 def generate_base_zdes_sheets(
     sales: pd.DataFrame
@@ -57,14 +133,4 @@ def generate_base_zdes_sheets(
     :return: The sheets for the sell in report
     :rtype: dict[str, pd.DataFrame]
     """
-    sheets: dict[str, pd.DataFrame] = {}
-    sheet_name: str
-    for zdes in sales['COD_ZDES'].unique():
-        sheet_name = 'Base {}'.format(sales[sales['COD_ZDES'] == zdes]['DES_ZDES'].unique()[0])
-        df_export = sales.loc[sales['COD_ZDES'] == zdes].copy()
-        df_export.drop(['YEAR', 'MONTH'], axis=1, inplace=True)
-        df_export['FECHA'] = pd.to_datetime(df_export['FECHA']).dt.strftime('%d/%m/%Y')
-        df_export.rename(columns=constants.COLUMNS_DATAFRAME, inplace=True)
-        sheets[sheet_name] = df_export
-
-    return sheets
+    return dict(iter_base_zdes_sheets(sales))
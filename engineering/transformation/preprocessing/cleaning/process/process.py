@@ -16,6 +16,7 @@ from engineering.transformation.preprocessing.cleaning.process.binnacle import B
 from engineering.transformation.preprocessing.cleaning.process.sellout import SellOutProcess
 from engineering.transformation.preprocessing.cleaning.process.price import PriceProcess
 from engineering.transformation.preprocessing.cleaning.process.sale import SaleProcess
+from engineering.transformation.preprocessing.keys import normalize_keys
 
 
 def process_client(
@@ -34,10 +35,7 @@ def process_client(
     client_process: ClientProcess = ClientProcess(client_settings)
     filtered_client: pd.DataFrame = client_process.filter_countries(dataframe)
     unique_client = filtered_client.drop_duplicates().reset_index(drop=True)
-    unique_client['COD_ZDES'] = unique_client['COD_ZDES'].astype(str)
-    unique_client['COD_ZNJE'] = unique_client['COD_ZNJE'].apply(lambda x: str(x))
-    unique_client['COD_ZDEM'] = unique_client['COD_ZDEM'].apply(lambda x: str(x))
-    unique_client['COD_ZENT'] = unique_client['COD_ZENT'].apply(lambda x: str(x))
+    unique_client = normalize_keys(unique_client)
     return unique_client
 
 def process_binnacle(
@@ -58,10 +56,7 @@ def process_binnacle(
     via_binnacle: pd.DataFrame = binnacle_process.filter_via(status_binnacle)
     renamed_binnacle: pd.DataFrame = binnacle_process.rename_columns_dataframe(via_binnacle)
     renamed_binnacle['FAMILIA'] = renamed_binnacle['FAMILIA'].astype(str)
-    renamed_binnacle['COD_ZDES'] = renamed_binnacle['COD_ZDES'].astype(str)
-    renamed_binnacle['COD_ZDEM'] = renamed_binnacle['COD_ZDEM'].astype(str)
-    renamed_binnacle['COD_PRODUCTO'] = renamed_binnacle['COD_PRODUCTO'].astype(str)
-    renamed_binnacle['COD_ZNJE'] = renamed_binnacle['COD_ZNJE'].astype(str)
+    renamed_binnacle = normalize_keys(renamed_binnacle, dtype=object)
     renamed_binnacle['VALOR'] = renamed_binnacle['VALOR'].astype(str)
     return renamed_binnacle
 
@@ -85,9 +80,7 @@ def process_sellout(
     renamed_sellout['ETAPA'] = renamed_sellout['ETAPA'].str.capitalize()
     renamed_sellout['NUM_FACTURA'] = renamed_sellout['NUM_FACTURA'].astype(str)
     renamed_sellout['FAMILIA'] = renamed_sellout['FAMILIA'].astype(str)
-    renamed_sellout['COD_ZDES'] = pd.to_numeric(renamed_sellout['COD_ZDES'], downcast="integer").apply(lambda x: str(x).split('.')[0])
-    renamed_sellout['COD_PRODUCTO'] = renamed_sellout['COD_PRODUCTO'].astype(str)
-    renamed_sellout['COD_ZNJE'] = pd.to_numeric(renamed_sellout['COD_ZNJE'], downcast="integer").apply(lambda x: str(x))
+    renamed_sellout = normalize_keys(renamed_sellout)
     renamed_sellout = renamed_sellout.sort_values(by=['YEAR', 'MONTH'])
     return renamed_sellout
 
@@ -108,8 +101,7 @@ def process_price(
     consider_price: pd.DataFrame = price_process.filter_consider(dataframe)
     status_sku_price: pd.DataFrame = price_process.filter_status_sku(consider_price)
     renamed_price: pd.DataFrame = price_process.rename_columns_dataframe(status_sku_price).reset_index(drop=True)
-    renamed_price['COD_ZNJE'] = pd.to_numeric(renamed_price['COD_ZNJE'], downcast="integer").apply(lambda x: str(x))
-    renamed_price['COD_PRODUCTO'] = pd.to_numeric(renamed_price['COD_PRODUCTO'], downcast="integer").apply(lambda x: str(x))
+    renamed_price = normalize_keys(renamed_price)
     renamed_price['Dto. Factura'] = renamed_price['Dto. Factura'] / 100
     renamed_price = renamed_price.drop_duplicates(subset=['COD_ZNJE', 'COD_PRODUCTO'], keep='last')
     return renamed_price
@@ -131,9 +123,6 @@ def process_sale(
     added_columns_sale: pd.DataFrame = sale_process.add_columns(dataframe)
     renamed_sale: pd.DataFrame = sale_process.rename_columns_dataframe(added_columns_sale)
     renamed_sale['FAMILIA'] = renamed_sale['FAMILIA'].astype(str)
-    renamed_sale['COD_ZDES'] = renamed_sale['COD_ZDES'].astype(str)
-    renamed_sale['COD_PRODUCTO'] = renamed_sale['COD_PRODUCTO'].astype(str)
-    renamed_sale['COD_ZDEM'] = renamed_sale['COD_ZDEM'].astype(str)
-    renamed_sale['COD_ZENT'] = renamed_sale['COD_ZENT'].astype(str)
+    renamed_sale = normalize_keys(renamed_sale)
 
     return renamed_sale
@@ -0,0 +1,143 @@
+"""
+A module for the dimension tables in the engineering.transformation.preprocessing package.
+"""
+
+import numpy as np
+import pandas as pd
+
+# The descriptive columns of each dimension. The family and the stage are
+# kept apart so every dimension covers contiguous columns of the facts
+DIMENSIONS: dict[str, list[str]] = {
+    "node": ["COD_ZNJE", "DES_ZNJE"],
+    "payer": ["COD_ZENT", "DES_ZENT"],
+    "territory": ["COD_ZTER", "DES_ZTER"],
+    "client": ["COD_ZDES", "DES_ZDES"],
+    "recipient": ["COD_ZDEM", "DES_ZDEM"],
+    "product": ["COD_PRODUCTO", "DES_PRODUCTO"],
+    "family": ["FAMILIA"],
+    "stage": ["ETAPA"],
+}
+FACT_TABLES: tuple[str, ...] = ("sales", "sellout")
+ID_DTYPE: type = np.int32
+
+
+def get_id_column(dimension: str) -> str:
+    """
+    Get the name of the surrogate key column of a dimension
+
+    :param dimension: The name of the dimension
+    :type dimension: str
+    :return: The name of the key column, like 'NODE_ID'
+    :rtype: str
+    """
+    return f"{dimension.upper()}_ID"
+
+
+def _replace_columns(
+    fact: pd.DataFrame, columns: list[str], id_column: str, ids: np.ndarray
+) -> pd.DataFrame:
+    """
+    Replace the descriptive columns of a fact table with their surrogate key
+
+    :param fact: The fact table
+    :type fact: pd.DataFrame
+    :param columns: The descriptive columns of the dimension
+    :type columns: list[str]
+    :param id_column: The name of the key column
+    :type id_column: str
+    :param ids: The key of each row, aligned by position
+    :type ids: np.ndarray
+    :return: The fact table with the key where the first column was
+    :rtype: pd.DataFrame
+    """
+    position: int = fact.columns.get_loc(columns[0])
+    replaced: pd.DataFrame = fact.drop(columns=columns)
+    replaced.insert(position, id_column, ids)
+    return replaced
+
+
+def build_star_schema(
+    data: dict[str, pd.DataFrame],
+    known: dict[str, pd.DataFrame] | None = None,
+) -> tuple[dict[str, pd.DataFrame], dict[str, pd.DataFrame]]:
+    """
+    Split the descriptive columns of the sales and sellout into dimension
+    tables referenced by int32 surrogate keys
+
+    A dimension row is each distinct combination of its columns across
+    both tables, so the descriptions are restored exactly even when a code
+    has more than one description. Given the dimensions of a stored
+    snapshot, their rows keep their keys and only the new combinations are
+    appended, so the stored fact tables stay valid.
+
+    :param data: The preprocessed tables by name. Either fact table may be
+     missing
+    :type data: dict[str, pd.DataFrame]
+    :param known: The stored dimension tables to extend, by name
+    :type known: dict[str, pd.DataFrame] | None
+    :return: The tables with the sales and sellout as fact tables, and the
+     dimension tables by name
+    :rtype: tuple[dict[str, pd.DataFrame], dict[str, pd.DataFrame]]
+    """
+    facts: dict[str, pd.DataFrame] = {name: data[name] for name in FACT_TABLES if name in data}
+    dimensions: dict[str, pd.DataFrame] = dict(known or {})
+    for dimension, columns in DIMENSIONS.items():
+        tables: list[str] = [
+            name for name, fact in facts.items() if all(column in fact.columns for column in columns)
+        ]
+        if not tables:
+            continue
+        # The stored rows are distinct and come first, so they keep their keys
+        stored: list[pd.DataFrame] = [dimensions[dimension][columns]] if dimension in dimensions else []
+        attributes: pd.DataFrame = pd.concat(
+            stored + [facts[name][columns] for name in tables], ignore_index=True
+        )
+        # Numbered by first appearance, the same order drop_duplicates keeps
+        ids: np.ndarray = attributes.groupby(
+            columns, sort=False, dropna=False
+        ).ngroup().to_numpy(dtype=ID_DTYPE)
+        id_column: str = get_id_column(dimension)
+        table: pd.DataFrame = attributes.drop_duplicates(ignore_index=True)
+        table.insert(0, id_column, np.arange(len(table), dtype=ID_DTYPE))
+        dimensions[dimension] = table
+
+        start: int = len(stored[0]) if stored else 0
+        for name in tables:
+            stop: int = start + len(facts[name])
+            facts[name] = _replace_columns(facts[name], columns, id_column, ids[start:stop])
+            start = stop
+    return {**data, **facts}, dimensions
+
+
+def attach_descriptions(
+    fact: pd.DataFrame, dimensions: dict[str, pd.DataFrame]
+) -> pd.DataFrame:
+    """
+    Replace the surrogate keys of a fact table with the columns of their
+    dimensions, at the position of each key
+
+    :param fact: The fact table
+    :type fact: pd.DataFrame
+    :param dimensions: The dimension tables by name
+    :type dimensions: dict[str, pd.DataFrame]
+    :return: The table with the descriptive columns. Tables without keys
+     are returned as they are
+    :rtype: pd.DataFrame
+    """
+    id_columns: dict[str, str] = {
+        get_id_column(dimension): dimension for dimension in dimensions
+    }
+    if not any(column in id_columns for column in fact.columns):
+        return fact
+    pieces: list[pd.DataFrame] = []
+    for column in fact.columns:
+        if column not in id_columns:
+            pieces.append(fact[[column]])
+            continue
+        dimension: str = id_columns[column]
+        # The keys are the positions of the dimension rows
+        attributes: pd.DataFrame = dimensions[dimension][DIMENSIONS[dimension]].take(
+            fact[column].to_numpy()
+        )
+        pieces.append(attributes.set_axis(fact.index))
+    return pd.concat(pieces, axis=1)
@@ -0,0 +1,62 @@
+"""
+A module for the snapshot column types in the engineering.transformation.preprocessing package.
+"""
+
+import pandas as pd
+
+STRING_DTYPE: pd.StringDtype = pd.StringDtype("pyarrow")
+STRING_PREFIXES: tuple[str, ...] = ("COD_", "DES_")
+STRING_COLUMNS: set[str] = {"ETAPA", "FAMILIA", "CLASE_FACTURA", "SOCIOS", "CONDICION_PAGO"}
+# The binnacle keeps object columns since its validators mix codes with the
+# 'Todo' wildcard and are compared as plain Python values
+STRING_TABLES: tuple[str, ...] = ("clients", "prices", "sales", "sellout")
+
+
+def _is_string_column(dataframe: pd.DataFrame, column: str) -> bool:
+    """
+    Check if a column is a code or description stored as Python strings
+
+    :param dataframe: The dataframe with the column
+    :type dataframe: pd.DataFrame
+    :param column: The name of the column
+    :type column: str
+    :return: True if the column should be stored as Arrow strings
+    :rtype: bool
+    """
+    if not (column.startswith(STRING_PREFIXES) or column in STRING_COLUMNS):
+        return False
+    if dataframe[column].dtype != object:
+        return False
+    return pd.api.types.infer_dtype(dataframe[column], skipna=True) in ("string", "empty")
+
+
+def to_snapshot_dtypes(dataframe: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert the code and description columns into Arrow-backed strings
+
+    :param dataframe: The dataframe to convert
+    :type dataframe: pd.DataFrame
+    :return: The dataframe with the code and description columns as
+     string[pyarrow]. Columns already converted are left as they are
+    :rtype: pd.DataFrame
+    """
+    columns: list[str] = [column for column in dataframe.columns if _is_string_column(dataframe, column)]
+    if not columns:
+        return dataframe
+    return dataframe.astype(dict.fromkeys(columns, STRING_DTYPE))
+
+
+def apply_snapshot_dtypes(data: dict[str, pd.DataFrame]) -> dict[str, pd.DataFrame]:
+    """
+    Convert the tables of the snapshot into their stored column types
+
+    :param data: The snapshot tables by name
+    :type data: dict[str, pd.DataFrame]
+    :return: The tables with the code and description columns as
+     string[pyarrow]
+    :rtype: dict[str, pd.DataFrame]
+    """
+    return {
+        name: to_snapshot_dtypes(dataframe) if name in STRING_TABLES else dataframe
+        for name, dataframe in data.items()
+    }
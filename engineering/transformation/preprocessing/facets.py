@@ -0,0 +1,78 @@
+"""
+A module for the facet index in the engineering.transformation.preprocessing package.
+"""
+
+from typing import Any
+
+import pandas as pd
+
+
+def _unique_labels(series: pd.Series) -> list[str]:
+    """
+    Get the unique values of a series as labels, in order of appearance
+
+    :param series: The series to get the labels from
+    :type series: pd.Series
+    :return: The unique labels
+    :rtype: list[str]
+    """
+    return [str(value) for value in series.unique()]
+
+
+def _build_sales_facets(sales: pd.DataFrame) -> dict[str, Any]:
+    """
+    Build the year and month facets of a sales slice
+
+    :param sales: The sales slice with YEAR and MONTH columns
+    :type sales: pd.DataFrame
+    :return: The years, the months of every year and the months of the
+     whole slice
+    :rtype: dict[str, Any]
+    """
+    years: dict[str, list[str]] = {
+        str(year): _unique_labels(months.astype(str))
+        for year, months in sales.groupby("YEAR", sort=False)["MONTH"]
+    }
+    return {
+        "year": _unique_labels(sales["YEAR"].astype(str)),
+        "month": _unique_labels(sales["MONTH"].astype(str)),
+        "years": years,
+    }
+
+
+def build_facet_index(data: dict[str, pd.DataFrame]) -> dict[str, Any]:
+    """
+    Build the liquidation -> nodo -> discount type -> year -> month cascade
+    used by the filter options
+
+    :param data: The preprocessed data with binnacle, sales and sellout
+    :type data: dict[str, pd.DataFrame]
+    :return: The facet index by liquidation
+    :rtype: dict[str, Any]
+    """
+    binnacle: pd.DataFrame = data["binnacle"]
+    sellin: pd.DataFrame = data["sales"]
+    sellout: pd.DataFrame = data["sellout"]
+    sellin_nodes = sellin["COD_ZNJE"].unique()
+
+    facet_index: dict[str, Any] = {}
+    for liquidation in binnacle["SI/SO"].dropna().unique():
+        sales: pd.DataFrame = sellin if liquidation == "Sell In" else sellout
+        filtered_binnacle = binnacle[(binnacle["SI/SO"] == liquidation) & (binnacle["COD_ZNJE"].isin(sellin_nodes))]
+        filtered_sales = sales[sales["COD_ZNJE"].isin(filtered_binnacle["COD_ZNJE"].unique())]
+
+        nodes: dict[str, Any] = {}
+        for nodo, nodo_binnacle in filtered_binnacle.groupby("DES_ZNJE", sort=False):
+            nodo_sales = filtered_sales[filtered_sales["COD_ZNJE"] == nodo_binnacle["COD_ZNJE"].unique()[0]]
+            nodes[str(nodo)] = {
+                "discount_type": _unique_labels(nodo_binnacle["TIPO_DESCUENTO"]),
+                **_build_sales_facets(nodo_sales),
+            }
+
+        facet_index[str(liquidation)] = {
+            "nodo": _unique_labels(filtered_binnacle["DES_ZNJE"]),
+            "discount_type": _unique_labels(filtered_binnacle["TIPO_DESCUENTO"]),
+            **_build_sales_facets(filtered_sales),
+            "nodes": nodes,
+        }
+    return facet_index
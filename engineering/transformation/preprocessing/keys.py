@@ -0,0 +1,64 @@
+"""
+A module for the join key normalization in the engineering.transformation.preprocessing package.
+"""
+
+import pandas as pd
+
+from engineering.transformation.preprocessing.dtypes import STRING_DTYPE
+
+KEY_COLUMNS: list[str] = ["COD_ZNJE", "COD_ZENT", "COD_ZDES", "COD_ZDEM", "COD_PRODUCTO"]
+# Integral numbers read as floats from Excel, like '123.0'
+INTEGRAL_FLOAT_PATTERN: str = r"^([+-]?\d+)\.0*$"
+MISSING_VALUES: list[str] = ["", "nan", "NaN", "None", "<NA>"]
+
+
+def normalize_key(series: pd.Series) -> pd.Series:
+    """
+    Convert a code column into its canonical text, in a vectorized way
+
+    Integral numbers are written without decimals whatever their source
+    type, so 123, 123.0, '123' and '123.0' all become '123'. Other texts are
+    kept without surrounding spaces and missing values become NA.
+
+    :param series: The code column
+    :type series: pd.Series
+    :return: The canonical codes
+    :rtype: pd.Series
+    """
+    if pd.api.types.is_float_dtype(series.dtype):
+        integral: pd.Series = series.dropna()
+        if (integral == integral.round()).all():
+            series = series.astype("Int64")
+    keys: pd.Series = series.astype(STRING_DTYPE).str.strip()
+    keys = keys.str.replace(INTEGRAL_FLOAT_PATTERN, r"\1", regex=True)
+    return keys.mask(keys.isin(MISSING_VALUES))
+
+
+def normalize_keys(
+    dataframe: pd.DataFrame,
+    columns: list[str] | None = None,
+    dtype: str | pd.StringDtype | type[object] = STRING_DTYPE,
+) -> pd.DataFrame:
+    """
+    Convert the code columns of a dataframe into their canonical text
+
+    :param dataframe: The dataframe with the code columns
+    :type dataframe: pd.DataFrame
+    :param columns: The columns to convert, by default every join key
+     present in the dataframe
+    :type columns: list[str] | None
+    :param dtype: The type of the converted columns
+    :type dtype: str | pd.StringDtype | type[object]
+    :return: The dataframe with the canonical codes
+    :rtype: pd.DataFrame
+    """
+    key_columns: list[str] = [
+        column for column in (columns if columns is not None else KEY_COLUMNS) if column in dataframe.columns
+    ]
+    for column in key_columns:
+        keys: pd.Series = normalize_key(dataframe[column])
+        if dtype is object:
+            # Plain Python values with None for the missing codes
+            keys = keys.astype(object).where(keys.notna(), None)
+        dataframe[column] = keys
+    return dataframe
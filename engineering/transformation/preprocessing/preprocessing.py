@@ -6,7 +6,9 @@ import pandas as pd
 
 from config.settings import Settings
 from engineering.transformation.preprocessing.cleaning.cleaning import clean
+from engineering.transformation.preprocessing.dtypes import apply_snapshot_dtypes
 from engineering.transformation.preprocessing.integration.integration import integrate
+from engineering.transformation.preprocessing.rules import compile_binnacle
 
 
 def preprocess(
@@ -28,4 +30,5 @@ def preprocess(
     updated_data: dict[str, pd.DataFrame] = cleaned_data.copy()
     reduced_data: dict[str, pd.DataFrame] = integrate(cleaned_data, settings)
     updated_data.update(reduced_data)
-    return updated_data
+    updated_data["binnacle"] = compile_binnacle(updated_data["binnacle"])
+    return apply_snapshot_dtypes(updated_data)
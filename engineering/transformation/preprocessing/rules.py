@@ -0,0 +1,96 @@
+"""
+A module for the binnacle rule table in the engineering.transformation.preprocessing package.
+"""
+
+from enum import Enum
+
+import pandas as pd
+
+
+class Application(str, Enum):
+    """The base a binnacle rule is applied on"""
+
+    TMS = "TMS"
+    P_BASE = "P_BASE"
+    VALOR_NETO = "VALOR_NETO"
+
+
+APPLICATIONS: dict[str, Application] = {
+    "Tonelada": Application.TMS,
+    "Precio Base": Application.P_BASE,
+}
+PERIOD_MONTHS: dict[str, int] = {"Mensual": 1, "Bimensual": 2, "Trimestral": 3}
+RULE_COLUMNS: list[str] = [
+    "VALOR_NUM", "LOWER_TM", "UPPER_TM", "PERIOD_MONTHS", "APPLICATION", "FAMILY_CODE"
+]
+
+
+def _parse_number(value: str) -> float:
+    """
+    Parse a number written as text, like '$26,120.72'
+
+    :param value: The number as text
+    :type value: str
+    :return: The number, or NaN if it can not be parsed
+    :rtype: float
+    """
+    try:
+        return float(value.replace("$", "").replace(",", ""))
+    except ValueError:
+        return float("nan")
+
+
+def _parse_tm(condition: pd.Series) -> pd.Series:
+    """
+    Parse a TM bound written in thousands, like '10.1K', into tonnes
+
+    :param condition: The bounds as text
+    :type condition: pd.Series
+    :return: The bounds in tonnes, or NaN if they can not be parsed
+    :rtype: pd.Series
+    """
+    return pd.to_numeric(condition.str.replace("K", ""), errors="coerce").astype(float) * 1000
+
+
+def compile_binnacle(binnacle: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compile the processed binnacle into a typed rule table, so the rules are
+    parsed once per snapshot instead of once per report
+
+    :param binnacle: The processed binnacle with the raw text columns
+    :type binnacle: pd.DataFrame
+    :return: The binnacle with the numeric value, the TM bounds, the period
+     length in months, the application and the family code
+    :rtype: pd.DataFrame
+    """
+    compiled: pd.DataFrame = binnacle.copy()
+    # Parsed one by one since pd.to_numeric may round the last digit
+    compiled["VALOR_NUM"] = compiled["VALOR"].astype(str).map(_parse_number).astype(float)
+
+    bounds: pd.Series = compiled["CONDICION"].str.split(" - ")
+    compiled["LOWER_TM"] = _parse_tm(bounds.str[0])
+    compiled["UPPER_TM"] = _parse_tm(bounds.str[1].str.split(" ").str[0])
+
+    compiled["PERIOD_MONTHS"] = compiled["PERIODO"].map(PERIOD_MONTHS).astype("Int8")
+    compiled["APPLICATION"] = compiled["APLICACION"].map(
+        {label: application.value for label, application in APPLICATIONS.items()}
+    ).fillna(Application.VALOR_NETO.value).astype(object)
+
+    # The family code is the first three letters of the second word, e.g.
+    # 'Nicovita Katal' -> 'KAT'. Single words like 'Todo' are kept as they are
+    family: pd.Series = compiled["FAMILIA"].astype(str)
+    code: pd.Series = family.str.split(" ").str[1].str[:3].str.upper()
+    compiled["FAMILY_CODE"] = code.where(code.notna(), family)
+    return compiled
+
+
+def is_compiled(binnacle: pd.DataFrame) -> bool:
+    """
+    Check if the binnacle already has the columns of the rule table
+
+    :param binnacle: The binnacle dataframe
+    :type binnacle: pd.DataFrame
+    :return: True if every rule column is present
+    :rtype: bool
+    """
+    return all(column in binnacle.columns for column in RULE_COLUMNS)
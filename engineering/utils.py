@@ -4,13 +4,39 @@ This module contains the utilities for filtering and generating the data based o
 
 from fastapi import UploadFile
 import pandas as pd
+from pydantic import FilePath
 from typing import Any
 
 from config.settings import settings
-from engineering.engineering import run_process_data
-from engineering.extraction.extraction import read_to_parquet
+from core.admission import admission, estimate_memory
+from core.executor import run_in_cpu, run_in_io, run_report
+from core.reports import ReportCache, build_report_key
+from core.stages import StageCallback, notify_stage
+from engineering.engineering import run_report_data
+from engineering.extraction.extraction import facet_cache, get_slice_key, slice_cache
 from schemas.request.options import Options
 
+EMPTY_FACETS: dict[str, Any] = {
+    "nodo": [], "discount_type": [], "year": [], "month": [], "years": {}, "nodes": {}
+}
+
+report_cache: ReportCache = ReportCache(
+    "reports",
+    settings.general.PROCESSED_PATH / settings.general.REPORT_CACHE_DIRNAME,
+    settings.general.REPORT_CACHE_MAX_BYTES,
+)
+
+
+def _to_options(labels: list[str]) -> list[dict[str, str]]:
+    """
+    Convert the facet labels into dropdown options.
+
+    :param labels: The facet labels
+    :type labels: list[str]
+    :return: The dropdown options
+    :rtype: list[dict[str, str]]
+    """
+    return [{ "label": label, "value": label } for label in labels]
 
 def generate_filtered_options(options: Options) -> dict[str, Any]:
     """
@@ -21,54 +47,82 @@ def generate_filtered_options(options: Options) -> dict[str, Any]:
     :return: The filtered options
     :rtype: dict[str, Any]
     """
-    dict_dataframes: dict[str, pd.DataFrame] = read_to_parquet(settings)
-
-    binnacle: pd.DataFrame = dict_dataframes["binnacle"]
-    sellin: pd.DataFrame = dict_dataframes["sales"]
-    sellout: pd.DataFrame = dict_dataframes["sellout"]
-    sales: pd.DataFrame = sellin if options.liquidation == "Sell In" else sellout
+    facet_index: dict[str, Any] = facet_cache.get(settings)
+    facets: dict[str, Any] = facet_index.get(options.liquidation or "", EMPTY_FACETS)
     filtered_options: dict[str, Any] = {}
 
-    filtered_binnacle = binnacle[(binnacle['SI/SO'] == options.liquidation) & (binnacle['COD_ZNJE'].isin(sellin['COD_ZNJE'].unique()))]
-    filtered_sales = sales[(sales['COD_ZNJE'].isin(filtered_binnacle['COD_ZNJE'].unique()))]
-
-    filtered_options["nodo"] = [
-        { "label": nodo, "value": nodo } for nodo in filtered_binnacle["DES_ZNJE"].unique()
-    ]
+    filtered_options["nodo"] = _to_options(facets["nodo"])
 
     if options.nodo is not None:
-        filtered_binnacle = filtered_binnacle[filtered_binnacle["DES_ZNJE"] == options.nodo]
-        filtered_sales = filtered_sales[filtered_sales["COD_ZNJE"] == filtered_binnacle["COD_ZNJE"].unique()[0]]
+        if options.nodo not in facets["nodes"]:
+            raise ValueError(f"The nodo {options.nodo} is not available for {options.liquidation}")
+        facets = facets["nodes"][options.nodo]
 
-    filtered_options["discount_type"] = [
-        { "label": discount, "value": discount } for discount in filtered_binnacle["TIPO_DESCUENTO"].unique()
-    ]
+    filtered_options["discount_type"] = _to_options(facets["discount_type"])
 
-    filtered_options["year"] = [
-        { "label": year, "value": year } for year in filtered_sales["YEAR"].astype(str).unique()
-    ]
+    filtered_options["year"] = _to_options(facets["year"])
 
+    months: list[str] = facets["month"]
     if options.year is not None:
-        filtered_sales = filtered_sales[filtered_sales["YEAR"] == int(options.year)]
+        months = facets["years"].get(str(int(options.year)), [])
 
-    filtered_options["month"] = [
-        { "label": month, "value": month } for month in filtered_sales["MONTH"].astype(str).unique()
-    ]
+    filtered_options["month"] = _to_options(months)
 
     return filtered_options
 
-def generate_excel_file(options: Options) -> dict[str, str]:
+def generate_excel_path(
+    options: Options,
+    on_stage: StageCallback | None = None,
+) -> FilePath:
     """
-    Generate the Excel file based on the selected options.
+    Generate the Excel file based on the selected options and keep it on disk.
+
+    :param options: The selected options
+    :type options: Options
+    :param on_stage: The callback notified when each stage starts
+    :type on_stage: StageCallback | None
+    :return: The path of the generated file
+    :rtype: FilePath
+    """
+    notify_stage(on_stage, "extract")
+    dict_dataframes: dict[str, pd.DataFrame] = slice_cache.get(settings, get_slice_key(options))
+    return run_report_data(dict_dataframes, settings, options, on_stage)
+
+async def generate_report(
+    options: Options,
+    on_stage: StageCallback | None = None,
+) -> FilePath:
+    """
+    Get the Excel file of the selected options from the report cache, or
+    generate it once it is admitted and keep it in the cache. A cached
+    report is returned without waiting for admission.
+
+    The cache is only used from this process, so its index and size limit
+    hold for the whole directory even when the reports are generated in the
+    process pool.
 
     :param options: The selected options
     :type options: Options
-    :return: The file name
-    :rtype: str
+    :param on_stage: The callback notified when each stage starts. The
+     report is generated in the CPU pool when it is given, since it can not
+     be sent to the process pool
+    :type on_stage: StageCallback | None
+    :return: The path of the cached report
+    :rtype: FilePath
+    :raises AdmissionRejectedError: If the report is not cached and the
+     service is saturated
     """
-    dict_dataframes: dict[str, pd.DataFrame] = read_to_parquet(settings)
-    file_name, file_base64 = run_process_data(dict_dataframes, settings, options)
-    return { "file_name": file_name, "file_base64": file_base64 }
+    key: str = await run_in_io(build_report_key, settings, options)
+    cached: FilePath | None = await run_in_io(report_cache.get, key)
+    if cached is not None:
+        return cached
+    path: FilePath
+    async with admission.admit(await run_in_io(estimate_memory, settings, True)):
+        if on_stage is None:
+            path = await run_report(generate_excel_path, options)
+        else:
+            path = await run_in_cpu(generate_excel_path, options, on_stage)
+    return await run_in_io(report_cache.put, key, path)
 
 def load_excel_files(files: list[UploadFile]) -> None:
     """
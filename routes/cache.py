@@ -0,0 +1,27 @@
+"""
+This module contains the route for inspecting the data snapshot and report caches.
+"""
+
+import logging
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from engineering.extraction.extraction import slice_cache, snapshot_cache
+from engineering.utils import report_cache
+
+cacheRouter = APIRouter()
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+@cacheRouter.get("/cache", tags=["Cache"], status_code=200)
+async def cache_stats() -> JSONResponse:
+    """
+    Get the hit and miss counters of the data snapshot, slice and report
+    caches.
+
+    :return: The cache statistics
+    :rtype: JSONResponse
+    """
+    return JSONResponse(content={"message": "Cache stats got successfully", "cache": snapshot_cache.stats(), "slices": slice_cache.stats(), "reports": report_cache.stats()})
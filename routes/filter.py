@@ -7,6 +7,7 @@ import logging
 from fastapi import APIRouter, Depends
 from fastapi.responses import JSONResponse
 
+from core.executor import run_in_io
 from engineering.utils import generate_filtered_options
 from schemas.request.options import Options
 
@@ -26,7 +27,7 @@ async def filter_options(options: Options = Depends()) -> JSONResponse:
     :rtype: JSONResponse
     """
     try:
-        filtered_options = generate_filtered_options(options)
+        filtered_options = await run_in_io(generate_filtered_options, options)
         logger.info("Filtering data")
         return JSONResponse(content={"message": "Filtered options got successfully", "options": filtered_options})
     except Exception as e:
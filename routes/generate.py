@@ -3,32 +3,119 @@ This file contains the route for generating the Excel file.
 """
 
 import logging
+import os
+from pathlib import Path
+from typing import BinaryIO, Iterator, Literal
+from urllib.parse import quote
 
-from fastapi import APIRouter
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Query
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import FilePath
 
-from engineering.utils import generate_excel_file
+from core.admission import AdmissionRejectedError
+from core.executor import run_in_io
+from core.singleflight import SingleFlight
+from engineering.loading.loading import XLSX_MEDIA_TYPE, encode_base64
+from engineering.utils import generate_report
 from schemas.request.options import Options
 
 generateRouter = APIRouter()
 
 logger: logging.Logger = logging.getLogger(__name__)
 
+report_flight: SingleFlight = SingleFlight("report")
+
+CHUNK_SIZE: int = 64 * 1024
+
+
+def file_response(path: Path, file: BinaryIO) -> StreamingResponse:
+    """
+    Send an opened Excel file as a download. The file is read from the open
+    handle, so it is sent whole even if the report cache removes it meanwhile
+
+    :param path: The path of the file, for its name
+    :type path: Path
+    :param file: The file opened in binary mode, closed once it is sent
+    :type file: BinaryIO
+    :return: The response with the file
+    :rtype: StreamingResponse
+    """
+    def read_chunks() -> Iterator[bytes]:
+        with file:
+            while chunk := file.read(CHUNK_SIZE):
+                yield chunk
+
+    filename: str = quote(path.name)
+    disposition: str = (
+        f'attachment; filename="{path.name}"' if filename == path.name
+        else f"attachment; filename*=utf-8''{filename}"
+    )
+    return StreamingResponse(
+        read_chunks(),
+        media_type=XLSX_MEDIA_TYPE,
+        headers={"Content-Disposition": disposition, "Content-Length": str(os.fstat(file.fileno()).st_size)},
+    )
+
+
+async def _open_report(options: Options) -> tuple[FilePath, BinaryIO]:
+    """
+    Get the Excel file of the selected options and open it
+
+    :param options: The selected options
+    :type options: Options
+    :return: The path of the file and the file opened in binary mode
+    :rtype: tuple[FilePath, BinaryIO]
+    :raises AdmissionRejectedError: If the service is saturated
+    """
+    key: str = options.model_dump_json()
+    path: FilePath = await report_flight.do(key, generate_report, options)
+    try:
+        return path, await run_in_io(open, path, "rb")
+    except FileNotFoundError:
+        # Removed from the report cache since it was found, so it is made again
+        path = await report_flight.do(key, generate_report, options)
+        return path, await run_in_io(open, path, "rb")
+
 
 @generateRouter.post("/generate", tags=["Generate Data"], status_code=200)
-async def generate_data(options: Options) -> JSONResponse:
+async def generate_data(
+    options: Options,
+    response_format: Literal["xlsx", "base64"] = Query(
+        "xlsx",
+        alias="format",
+        description="Download the workbook as a binary file or as base64 in JSON",
+    ),
+) -> Response:
     """
-    Generate the Excel file based on the selected options.
+    Generate the Excel file based on the selected options. The concurrent
+    requests with the same options share one generation, whatever their
+    format, and the generations beyond the admission limits wait or are
+    rejected with the seconds to wait before retrying. Cached reports are
+    sent without waiting for admission.
 
     :param options: The selected options
     :type options: Options
+    :param response_format: The format of the response, the binary workbook
+     or the base64 workbook wrapped in JSON
+    :type response_format: Literal["xlsx", "base64"]
     :return: The file generated successfully
-    :rtype: JSONResponse
+    :rtype: Response
     """
     try:
-        generated_file = generate_excel_file(options)
         logger.info("Generating data")
-        return JSONResponse(content={"message": "File generated successfully", "file": generated_file})
+        path, file = await _open_report(options)
+        if response_format == "base64":
+            with file:
+                file_bytes: bytes = await run_in_io(file.read)
+            generated_file: dict[str, str] = {"file_name": path.name, "file_base64": encode_base64(file_bytes)}
+            return JSONResponse(content={"message": "File generated successfully", "file": generated_file})
+        return file_response(path, file)
+    except AdmissionRejectedError as e:
+        return JSONResponse(
+            content={"message": str(e)},
+            status_code=e.status_code,
+            headers={"Retry-After": str(e.retry_after)},
+        )
     except Exception as e:
         logger.error(f"An error occurred: {e}")
         return JSONResponse(content={"message": f"An error occurred: {e}"}, status_code=500)
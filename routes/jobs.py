@@ -0,0 +1,82 @@
+"""
+This file contains the routes for the report generation jobs.
+"""
+
+import logging
+from typing import BinaryIO
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse, Response
+
+from config.settings import settings
+from core.executor import run_in_io
+from core.jobs import Job, JobManager, JobQueueFullError, JobState
+from engineering.utils import generate_report
+from routes.generate import file_response
+from schemas.request.options import Options
+
+jobsRouter = APIRouter()
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+job_manager: JobManager = JobManager(generate_report, settings.executor)
+
+
+@jobsRouter.post("/jobs", tags=["Jobs"], status_code=202)
+async def create_job(options: Options) -> JSONResponse:
+    """
+    Queue the generation of the Excel file based on the selected options.
+
+    :param options: The selected options
+    :type options: Options
+    :return: The queued job
+    :rtype: JSONResponse
+    """
+    try:
+        job: Job = job_manager.submit(options)
+        logger.info(f"Job {job.id} queued")
+        return JSONResponse(content={"message": "Job queued successfully", "job": job.to_dict()}, status_code=202)
+    except JobQueueFullError as e:
+        logger.warning(f"Job rejected: {e}")
+        return JSONResponse(content={"message": str(e)}, status_code=503)
+    except Exception as e:
+        logger.error(f"An error occurred: {e}")
+        return JSONResponse(content={"message": f"An error occurred: {e}"}, status_code=500)
+
+
+@jobsRouter.get("/jobs/{job_id}", tags=["Jobs"], status_code=200)
+async def get_job(job_id: str) -> JSONResponse:
+    """
+    Get the state and the progress by stage of a job.
+
+    :param job_id: The id of the job
+    :type job_id: str
+    :return: The job
+    :rtype: JSONResponse
+    """
+    job: Job | None = job_manager.get(job_id)
+    if job is None:
+        return JSONResponse(content={"message": f"Job {job_id} not found"}, status_code=404)
+    return JSONResponse(content={"message": "Job got successfully", "job": job.to_dict()})
+
+
+@jobsRouter.get("/jobs/{job_id}/result", tags=["Jobs"], status_code=200)
+async def get_job_result(job_id: str) -> Response:
+    """
+    Download the Excel file generated by a job.
+
+    :param job_id: The id of the job
+    :type job_id: str
+    :return: The generated file
+    :rtype: Response
+    """
+    job: Job | None = job_manager.get(job_id)
+    if job is None:
+        return JSONResponse(content={"message": f"Job {job_id} not found"}, status_code=404)
+    if job.state != JobState.SUCCEEDED or job.result is None:
+        return JSONResponse(content={"message": f"Job {job_id} is {job.state.value}", "job": job.to_dict()}, status_code=409)
+    try:
+        file: BinaryIO = await run_in_io(open, job.result, "rb")
+    except FileNotFoundError:
+        return JSONResponse(content={"message": f"The file of job {job_id} is no longer available"}, status_code=410)
+    return file_response(job.result, file)
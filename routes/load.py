@@ -7,6 +7,7 @@ import logging
 from fastapi import APIRouter, File, UploadFile
 from fastapi.responses import JSONResponse
 
+from core.executor import run_in_io
 from engineering.utils import load_excel_files
 
 loadRouter = APIRouter()
@@ -26,7 +27,7 @@ async def load_data(files: list[UploadFile] = File(...)) -> JSONResponse:
     """
     try:
         logger.info("Loading data")
-        load_excel_files(files)
+        await run_in_io(load_excel_files, files)
         logger.info("Files loaded successfully")
         return JSONResponse(content={"message": "Files loaded successfully"})
     except Exception as e:
@@ -8,7 +8,9 @@ from fastapi import APIRouter
 from fastapi.responses import JSONResponse
 
 from config.settings import settings
-from engineering.engineering import run_load_data
+from core.admission import AdmissionRejectedError, admission, estimate_memory
+from core.executor import pools, run_in_io, run_in_thread
+from engineering.engineering import run_delta_data, run_load_data
 
 processRouter = APIRouter()
 
@@ -16,17 +18,40 @@ logger: logging.Logger = logging.getLogger(__name__)
 
 
 @processRouter.post("/process", tags=["Process Data"], status_code=200)
-async def process_data() -> JSONResponse:
+async def process_data(force: bool = False, delta: bool = False) -> JSONResponse:
     """
     Process the Excel files.
 
-    :return: The files loaded successfully
+    The pipeline steps run in the process pool as soon as the steps they
+    depend on are done, and a thread outside the shared pools only waits
+    for them. Only the files whose content changed since the last run are
+    processed again.
+    In delta mode, only the periods of the delta workbooks of the sales and
+    sellout are replaced in the processed data. The processing shares the
+    admission limits of the report generation.
+
+    :param force: Whether to process every file even if it did not change
+    :type force: bool
+    :param delta: Whether to merge the delta workbooks instead
+    :type delta: bool
+    :return: The files loaded successfully and the seconds spent on each step
     :rtype: JSONResponse
     """
     try:
-        run_load_data(settings)
+        timings: dict[str, float]
+        async with admission.admit(await run_in_io(estimate_memory, settings)):
+            if delta:
+                timings = await run_in_thread(run_delta_data, settings, pools.process)
+            else:
+                timings = await run_in_thread(run_load_data, settings, pools.process, force)
         logger.info("Files processed successfully")
-        return JSONResponse(content={"message": "Files processed successfully"})
+        return JSONResponse(content={"message": "Files processed successfully", "timings": timings})
+    except AdmissionRejectedError as e:
+        return JSONResponse(
+            content={"message": str(e)},
+            status_code=e.status_code,
+            headers={"Retry-After": str(e.retry_after)},
+        )
     except Exception as e:
         logger.error(f"An error occurred: {e}")
         return JSONResponse(content={"message": f"An error occurred: {e}"}, status_code=500)
@@ -5,8 +5,10 @@ This module contains the routes for the FastAPI application.
 from fastapi import FastAPI
 
 from routes.app import initRouter
+from routes.cache import cacheRouter
 from routes.filter import filterRouter
 from routes.generate import generateRouter
+from routes.jobs import jobsRouter
 from routes.load import loadRouter
 from routes.process import processRouter
 
@@ -25,5 +27,7 @@ def load_routes(init_app: FastAPI) -> None:
     init_app.include_router(processRouter)
     init_app.include_router(filterRouter)
     init_app.include_router(generateRouter)
+    init_app.include_router(cacheRouter)
+    init_app.include_router(jobsRouter)
 
 